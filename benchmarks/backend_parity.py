@@ -0,0 +1,156 @@
+"""
+Parity check between the analysis backends (--backend pandas / polars).
+
+Each workbook is loaded once and analyzed by every backend; the flattened
+result tables (the same ones the JSON/Parquet export writes) must agree:
+findings, recommendations, category counts and column roles exactly, and every
+statistic to a relative tolerance, since the engines sum floating-point values
+in different orders. Without paths a synthetic workbook and one with awkward
+sheets (mixed-type and empty columns, integer-only and text-only tabs, yearly
+data) are generated. Every backend also runs once more through the --workers
+process pool, whose results must match its in-process run. Stage wall times per
+backend are printed alongside.
+
+    python benchmarks/backend_parity.py [workbook.xlsx ...] [--rows 20000] [--compact] [--workers 2]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+import generate_workbook  # noqa: E402
+import chenmark_advanced_analysis as analysis  # noqa: E402
+import chenmark_results  # noqa: E402
+
+EXACT_TABLES = ('tabs', 'columns', 'categories', 'findings', 'recommendations', 'summary')
+RTOL = 1e-9
+
+
+def write_edge_case_workbook(path, rows=500, seed=0):
+    """
+    Sheets that exercise the backends' fallbacks and empty-input paths
+    """
+    rng = np.random.default_rng(seed)
+    mixed = rng.integers(0, 100, rows).astype(object)
+    mixed[::7] = 'n/a'
+    regions = rng.choice(['North', 'South', 'East', 'Wést', None], rows)
+    sheets = {
+        'Mixed': pd.DataFrame({
+            'Region': regions,
+            'Mixed Codes': mixed,
+            'Revenue': np.where(rng.random(rows) < 0.1, np.nan, rng.normal(1000, 300, rows)),
+            'Empty Cost': np.full(rows, np.nan),
+            'Constant': np.full(rows, 5.0),
+            'Units': rng.integers(0, 50, rows)
+        }),
+        'Yearly': pd.DataFrame({
+            'Year': np.arange(2000, 2000 + 25),
+            'EBITDA': np.linspace(10, 80, 25) + rng.normal(0, 2, 25),
+            'Debt': np.linspace(90, 20, 25)
+        }),
+        'Integers': pd.DataFrame({'Sales': rng.integers(0, 10, rows), 'Headcount': rng.integers(0, 10, rows)}),
+        'Notes': pd.DataFrame({'Note': [f"note {i}" for i in range(20)], 'Owner': ['A', 'B'] * 10})
+    }
+    with pd.ExcelWriter(path) as writer:
+        for name, frame in sheets.items():
+            frame.to_excel(writer, sheet_name=name, index=False)
+    return path
+
+
+def analyze(data_tabs, backend, workers=1):
+    """
+    Result tables and wall time of one backend over already loaded tabs
+    """
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        stages = analysis.run_tab_analyses(data_tabs, workers, backend=backend, verbose=False)
+        elapsed = time.perf_counter() - start
+        recommendations = analysis.strategic_recommendations(*stages, verbose=False)
+        summary = analysis.create_executive_summary(data_tabs, *stages, recommendations, verbose=False)
+    financial, trends, competitive, risks = stages
+    results = chenmark_results.AnalysisResults(
+        source_file='', generated_at='', financial_metrics=financial, trends=trends,
+        competitive_insights=competitive, risks_opportunities=risks, recommendations=recommendations,
+        summary=summary
+    )
+    return chenmark_results.result_tables(results), elapsed
+
+
+def compare_tables(expected, actual):
+    """
+    Names and messages of the result tables that differ between two backends
+    """
+    mismatches = []
+    for name, frame in expected.items():
+        other = actual[name]
+        try:
+            if name in EXACT_TABLES:
+                pd.testing.assert_frame_equal(frame, other, check_dtype=False)
+            else:
+                pd.testing.assert_frame_equal(frame, other, check_dtype=False, check_exact=False, rtol=RTOL)
+        except AssertionError as e:
+            mismatches.append((name, str(e).strip().splitlines()))
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that every analysis backend reports the same findings")
+    parser.add_argument('paths', nargs='*', help="Workbooks to check (default: generated synthetic workbooks)")
+    parser.add_argument('--rows', type=int, default=20_000, help="Rows per sheet of the generated workbook")
+    parser.add_argument('--compact', action='store_true', help="Also check the tabs after --compact")
+    parser.add_argument('--backends', nargs='+', default=sorted(analysis.ANALYSIS_BACKENDS))
+    parser.add_argument('--workers', type=int, default=2, help="Worker processes for the process-pool runs")
+    args = parser.parse_args(argv)
+
+    paths = args.paths
+    if not paths:
+        workbook_dir = tempfile.mkdtemp(prefix='chenmark_parity_')
+        paths = [
+            generate_workbook.write_workbook(os.path.join(workbook_dir, 'synthetic.xlsx'), sheets=2, rows=args.rows,
+                                             null_fraction=0.05),
+            write_edge_case_workbook(os.path.join(workbook_dir, 'edge_cases.xlsx'))
+        ]
+
+    reference = args.backends[0]
+    failures = 0
+    for path in paths:
+        for compact in ([False, True] if args.compact else [False]):
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                data_tabs, _ = analysis.load_and_analyze_all_tabs(path, use_cache=False, compact=compact,
+                                                                  verbose=False)
+            label = os.path.basename(path) + (' (compact)' if compact else '')
+            tables, elapsed = analyze(data_tabs, reference)
+            print(f"\n{label}: {len(data_tabs)} tabs, {sum(df.shape[0] for df in data_tabs.values()):,} rows")
+            print(f"  {reference:<11} {elapsed:8.3f}s")
+            runs = [(backend, 1) for backend in args.backends[1:]]
+            # The pool runs cover the fork/spawn path, e.g. Polars' thread pool in worker processes
+            runs += [(backend, args.workers) for backend in args.backends] if args.workers > 1 else []
+            for backend, workers in runs:
+                other, other_elapsed = analyze(data_tabs, backend, workers)
+                mismatches = compare_tables(tables, other)
+                status = '✅ same findings' if not mismatches else f"❌ {len(mismatches)} table(s) differ"
+                run_label = backend if workers == 1 else f"{backend} ×{workers}"
+                print(f"  {run_label:<11} {other_elapsed:8.3f}s  {status}")
+                for name, message in mismatches:
+                    print(f"    {name}: " + "\n      ".join(message[:6]))
+                failures += len(mismatches)
+
+    if failures:
+        print(f"\n❌ Backends disagree on {failures} table(s)")
+        return 1
+    print(f"\n✅ {', '.join(args.backends)} agree on every result table")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Synthetic multi-sheet workbook generator for the analysis benchmarks.
+
+Each sheet mixes trending float columns with financial-sounding names, integer
+columns, low- or high-cardinality text columns and daily date columns, with a
+configurable share of missing values, so every analysis stage has work to do.
+
+    python benchmarks/generate_workbook.py out.xlsx --sheets 3 --rows 10000 --numeric-cols 12
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+NUMERIC_NAMES = ['Revenue', 'Cost', 'EBITDA', 'Margin', 'Cash', 'Debt', 'Units', 'Headcount']
+
+
+def synthetic_frame(rows, numeric_cols=8, text_cols=2, date_cols=1, categories=8,
+                    null_fraction=0.02, int_fraction=0.25, seed=0):
+    """
+    Build one synthetic sheet as a DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+
+    for i in range(date_cols):
+        start = pd.Timestamp('2015-01-01') + pd.Timedelta(days=365 * i)
+        columns[f"Date {i + 1}" if i else "Date"] = pd.date_range(start, periods=rows, freq='D')
+
+    for i in range(text_cols):
+        labels = np.array([f"Segment {chr(65 + i)}{k}" for k in range(categories)])
+        columns[f"Segment {i + 1}"] = labels[rng.integers(0, categories, rows)]
+
+    n_int = int(round(numeric_cols * int_fraction))
+    for i in range(numeric_cols):
+        name = f"{NUMERIC_NAMES[i % len(NUMERIC_NAMES)]} {i // len(NUMERIC_NAMES) + 1}"
+        if i < numeric_cols - n_int:
+            trend = np.linspace(0, rng.normal(0, 50), rows)
+            noise = rng.normal(100 + 10 * i, 5 + i, rows)
+            spikes = np.where(rng.random(rows) < 0.03, rng.normal(0, 500, rows), 0.0)
+            columns[name] = trend + noise + spikes
+        else:
+            columns[name] = rng.integers(0, 1000, rows)
+
+    frame = pd.DataFrame(columns)
+    if null_fraction > 0:
+        float_cols = [c for c in frame.columns if frame[c].dtype == np.float64]
+        for col in float_cols:
+            frame.loc[rng.random(rows) < null_fraction, col] = np.nan
+    return frame
+
+
+def write_workbook(path, sheets=3, rows=10_000, seed=0, **frame_options):
+    """
+    Write a synthetic workbook with the given number of sheets and return its path
+    """
+    with pd.ExcelWriter(path) as writer:
+        for i in range(sheets):
+            frame = synthetic_frame(rows, seed=seed + i, **frame_options)
+            frame.to_excel(writer, sheet_name=f"Sheet {i + 1}", index=False)
+    return path
+
+
+def add_frame_arguments(parser):
+    """
+    Shape options shared by the generator and the benchmark runner
+    """
+    parser.add_argument('--sheets', type=int, default=3)
+    parser.add_argument('--numeric-cols', type=int, default=8)
+    parser.add_argument('--text-cols', type=int, default=2)
+    parser.add_argument('--date-cols', type=int, default=1)
+    parser.add_argument('--categories', type=int, default=8, help="Distinct values per text column")
+    parser.add_argument('--null-fraction', type=float, default=0.02)
+    parser.add_argument('--int-fraction', type=float, default=0.25, help="Share of numeric columns that are integers")
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def frame_options(args):
+    return {
+        'numeric_cols': args.numeric_cols,
+        'text_cols': args.text_cols,
+        'date_cols': args.date_cols,
+        'categories': args.categories,
+        'null_fraction': args.null_fraction,
+        'int_fraction': args.int_fraction
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic benchmark workbook")
+    parser.add_argument('output', help="Path of the .xlsx file to write")
+    parser.add_argument('--rows', type=int, default=10_000)
+    add_frame_arguments(parser)
+    args = parser.parse_args(argv)
+
+    write_workbook(args.output, sheets=args.sheets, rows=args.rows, seed=args.seed, **frame_options(args))
+    print(f"Wrote {args.sheets} sheets x {args.rows:,} rows to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Import-time budget check for the analysis script.
+
+Runs ``python -X importtime`` on a fresh interpreter, subtracts everything that
+``import pandas, numpy`` already pulls in, and fails if the analysis module drags
+in a known heavy dependency at import time or if its own import cost exceeds the
+budget. Heavy or optional dependencies must be imported inside the functions
+that use them.
+
+    python benchmarks/import_budget.py [--budget-ms 150] [--module chenmark_advanced_analysis]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported on demand
+FORBIDDEN_PREFIXES = (
+    'matplotlib', 'seaborn', 'scipy', 'pyarrow', 'polars', 'openpyxl', 'python_calamine', 'multiprocessing',
+    'cProfile', 'tracemalloc'
+)
+
+
+def import_times(statement):
+    """
+    Map module name -> (self microseconds, cumulative microseconds) for a fresh interpreter running statement
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--module', default='chenmark_advanced_analysis')
+    parser.add_argument('--budget-ms', type=float, default=150.0,
+                        help="Maximum import time on top of pandas and numpy")
+    args = parser.parse_args(argv)
+
+    baseline = import_times('import pandas, numpy')
+    measured = import_times(f'import {args.module}')
+    extra = {name: times for name, times in measured.items() if name not in baseline}
+    extra_ms = sum(self_us for self_us, _ in extra.values()) / 1000
+
+    print(f"{args.module}: {extra_ms:.1f} ms on top of pandas/numpy (budget {args.budget_ms:.0f} ms)")
+    for name, (self_us, _) in sorted(extra.items(), key=lambda item: -item[1][0])[:10]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    failures = sorted({prefix for prefix in FORBIDDEN_PREFIXES
+                       for name in extra if name == prefix or name.startswith(prefix + '.')})
+    if failures:
+        print(f"❌ Heavy modules imported at startup: {', '.join(failures)}")
+    if extra_ms > args.budget_ms:
+        print(f"❌ Import time {extra_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    if failures or extra_ms > args.budget_ms:
+        return 1
+
+    print("✅ Import budget OK")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
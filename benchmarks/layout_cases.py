@@ -0,0 +1,107 @@
+"""
+Layout-detection check for chenmark_layout on hand-built worksheets.
+
+Each case writes a small sheet with openpyxl and states the header row and last
+value row sheet_layouts must find. Cases without a title block must also load
+exactly the rows and columns pd.read_excel returns, so the detection can never
+drop data a plain read keeps.
+
+    python benchmarks/layout_cases.py
+"""
+import contextlib
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import chenmark_advanced_analysis as analysis  # noqa: E402
+import chenmark_layout  # noqa: E402
+
+
+def _plain(ws):
+    ws.append(['Month', 'Revenue', 'Cost'])
+    for i in range(12):
+        ws.append([f"M{i + 1}", 100 + i, 60 + i])
+
+
+def _title_block(ws):
+    ws.append(['Acme Corp'])
+    ws.append(['Revenue model', 'FY2025'])
+    ws.append([])
+    ws.append(['Month', 'Region', 'Revenue', 'Cost', 'Units'])
+    for i in range(12):
+        ws.append([f"M{i + 1}", 'North', 100 + i, 60 + i, i])
+
+
+def _wide_note_row(ws):
+    ws.append(['Month', 'Revenue'])
+    for i in range(12):
+        notes = ['note a', 'note b', 'note c', 'note d'] if i == 8 else []
+        ws.append([f"M{i + 1}", 100 + i] + notes)
+
+
+def _sparse_header(ws):
+    ws.append(['Name', None, None, 'Total'])
+    for i in range(5):
+        ws.append([f"n{i}", 1, 2, 3])
+
+
+def _formatted_tail(ws):
+    _plain(ws)
+    for row in range(20, 400):
+        ws.cell(row=row, column=1).number_format = '0.00'
+
+
+# name -> (builder, expected header row, expected last value row, whether pd.read_excel must agree)
+CASES = {
+    'Plain': (_plain, 1, 13, True),
+    'Title block': (_title_block, 4, 16, False),
+    'Wide note row': (_wide_note_row, 1, 13, True),
+    'Sparse header': (_sparse_header, 1, 6, True),
+    'Formatted tail': (_formatted_tail, 1, 13, True),
+}
+
+
+def main():
+    from openpyxl import Workbook
+
+    path = os.path.join(tempfile.mkdtemp(prefix='chenmark_layout_'), 'layout_cases.xlsx')
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for name, (build, *_) in CASES.items():
+        build(workbook.create_sheet(name))
+    workbook.save(path)
+
+    layouts = chenmark_layout.sheet_layouts(path)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        data_tabs, _ = analysis.load_and_analyze_all_tabs(path, use_cache=False, verbose=False)
+
+    failures = 0
+    for name, (_, header_row, last_row, plain_read) in CASES.items():
+        layout = layouts.get(name, {})
+        found = (layout.get('header_row'), layout.get('last_row'))
+        problems = []
+        if found != (header_row, last_row):
+            problems.append(f"header/last row {found}, expected {(header_row, last_row)}")
+        if plain_read:
+            expected = pd.read_excel(path, sheet_name=name)
+            loaded = data_tabs.get(name)
+            if loaded is None or loaded.shape != expected.shape or list(loaded.columns) != list(expected.columns):
+                problems.append(f"loaded {None if loaded is None else loaded.shape}, "
+                                f"pd.read_excel {expected.shape}")
+        print(f"  {'❌' if problems else '✅'} {name}" + (": " + "; ".join(problems) if problems else ""))
+        failures += bool(problems)
+
+    if failures:
+        print(f"\n❌ {failures} layout case(s) failed")
+        return 1
+    print(f"\n✅ All {len(CASES)} layout cases passed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
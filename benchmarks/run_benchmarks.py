@@ -0,0 +1,206 @@
+"""
+Scaling benchmarks for the Chenmark analysis pipeline.
+
+For every requested row count a synthetic workbook is generated (see
+generate_workbook.py) and measured in a fresh interpreter. Loading, profiling
+and each analysis function are timed separately and reported as wall time,
+rows/sec and the stage's own peak allocation: one extra run of the stage under
+tracemalloc, counting only memory allocated during it (numpy/pandas buffers
+included; native parser memory and worker processes are not traced).
+process_peak_rss_mb is the interpreter's lifetime high-water mark after the
+stage, so it is cumulative and mostly reflects the largest earlier stage.
+Results are written as JSON and can be compared against a previous run to flag
+regressions.
+
+    python benchmarks/run_benchmarks.py --rows 1000 10000 --output after.json --compare before.json
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import generate_workbook  # noqa: E402
+
+
+def _process_peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure_workbook(path, repeat=1, workers=1, backend='pandas'):
+    """
+    Time each pipeline stage on one workbook; wall time is the best of `repeat` runs
+    """
+    sys.path.insert(0, REPO_ROOT)
+    import chenmark_advanced_analysis as analysis
+
+    stages = {}
+
+    def record(name, func):
+        best = None
+        for _ in range(repeat):
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                start = time.perf_counter()
+                result = func()
+                elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        # Traced separately: tracemalloc slows allocation-heavy code, so it must not touch the timings
+        tracemalloc.start()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stages[name] = {'wall_s': round(best, 6), 'peak_alloc_mb': round(peak / (1024 * 1024), 1),
+                        'process_peak_rss_mb': round(_process_peak_rss_mb(), 1)}
+        return result
+
+    data_tabs, _ = record('load', lambda: analysis.load_and_analyze_all_tabs(path, use_cache=False))
+    profiles = record('profile', lambda: analysis.build_tab_profiles(data_tabs, backend=backend))
+    financial = record('financial', lambda: analysis.comprehensive_financial_analysis(data_tabs, profiles))
+    trends = record('trend', lambda: analysis.advanced_trend_analysis(data_tabs, profiles))
+    competitive = record('competitive', lambda: analysis.competitive_analysis(data_tabs, profiles))
+    risks = record('risk', lambda: analysis.risk_and_opportunity_analysis(data_tabs, profiles))
+    recommendations = record(
+        'recommendations', lambda: analysis.strategic_recommendations(financial, trends, competitive, risks))
+    record(
+        'summary',
+        lambda: analysis.create_executive_summary(data_tabs, financial, trends, competitive, risks, recommendations)
+    )
+    if workers > 1:
+        record('pipeline_parallel', lambda: analysis.run_tab_analyses(data_tabs, workers, backend=backend))
+
+    total_rows = sum(df.shape[0] for df in data_tabs.values())
+    for numbers in stages.values():
+        numbers['rows_per_s'] = round(total_rows / numbers['wall_s'], 1) if numbers['wall_s'] > 0 else None
+    return {'total_rows': total_rows, 'stages': stages}
+
+
+def _config_key(config):
+    return json.dumps(config, sort_keys=True)
+
+
+def run_config(config, workbook_dir, repeat, workers, backend='pandas'):
+    """
+    Generate the workbook for one configuration and measure it in a child interpreter
+    """
+    options = dict(config)
+    rows, sheets, seed = options.pop('rows'), options.pop('sheets'), options.pop('seed')
+    digest = hashlib.sha1(_config_key(config).encode('utf-8')).hexdigest()[:12]
+    path = os.path.join(workbook_dir, f"bench_{digest}.xlsx")
+    if not os.path.exists(path):
+        generate_workbook.write_workbook(path, sheets=sheets, rows=rows, seed=seed, **options)
+
+    child = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--measure', path,
+         '--repeat', str(repeat), '--workers', str(workers), '--backend', backend],
+        capture_output=True, text=True, check=True
+    )
+    measured = json.loads(child.stdout.strip().splitlines()[-1])
+    return {'config': config, 'workbook_bytes': os.path.getsize(path), **measured}
+
+
+def compare(results, baseline, threshold, min_seconds=0.01):
+    """
+    Print per-stage ratios against a baseline run and return the regressions
+    """
+    previous = {_config_key(r['config']): r for r in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        before = previous.get(_config_key(result['config']))
+        if before is None:
+            continue
+        print(f"\nrows={result['config']['rows']:,} vs baseline:")
+        for stage, now in result['stages'].items():
+            old = before['stages'].get(stage)
+            if not old or not old['wall_s']:
+                continue
+            ratio = now['wall_s'] / old['wall_s']
+            slower = ratio > 1 + threshold and now['wall_s'] - old['wall_s'] > min_seconds
+            marker = '❌' if slower else '  '
+            # Baselines written before per-stage allocation was measured have no peak_alloc_mb
+            memory = (f"  alloc {old['peak_alloc_mb']:.1f} -> {now['peak_alloc_mb']:.1f}MB"
+                      if 'peak_alloc_mb' in old else "")
+            print(f"  {marker} {stage:<18} {old['wall_s']:>9.4f}s -> {now['wall_s']:>9.4f}s  ({ratio:.2f}x){memory}")
+            if slower:
+                regressions.append((result['config']['rows'], stage, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline on synthetic workbooks")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000])
+    generate_workbook.add_frame_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=3, help="Best-of-N wall time per stage")
+    parser.add_argument('--workers', type=int, default=1, help="Also time run_tab_analyses with N workers")
+    parser.add_argument('--backend', default='pandas', help="Analysis backend to measure (pandas or polars)")
+    parser.add_argument('--workbook-dir', help="Where generated workbooks are kept (default: a temp dir)")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help="Previous results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown before flagging (0.2 = 20%%)")
+    parser.add_argument('--measure', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        # Child mode: measure one workbook and emit JSON on the last stdout line
+        print(json.dumps(measure_workbook(args.measure, args.repeat, args.workers, args.backend)))
+        return 0
+
+    workbook_dir = args.workbook_dir or tempfile.mkdtemp(prefix='chenmark_bench_')
+    os.makedirs(workbook_dir, exist_ok=True)
+
+    results = []
+    for rows in args.rows:
+        config = {'rows': rows, 'sheets': args.sheets, 'seed': args.seed, **generate_workbook.frame_options(args)}
+        result = run_config(config, workbook_dir, args.repeat, args.workers, args.backend)
+        results.append(result)
+        print(f"\nrows={rows:,} x {args.sheets} sheets ({result['workbook_bytes'] / 1e6:.1f} MB)")
+        print(f"  {'stage':<18} {'wall':>10} {'peak alloc':>11} {'process RSS':>12} {'rows/s':>14}")
+        for stage, numbers in result['stages'].items():
+            rate = f"{numbers['rows_per_s']:,.0f}" if numbers['rows_per_s'] else '-'
+            print(f"  {stage:<18} {numbers['wall_s']:>9.4f}s {numbers['peak_alloc_mb']:>9.1f}MB "
+                  f"{numbers['process_peak_rss_mb']:>10.1f}MB {rate:>14}")
+
+    import numpy
+    import pandas
+    payload = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pandas.__version__,
+            'numpy': numpy.__version__,
+            'backend': args.backend,
+            'platform': platform.platform()
+        },
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} stage(s) slower than baseline by more than {args.threshold:.0%}")
+            return 1
+        print("\n✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Coverage check for the --sample mode's 95% intervals (chenmark_sampling.describe_intervals).
+
+Repeatedly draws row samples from a synthetic population and counts how often
+each interval contains the statistic of the full column. Besides a normal column
+the population has the heavy-tailed shapes financial sheets actually hold: the
+benchmark generator's noise-plus-rare-spikes columns and a skewed lognormal one.
+An interval whose coverage falls below --min-coverage fails the check, since
+findings near a threshold are only re-run exactly when their interval reaches it.
+
+    python benchmarks/sampling_coverage.py [--population 50000] [--sizes 500 2000] [--trials 300]
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import chenmark_sampling  # noqa: E402
+
+STATISTICS = ('mean', 'std', 'cv')
+
+
+def population_columns(rows, seed=0):
+    """
+    Columns of the population the samples are drawn from, by name
+    """
+    rng = np.random.default_rng(seed)
+    spikes = np.where(rng.random(rows) < 0.03, rng.normal(0, 500, rows), 0.0)
+    return {
+        'Normal': rng.normal(100, 15, rows),
+        'Spiky (generator)': rng.normal(100, 5, rows) + spikes,
+        'Lognormal': rng.lognormal(3, 0.8, rows)
+    }
+
+
+def coverage(values, size, trials, seed=0):
+    """
+    Share of trials, per statistic, in which the sampled interval contains the full column's value
+    """
+    rng = np.random.default_rng(seed)
+    exact_std = values.std(ddof=1)
+    exact = {'mean': values.mean(), 'std': exact_std, 'cv': exact_std / abs(values.mean())}
+    hits = dict.fromkeys(STATISTICS, 0)
+    for _ in range(trials):
+        sample = rng.choice(values, size, replace=False)[:, None]
+        mean, std = sample.mean(axis=0), sample.std(axis=0, ddof=1)
+        intervals = chenmark_sampling.describe_intervals(sample, mean, std, np.array([len(values)]))
+        for name in STATISTICS:
+            low, high = intervals[name]
+            hits[name] += bool(low[0] <= exact[name] <= high[0])
+    return {name: count / trials for name, count in hits.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the coverage of the approximate mode's 95% intervals")
+    parser.add_argument('--population', type=int, default=50_000, help="Rows in the full column")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 2000], help="Sample sizes to check")
+    parser.add_argument('--trials', type=int, default=300)
+    parser.add_argument('--min-coverage', type=float, default=0.85,
+                        help="Lowest acceptable coverage of a nominal 95%% interval")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    print(f"{'column':<20} {'rows':>6}  " + "  ".join(f"{name:>6}" for name in STATISTICS))
+    for name, values in population_columns(args.population).items():
+        for size in args.sizes:
+            covered = coverage(values, size, args.trials)
+            low = [stat for stat, share in covered.items() if share < args.min_coverage]
+            print(f"{name:<20} {size:>6,}  " + "  ".join(f"{covered[stat]:>6.0%}" for stat in STATISTICS)
+                  + (f"  ❌ {', '.join(low)}" if low else ""))
+            failures += len(low)
+
+    if failures:
+        print(f"\n❌ {failures} interval(s) under {args.min_coverage:.0%} coverage")
+        return 1
+    print(f"\n✅ Every interval covers at least {args.min_coverage:.0%} of trials")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
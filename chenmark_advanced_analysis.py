@@ -1,15 +1,70 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
+from datetime import datetime
 import warnings
 import os
+import time
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import chenmark_cache
+import chenmark_compaction
+import chenmark_layout
+import chenmark_polars
+import chenmark_streaming
+import chenmark_profiling
+import chenmark_sampling
+import chenmark_results
 warnings.filterwarnings('ignore')
 
-def load_and_analyze_all_tabs(file_path):
+def _select_excel_engine(engine=None):
+    """
+    Pick the fastest available Excel parser, falling back to the pandas default
+    """
+    if engine:
+        return engine
+    try:
+        import python_calamine  # noqa: F401
+        return 'calamine'
+    except ImportError:
+        return None
+
+def _open_excel_file(file_path, engine=None):
+    """
+    Open the workbook once, retrying with the default engine if the preferred one is unavailable
+    """
+    engine = _select_excel_engine(engine)
+    if engine is None:
+        return pd.ExcelFile(file_path)
+    try:
+        return pd.ExcelFile(file_path, engine=engine)
+    except (ValueError, ImportError) as e:
+        print(f"⚠️  Engine '{engine}' unavailable ({e}), using default engine")
+        return pd.ExcelFile(file_path)
+
+def _parse_sheet(excel_file, sheet_name, layout=None):
+    """
+    Parse a sheet's data region: from the detected header row down to the last row holding a value
+    """
+    if not layout or layout['kind'] != 'data':
+        return excel_file.parse(sheet_name)
+    df = excel_file.parse(sheet_name, header=layout['header_row'] - 1,
+                          nrows=layout['last_row'] - layout['header_row'])
+    # Margin columns left of the table come back without a header and without values
+    unnamed = [col for col in df.columns if str(col).startswith('Unnamed: ') and df[col].isna().all()]
+    return df.drop(columns=unnamed) if unnamed else df
+
+@chenmark_profiling.instrumented('load')
+def load_and_analyze_all_tabs(file_path, engine=None, use_cache=True, cache_dir=None,
+                              rebuild_cache=False, cache_max_bytes=chenmark_cache.DEFAULT_MAX_BYTES, compact=False,
+                              verbose=True):
     """
     Load and analyze all tabs from the Chenmark Excel file
+    
+    With compact=True every sheet goes through chenmark_compaction.compact_frame after loading
+    (the cache keeps the frames as parsed) and the memory saved per sheet is reported.
     """
     # Check if file exists
     if not os.path.exists(file_path):
@@ -17,306 +72,1473 @@ def load_and_analyze_all_tabs(file_path):
         print("Please check the file path and ensure the Excel file is in the correct location.")
         return {}, []
     
-    # Read all sheets from the Excel file
+    cache_entry = None
+    if use_cache:
+        cache_entry = chenmark_cache.open_workbook_cache(file_path, cache_dir, rebuild=rebuild_cache)
+    
+    # Read all sheets through a single open workbook handle, opened only on a cache miss
+    excel_file = None
     try:
-        excel_file = pd.ExcelFile(file_path)
-        print(f"📊 CHENMARK CASE STUDY ANALYSIS - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("="*80)
-        print(f"Found {len(excel_file.sheet_names)} tabs in the Excel file:")
+        load_start = time.perf_counter()
+        sheet_names = chenmark_cache.cached_sheet_names(cache_entry) if cache_entry else None
+        layouts = None
+        skipped = {}
+        if sheet_names is None:
+            excel_file = _open_excel_file(file_path, engine)
+            # Chart sheets and pivot-only worksheets hold no table to analyze
+            layouts = chenmark_layout.sheet_layouts(file_path)
+            skipped = {name: layout['kind'] for name, layout in layouts.items()
+                       if layout['kind'] in chenmark_layout.SKIPPED_KINDS}
+            sheet_names = [name for name in excel_file.sheet_names if name not in skipped]
+        
+        if verbose:
+            source = f"engine: {excel_file.engine}" if excel_file is not None else "cache"
+            print(f"📊 CHENMARK CASE STUDY ANALYSIS - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            print("="*80)
+            if skipped:
+                print(f"⏭️  Skipping {len(skipped)} chart/pivot sheet(s): "
+                      + ", ".join(f"{name} ({kind})" for name, kind in skipped.items()))
+            print(f"Found {len(sheet_names)} tabs in the Excel file ({source}):")
         
         # Dictionary to store all dataframes
         data_tabs = {}
+        bytes_before = bytes_after = 0
         
-        for i, sheet_name in enumerate(excel_file.sheet_names):
-            print(f"  {i+1}. {sheet_name}")
+        for i, sheet_name in enumerate(sheet_names):
+            if verbose:
+                print(f"  {i+1}. {sheet_name}")
+            sheet_start = time.perf_counter()
             try:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
+                with chenmark_profiling.span('load.sheet', tab=sheet_name):
+                    df = chenmark_cache.load_cached_sheet(cache_entry, sheet_name) if cache_entry else None
+                    if df is not None:
+                        action = "loaded from cache"
+                    else:
+                        if excel_file is None:
+                            excel_file = _open_excel_file(file_path, engine)
+                        if layouts is None:
+                            layouts = chenmark_layout.sheet_layouts(file_path)
+                        layout = layouts.get(sheet_name)
+                        df = _parse_sheet(excel_file, sheet_name, layout)
+                        action = "parsed"
+                        if layout and layout['header_row'] and layout['header_row'] > 1:
+                            action = f"parsed with the header on row {layout['header_row']}"
+                        if cache_entry:
+                            chenmark_cache.store_cached_sheet(cache_entry, sheet_name, df)
+                    chenmark_profiling.annotate(rows=df.shape[0], cols=df.shape[1])
+                    if compact:
+                        with chenmark_profiling.span('load.compact', tab=sheet_name, rows=df.shape[0], cols=df.shape[1]):
+                            raw_shape = df.shape
+                            df, sheet_before, sheet_after = chenmark_compaction.compact_frame(df)
+                        bytes_before += sheet_before
+                        bytes_after += sheet_after
                 data_tabs[sheet_name] = df
-                print(f"     └─ Shape: {df.shape}")
+                if verbose:
+                    print(f"     └─ Shape: {df.shape} ({action} in {time.perf_counter() - sheet_start:.2f}s)")
+                    if compact:
+                        dropped = f", dropped {raw_shape[0] - df.shape[0]} empty rows and {raw_shape[1] - df.shape[1]} empty columns" \
+                            if df.shape != raw_shape else ""
+                        print(f"     └─ Compacted: {chenmark_compaction.format_bytes(sheet_before)} → "
+                              f"{chenmark_compaction.format_bytes(sheet_after)} "
+                              f"(saved {chenmark_compaction.format_bytes(sheet_before - sheet_after)}{dropped})")
             except Exception as e:
                 print(f"     └─ Error loading: {e}")
         
-        return data_tabs, excel_file.sheet_names
+        if cache_entry:
+            chenmark_cache.finalize_workbook_cache(cache_entry, sheet_names, cache_max_bytes)
+        
+        chenmark_profiling.annotate(rows=sum(df.shape[0] for df in data_tabs.values()),
+                                    cols=sum(df.shape[1] for df in data_tabs.values()))
+        if verbose:
+            print(f"⏱️  Workbook loaded in {time.perf_counter() - load_start:.2f}s")
+            if compact and bytes_before:
+                print(f"🗜️  Compaction saved {chenmark_compaction.format_bytes(bytes_before - bytes_after)} "
+                      f"({(bytes_before - bytes_after) / bytes_before:.0%} of {chenmark_compaction.format_bytes(bytes_before)})")
+        return data_tabs, sheet_names
     
     except Exception as e:
         print(f"❌ Error reading Excel file: {e}")
         return {}, []
+    
+    finally:
+        if excel_file is not None:
+            excel_file.close()
+        if cache_entry:
+            chenmark_cache.close_workbook_cache(cache_entry)
+
+FINANCIAL_TERMS = ['revenue', 'sales', 'profit', 'ebitda',
+                   'margin', 'cost', 'expense', 'cash',
+                   'debt', 'equity', 'roi', 'growth',
+                   'income', 'earnings', 'assets', 'liabilities']
+NUMERIC_STAT_COLUMNS = ['count', 'mean', 'median', 'std', 'min', 'max', 'q1', 'q3', 'cv']
 
-def comprehensive_financial_analysis(data_tabs):
+# Decision thresholds of the trend and risk stages; in --sample mode a sampled statistic
+# whose confidence interval straddles one of them is recomputed over every row
+VOLATILE_CV = 0.5
+STABLE_CV = 0.1
+OUTLIER_SHARE_PCT = 10
+STRONG_CORRELATION = 0.5
+TREND_SLOPE_STD = 0.1  # A trend is reported when |slope| exceeds this fraction of the std
+
+def _financial_columns(columns):
+    return [col for col in columns if any(term in str(col).lower() for term in FINANCIAL_TERMS)]
+
+def _is_date_like(col, is_datetime):
+    return is_datetime or 'date' in str(col).lower() or 'year' in str(col).lower()
+
+# Coarsest period with at least MIN_TREND_PERIODS buckets across the date span wins
+TREND_FREQUENCIES = (('Y', 'yearly', 365.25), ('Q', 'quarterly', 91.31), ('M', 'monthly', 30.44),
+                     ('W', 'weekly', 7.0), ('D', 'daily', 1.0))
+MIN_TREND_PERIODS = 4
+ROLLING_PERIODS = 3
+TREND_METRIC_COLUMNS = ['periods', 'first_period', 'last_period', 'latest_change_pct', 'mean_change_pct',
+                        'cagr_pct', 'rolling_mean', 'rolling_std']
+
+DATE_PARSE_SHARE = 0.9  # Share of a text column's values that must parse for it to count as dates
+
+def _numeric_date_unit(col, low, high, whole):
     """
-    Perform comprehensive financial analysis across all tabs
+    How a numeric column with values in [low, high] reads as dates: 'year', 'serial' (Excel day numbers) or None
     """
+    if whole and 'year' in str(col).lower() and low >= 1800 and high <= 2200:
+        return 'year'
+    if low >= 1 and high < 2958466 and 'date' in str(col).lower():
+        return 'serial'
+    return None
+
+def parse_date_column(values, col):
+    """
+    Parse a date-like column into datetime64 values, raising ValueError when it does not hold dates
+    
+    Calendar-year columns become January 1st of each year, numbers in the Excel serial range are
+    read as Excel dates and text must parse for at least 90% of its non-null values.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    present = values.dropna()
+    if pd.api.types.is_numeric_dtype(values):
+        numbers = present.to_numpy(dtype=np.float64)
+        unit = None
+        if len(numbers) > 0:
+            unit = _numeric_date_unit(col, numbers.min(), numbers.max(), np.all(numbers == np.round(numbers)))
+        if unit == 'year':
+            return pd.to_datetime(values.astype('Float64').astype('Int64').astype('string'), format='%Y')
+        if unit == 'serial':
+            return pd.to_datetime(values, unit='D', origin='1899-12-30')
+        raise ValueError(f"{col} does not hold calendar years or dates")
+    parsed = pd.to_datetime(values, errors='coerce', format='mixed')
+    if len(present) == 0 or parsed.notna().sum() < DATE_PARSE_SHARE * len(present):
+        raise ValueError(f"{col} does not hold parseable dates")
+    return parsed
+
+def _trend_frequency(span_days):
+    for alias, label, days in TREND_FREQUENCIES:
+        if span_days / days >= MIN_TREND_PERIODS - 1:
+            return alias, label
+    return TREND_FREQUENCIES[-1][:2]
+
+def period_trend_metrics(per_period, window=ROLLING_PERIODS):
+    """
+    Period-over-period change, CAGR and trailing rolling mean/std for every column of a per-period frame
+    
+    per_period has a complete PeriodIndex (missing periods as NaN rows); changes are relative
+    to the absolute previous value and CAGR needs positive first and last values.
+    """
+    values = per_period.to_numpy(dtype=np.float64)
+    n_periods, n_cols = values.shape
+    columns = np.arange(n_cols)
+    present = ~np.isnan(values)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        previous, current = values[:-1], values[1:]
+        change = np.where(previous != 0, (current - previous) / np.abs(previous) * 100, np.nan)
+        change_present = ~np.isnan(change)
+        latest_row = len(change) - 1 - change_present[::-1].argmax(axis=0) if len(change) else np.zeros(n_cols, int)
+        latest_change = np.where(change_present.any(axis=0), change[latest_row, columns], np.nan) if len(change) else np.full(n_cols, np.nan)
+        mean_change = np.nanmean(change, axis=0) if len(change) else np.full(n_cols, np.nan)
+        
+        # CAGR between each column's first and last observed period
+        first = present.argmax(axis=0)
+        last = n_periods - 1 - present[::-1].argmax(axis=0)
+        starts = per_period.index.to_timestamp()
+        years = (starts[last] - starts[first]).days.to_numpy() / 365.25
+        first_value, last_value = values[first, columns], values[last, columns]
+        valid = present.any(axis=0) & (years > 0) & (first_value > 0) & (last_value > 0)
+        cagr = np.where(valid, ((last_value / first_value) ** (1 / np.where(years > 0, years, 1)) - 1) * 100, np.nan)
+    
+    rolling = per_period.rolling(window, min_periods=window)
+    labels = per_period.index.astype(str)
+    return pd.DataFrame({
+        'periods': present.sum(axis=0),
+        'first_period': np.where(present.any(axis=0), labels[first], None),
+        'last_period': np.where(present.any(axis=0), labels[last], None),
+        'latest_change_pct': latest_change,
+        'mean_change_pct': mean_change,
+        'cagr_pct': cagr,
+        'rolling_mean': rolling.mean().iloc[-1].to_numpy() if n_periods else np.nan,
+        'rolling_std': rolling.std().iloc[-1].to_numpy() if n_periods else np.nan
+    }, index=per_period.columns)[TREND_METRIC_COLUMNS]
+
+class TabProfile:
+    """
+    Column partitions and summary statistics for one tab, computed once and shared by every analysis stage
+    
+    This is also the analysis backend interface: the stages only read the attributes set here and
+    call date_timeline, period_trends, correlation_matrix, category_counts, category_performance
+    and risk_statistics, so a subclass answering them differently (see ANALYSIS_BACKENDS) swaps
+    the engine without touching the stages. This class answers them with pandas and numpy.
+    """
+    def __init__(self, tab_name, df):
+        self.tab_name = tab_name
+        self.df = df
+        self.shape = df.shape
+        
+        # Dtype partitions
+        self.numeric_columns = list(df.select_dtypes(include=[np.number]).columns)
+        self.text_columns = list(df.select_dtypes(include=['object', 'string', 'category']).columns)
+        
+        # Keyword matching on column names; name-matched date columns must also parse (see date_columns)
+        self.financial_columns = _financial_columns(df.columns)
+        self._date_candidates = [col for col in df.columns
+                                 if _is_date_like(col, pd.api.types.is_datetime64_any_dtype(df[col]))]
+        self._date_columns = None
+        
+        self.non_null_counts = self._count_non_null()
+        self.numeric_stats = self._describe_numeric()
+        self._date_orders = {}
+    
+    @property
+    def date_columns(self):
+        """
+        Datetime columns and date-named columns whose values parse_date_column accepts, parsed on first use
+        
+        A name match alone (e.g. "Revenue year-over-year %") is not a date column; the parse is
+        cached by date_order, so the timelines reuse it.
+        """
+        if self._date_columns is None:
+            self._date_columns = []
+            for col in self._date_candidates:
+                try:
+                    self.date_order(col)
+                except (ValueError, TypeError, OverflowError):
+                    continue
+                self._date_columns.append(col)
+        return self._date_columns
+    
+    def _count_non_null(self):
+        return self.df.notna().sum()
+    
+    def _describe_numeric(self):
+        """
+        Describe-style statistics for all numeric columns in one vectorized pass per statistic
+        """
+        if not self.numeric_columns:
+            return pd.DataFrame(columns=NUMERIC_STAT_COLUMNS, dtype=float)
+        
+        block = self.df[self.numeric_columns]
+        quartiles = block.quantile([0.25, 0.5, 0.75])
+        stats = pd.DataFrame({
+            'count': self.non_null_counts[self.numeric_columns],
+            'mean': block.mean(),
+            'median': quartiles.loc[0.5],
+            'std': block.std(),
+            'min': block.min(),
+            'max': block.max(),
+            'q1': quartiles.loc[0.25],
+            'q3': quartiles.loc[0.75]
+        })
+        mean = stats['mean'].where(stats['mean'] != 0)
+        stats['cv'] = stats['std'] / mean.abs()
+        return stats[NUMERIC_STAT_COLUMNS]
+    
+    def date_order(self, date_col):
+        """
+        Parsed dates of a column and the row positions with a valid date in chronological order
+        
+        Parsed and argsorted once per column; every timeline reuses the order instead of sorting a frame copy.
+        """
+        if date_col not in self._date_orders:
+            dates = parse_date_column(self.df[date_col], date_col).to_numpy(dtype='datetime64[ns]')
+            rows = np.flatnonzero(~np.isnat(dates))
+            self._date_orders[date_col] = (dates, rows[np.argsort(dates[rows], kind='stable')])
+        return self._date_orders[date_col]
+    
+    def date_timeline(self, date_col, num_cols):
+        """
+        Period covered by a date column and first-to-last growth (%) of numeric columns ordered by it
+        """
+        dates, order = self.date_order(date_col)
+        raw = self.df[date_col]
+        if not (pd.api.types.is_numeric_dtype(raw) or pd.api.types.is_datetime64_any_dtype(raw)):
+            period = (pd.Timestamp(dates[order[0]]), pd.Timestamp(dates[order[-1]]))
+        else:
+            period = (raw.min(), raw.max())
+        
+        num_cols = [num_col for num_col in num_cols if self.non_null_counts[num_col] > 1]
+        growth = self._timeline_growth(num_cols, order) if num_cols and len(order) else {}
+        return period, growth
+    
+    def _timeline_growth(self, num_cols, order):
+        """
+        First-to-last growth (%) of each column over its non-null values, with rows taken in order
+        """
+        growth = {}
+        values = self.df[num_cols].to_numpy(dtype=np.float64, na_value=np.nan)[order]
+        present = ~np.isnan(values)
+        first = present.argmax(axis=0)
+        last = len(values) - 1 - present[::-1].argmax(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for j, num_col in enumerate(num_cols):
+                if present[:, j].sum() > 1:
+                    start, end = values[first[j], j], values[last[j], j]
+                    growth[num_col] = ((end - start) / start) * 100
+        return growth
+    
+    def period_trends(self, date_col):
+        """
+        Frequency label and period_trend_metrics for every numeric column, aggregated per period of the date column
+        
+        Rows are averaged per period via a groupby on the DatetimeIndex's periods, so
+        uneven sampling (e.g. several rows in one month) does not skew the growth figures.
+        """
+        dates, order = self.date_order(date_col)
+        value_cols = [col for col in self.numeric_columns if col != date_col]
+        if len(order) < 2 or not value_cols:
+            return None
+        span = pd.Timestamp(dates[order[-1]]) - pd.Timestamp(dates[order[0]])
+        alias, label = _trend_frequency(span.days)
+        
+        per_period = self._period_means(value_cols, dates, order, alias)
+        per_period = per_period.reindex(pd.period_range(per_period.index[0], per_period.index[-1], freq=alias))
+        return label, period_trend_metrics(per_period)
+    
+    def _period_means(self, value_cols, dates, order, alias):
+        """
+        Mean of each value column per period (a PeriodIndex of frequency alias) over the rows at order
+        """
+        index = pd.DatetimeIndex(dates[order])
+        block = pd.DataFrame(self.df[value_cols].to_numpy(dtype=np.float64, na_value=np.nan)[order],
+                             index=index, columns=value_cols)
+        return block.groupby(index.to_period(alias), sort=True).mean()
+    
+    def correlation_matrix(self, dtype=None, sample_rows=None):
+        return correlation_matrix(self.df, self.numeric_columns, dtype=dtype, sample_rows=sample_rows)
+    
+    def sampling_info(self):
+        return None  # Every statistic covers all rows
+    
+    def correlation_bounds(self, col1, col2):
+        return None
+    
+    def category_counts(self, col):
+        values = self.df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Counted on the integer codes, then put in order of first appearance like the hash pass below
+            counts = values.value_counts(sort=False)
+            return counts.reindex(pd.unique(values.dropna()).astype(object))
+        return values.value_counts(sort=False)  # One hash pass, in order of first appearance
+    
+    def category_performance(self, col, numeric_cols):
+        return category_performance(self.df, col, numeric_cols)
+    
+    def risk_statistics(self):
+        return risk_statistics(self.df, self.numeric_stats)
+
+class SampledTabProfile(TabProfile):
+    """
+    TabProfile whose costly statistics come from a row sample, each with a 95% confidence interval
+    
+    Counts, min/max, date timelines and category counts still cover every row (single passes);
+    means, quantiles, correlations, per-category aggregates and the risk statistics use the
+    sample. A sampled statistic whose interval straddles a decision threshold (CV, correlation,
+    outlier share, trend slope) is recomputed over every row and its interval collapses onto it.
+    """
+    def __init__(self, tab_name, df, sample):
+        self.sample_spec = sample
+        self.strata_column = None
+        self.sample_positions = None
+        self._sample = None
+        self._correlation_bounds = None
+        super().__init__(tab_name, df)
+    
+    @property
+    def sample(self):
+        if self._sample is None:
+            self.strata_column = chenmark_sampling.strata_column(self.df, self.text_columns)
+            size = chenmark_sampling.sample_size(len(self.df), self.sample_spec)
+            self.sample_positions = chenmark_sampling.draw_sample(self.df, size, self.strata_column)
+            self._sample = self.df.iloc[self.sample_positions]
+        return self._sample
+    
+    def _describe_numeric(self):
+        """
+        Describe-style statistics from the sample (count, min and max from every row) and their intervals
+        """
+        self.intervals = pd.DataFrame(columns=[f"{name}_{end}" for name in NUMERIC_STAT_COLUMNS
+                                               for end in ('low', 'high')], dtype=float)
+        if not self.numeric_columns:
+            return super()._describe_numeric()
+        
+        block = self.sample[self.numeric_columns]
+        full = self.df[self.numeric_columns]
+        quartiles = block.quantile([0.25, 0.5, 0.75])
+        stats = pd.DataFrame({
+            'count': self.non_null_counts[self.numeric_columns],
+            'mean': block.mean(),
+            'median': quartiles.loc[0.5],
+            'std': block.std(),
+            'min': full.min(),
+            'max': full.max(),
+            'q1': quartiles.loc[0.25],
+            'q3': quartiles.loc[0.75]
+        })
+        mean = stats['mean'].where(stats['mean'] != 0)
+        stats['cv'] = stats['std'] / mean.abs()
+        
+        bounds = chenmark_sampling.describe_intervals(block.to_numpy(dtype=np.float64, na_value=np.nan),
+                                                      stats['mean'].to_numpy(dtype=np.float64),
+                                                      stats['std'].to_numpy(dtype=np.float64),
+                                                      stats['count'].to_numpy(dtype=np.float64))
+        intervals = {}
+        for name in NUMERIC_STAT_COLUMNS:
+            exact = stats[name].to_numpy(dtype=np.float64)
+            intervals[f"{name}_low"], intervals[f"{name}_high"] = bounds.get(name, (exact, exact))
+        intervals = pd.DataFrame(intervals, index=stats.index)
+        
+        # The CV decides volatility and stability findings, so settle borderline ones over every row
+        near = (chenmark_sampling.straddles(intervals['cv_low'], intervals['cv_high'], STABLE_CV)
+                | chenmark_sampling.straddles(intervals['cv_low'], intervals['cv_high'], VOLATILE_CV))
+        if near.any():
+            exact_columns = stats.index[near]
+            exact_block = full[exact_columns]
+            stats.loc[exact_columns, 'mean'] = exact_block.mean()
+            stats.loc[exact_columns, 'std'] = exact_block.std()
+            exact_mean = stats.loc[exact_columns, 'mean']
+            stats.loc[exact_columns, 'cv'] = stats.loc[exact_columns, 'std'] / exact_mean.where(exact_mean != 0).abs()
+            for name in ('mean', 'std', 'cv'):
+                intervals.loc[exact_columns, f"{name}_low"] = stats.loc[exact_columns, name]
+                intervals.loc[exact_columns, f"{name}_high"] = stats.loc[exact_columns, name]
+        
+        self.intervals = intervals[self.intervals.columns]
+        return stats[NUMERIC_STAT_COLUMNS]
+    
+    def sampling_info(self):
+        method = f"stratified by {self.strata_column}" if self.strata_column is not None else "uniform"
+        return {'rows_sampled': len(self.sample), 'rows_total': len(self.df), 'method': method,
+                'intervals': self.intervals}
+    
+    def correlation_matrix(self, dtype=None, sample_rows=None):
+        corr = correlation_matrix(self.sample, self.numeric_columns, dtype=dtype)
+        values = corr.to_numpy(dtype=np.float64).copy()
+        present = self.sample[self.numeric_columns].notna().to_numpy(dtype=np.float64)
+        low, high = chenmark_sampling.correlation_interval(values, present.T @ present, len(self.df))
+        
+        # Pairs whose interval reaches |r| = STRONG_CORRELATION could enter or leave the strong list
+        near = np.triu(chenmark_sampling.straddles(low, high, STRONG_CORRELATION)
+                       | chenmark_sampling.straddles(low, high, -STRONG_CORRELATION), k=1)
+        for i, j in zip(*np.nonzero(near)):
+            r = self.df[self.numeric_columns[i]].corr(self.df[self.numeric_columns[j]])
+            values[i, j] = values[j, i] = low[i, j] = low[j, i] = high[i, j] = high[j, i] = r
+        
+        self._correlation_bounds = (pd.DataFrame(low, index=corr.index, columns=corr.columns),
+                                    pd.DataFrame(high, index=corr.index, columns=corr.columns))
+        return pd.DataFrame(values, index=corr.index, columns=corr.columns)
+    
+    def correlation_bounds(self, col1, col2):
+        if self._correlation_bounds is None:
+            return None
+        low, high = self._correlation_bounds
+        return float(low.loc[col1, col2]), float(high.loc[col1, col2])
+    
+    def category_performance(self, col, numeric_cols):
+        """
+        Per-category mean/median/std from the sample plus mean_err, the 95% margin of each category mean
+        """
+        comparison = category_performance(self.sample, col, numeric_cols)
+        keys = self.sample[col]
+        if not isinstance(keys.dtype, pd.CategoricalDtype):
+            keys = keys.astype('category')
+        counts = self.sample[numeric_cols].groupby(keys, observed=True, sort=True).count()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for num_col in numeric_cols:
+                margin = chenmark_sampling.Z_95 * comparison[(num_col, 'std')].to_numpy() / np.sqrt(counts[num_col].to_numpy())
+                comparison[(num_col, 'mean_err')] = np.round(margin, 2)
+        return comparison[[(num_col, stat) for num_col in numeric_cols for stat in ('mean', 'median', 'std', 'mean_err')]]
+    
+    def risk_statistics(self):
+        self.sample  # Draws the sample positions if the numeric statistics did not
+        stats = sampled_risk_statistics(self.df, self.sample_positions, self.numeric_stats)
+        stats['cv_low'] = self.intervals['cv_low']
+        stats['cv_high'] = self.intervals['cv_high']
+        
+        # Settle borderline outlier shares and trend slopes over every row
+        band = TREND_SLOPE_STD * stats['std']
+        near = (chenmark_sampling.straddles(stats['outlier_pct_low'], stats['outlier_pct_high'], OUTLIER_SHARE_PCT)
+                | chenmark_sampling.straddles(stats['slope_low'], stats['slope_high'], band)
+                | chenmark_sampling.straddles(stats['slope_low'], stats['slope_high'], -band)) & (stats['count'] > 5)
+        if near.any():
+            exact_columns = stats.index[near]
+            exact_stats = self.numeric_stats.loc[exact_columns].copy()
+            quartiles = self.df[exact_columns].quantile([0.25, 0.75])
+            exact_stats['q1'] = quartiles.loc[0.25]
+            exact_stats['q3'] = quartiles.loc[0.75]
+            exact = risk_statistics(self.df, exact_stats)
+            for name in ('outlier_pct', 'slope'):
+                stats.loc[exact_columns, name] = exact[name]
+                stats.loc[exact_columns, f"{name}_low"] = exact[name]
+                stats.loc[exact_columns, f"{name}_high"] = exact[name]
+        return stats
+
+class PolarsTabProfile(TabProfile):
+    """
+    TabProfile whose statistics run as Polars queries over Arrow memory instead of pandas operations
+    
+    The tab is handed to Polars once; every statistic is then a lazy query whose per-column
+    expressions run on Polars' thread pool. Column partitions and date parsing are shared with
+    the pandas backend, and columns Arrow cannot hold (object columns mixing numbers and text)
+    keep the pandas code path, so both backends report the same findings.
+    """
+    def __init__(self, tab_name, df):
+        self.frame, self._positional_names = chenmark_polars.to_polars(df)
+        self._names = dict(zip(df.columns, self._positional_names))
+        super().__init__(tab_name, df)
+    
+    def _count_non_null(self):
+        counts = chenmark_polars.non_null_counts(self.frame)
+        return pd.Series([counts[name] if name is not None else self.df.iloc[:, position].notna().sum()
+                          for position, name in enumerate(self._positional_names)],
+                         index=self.df.columns, dtype=np.int64)
+    
+    def _describe_numeric(self):
+        if not self.numeric_columns:
+            return pd.DataFrame(columns=NUMERIC_STAT_COLUMNS, dtype=float)
+        
+        stats = chenmark_polars.describe_numeric(self.frame, [self._names[col] for col in self.numeric_columns],
+                                                 self.numeric_columns)
+        mean = stats['mean'].where(stats['mean'] != 0)
+        stats['cv'] = stats['std'] / mean.abs()
+        return stats[NUMERIC_STAT_COLUMNS]
+    
+    def _timeline_growth(self, num_cols, order):
+        firsts, lasts, counts = chenmark_polars.first_last_present(
+            self.frame, [self._names[col] for col in num_cols], order)
+        growth = {}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for num_col, start, end, count in zip(num_cols, firsts, lasts, counts):
+                if count > 1:
+                    growth[num_col] = ((np.float64(end) - start) / np.float64(start)) * 100
+        return growth
+    
+    def _period_means(self, value_cols, dates, order, alias):
+        per_period = chenmark_polars.period_means(self.frame, [self._names[col] for col in value_cols], value_cols,
+                                                  dates, order, alias)
+        per_period.index = per_period.index.to_period(alias)
+        return per_period
+    
+    def correlation_matrix(self, dtype=None, sample_rows=None):
+        positions = None
+        if sample_rows and self.shape[0] > sample_rows:
+            # The rows correlation_matrix's DataFrame.sample would draw, so both backends agree
+            positions = pd.Series(np.arange(self.shape[0])).sample(n=sample_rows, random_state=0).to_numpy()
+        return chenmark_polars.correlation_matrix(self.frame, [self._names[col] for col in self.numeric_columns],
+                                                  self.numeric_columns, dtype=dtype, positions=positions)
+    
+    def category_counts(self, col):
+        if self._names[col] is None:
+            return super().category_counts(col)
+        return chenmark_polars.category_counts(self.frame, self._names[col], col)
+    
+    def category_performance(self, col, numeric_cols):
+        if self._names[col] is None:
+            return super().category_performance(col, numeric_cols)
+        return chenmark_polars.category_performance(self.frame, self._names[col], col,
+                                                    [self._names[num_col] for num_col in numeric_cols], numeric_cols)
+    
+    def risk_statistics(self):
+        stats = self.numeric_stats
+        outlier_pct, slopes = chenmark_polars.risk_statistics(
+            self.frame, [self._names[col] for col in stats.index], stats)
+        return pd.DataFrame({
+            'count': stats['count'].to_numpy(),
+            'cv': stats['cv'].to_numpy(),
+            'std': stats['std'].to_numpy(),
+            'outlier_pct': outlier_pct,
+            'slope': slopes
+        }, index=stats.index)
+
+# Engines the analysis stages can run on (--backend); each maps to the TabProfile class that answers them
+ANALYSIS_BACKENDS = {'pandas': TabProfile, 'polars': PolarsTabProfile}
+DEFAULT_BACKEND = 'pandas'
+
+@chenmark_profiling.instrumented('profile')
+def build_tab_profiles(data_tabs, sample=None, backend=DEFAULT_BACKEND):
+    """
+    Profile every tab once so the analysis stages can share the results
+    
+    Tabs that are already profiles (e.g. from streaming mode) are passed through unchanged. With
+    sample (a row count, or a fraction below 1) tabs taller than the sample get a SampledTabProfile;
+    every other tab is profiled by the backend's class from ANALYSIS_BACKENDS.
+    """
+    profile_class = ANALYSIS_BACKENDS[backend]
+    profiles = {}
+    for tab_name, tab in data_tabs.items():
+        if isinstance(tab, TabProfile):
+            profiles[tab_name] = tab
+            continue
+        with chenmark_profiling.span('profile.tab', tab=tab_name, rows=tab.shape[0], cols=tab.shape[1]):
+            if sample and chenmark_sampling.sample_size(len(tab), sample) < len(tab):
+                profiles[tab_name] = SampledTabProfile(tab_name, tab, sample)
+            else:
+                profiles[tab_name] = profile_class(tab_name, tab)
+    return profiles
+
+class StreamingTabProfile(TabProfile):
+    """
+    TabProfile answered from chunked running statistics instead of an in-memory DataFrame
+    
+    Quantiles, medians and outlier shares come from KLL sketches and are approximate on
+    tall sheets; counts, means, variances, correlations and slopes are exact up to rounding.
+    """
+    def __init__(self, tab_name, accumulator):
+        self.tab_name = tab_name
+        self.df = None
+        self.accumulator = accumulator
+        # Margin columns without a header or a value are dropped, as _parse_sheet drops them
+        self._positions = {col: j for j, col in enumerate(accumulator.columns)
+                           if accumulator.non_null[j] or not str(col).startswith('Unnamed: ')}
+        columns = list(self._positions)
+        self.shape = (accumulator.n_rows, len(columns))
+        
+        kinds = {col: accumulator.column_kind(j) for col, j in self._positions.items()}
+        self.numeric_columns = [col for col in columns if kinds[col] == 'numeric']
+        self.text_columns = [col for col in columns if kinds[col] == 'text']
+        self.financial_columns = _financial_columns(columns)
+        self._date_columns = [col for col in columns
+                              if _is_date_like(col, kinds[col] == 'datetime') and self._parses_as_dates(col, kinds[col])]
+        
+        self.non_null_counts = pd.Series(accumulator.non_null[list(self._positions.values())], index=columns)
+        self.numeric_stats = self._describe_numeric()
+    
+    def _parses_as_dates(self, col, kind):
+        """
+        parse_date_column's test, answered from the running statistics once the sheet is streamed
+        """
+        acc = self.accumulator
+        j = self._positions[col]
+        if kind == 'datetime':
+            return True
+        if kind == 'numeric':
+            return acc.non_null[j] > 0 and _numeric_date_unit(col, acc.minimum[j], acc.maximum[j],
+                                                              acc.integral[j]) is not None
+        return kind == 'text' and acc.date_parse_share(j) >= DATE_PARSE_SHARE
+    
+    def _describe_numeric(self):
+        acc = self.accumulator
+        positions = [self._positions[col] for col in self.numeric_columns]
+        stats = pd.DataFrame({
+            'count': acc.moments.n[positions],
+            'mean': acc.moments.mean[positions],
+            'median': [acc.sketches[j].quantile(0.5) for j in positions],
+            'std': acc.moments.std()[positions],
+            'min': acc.minimum[positions],
+            'max': acc.maximum[positions],
+            'q1': [acc.sketches[j].quantile(0.25) for j in positions],
+            'q3': [acc.sketches[j].quantile(0.75) for j in positions]
+        }, index=self.numeric_columns, dtype=float)
+        stats['count'] = stats['count'].astype(np.int64)  # Same schema as the in-memory backends
+        empty = stats['count'] == 0
+        stats.loc[empty, ['mean', 'min', 'max']] = np.nan
+        mean = stats['mean'].where(stats['mean'] != 0)
+        stats['cv'] = stats['std'] / mean.abs()
+        return stats[NUMERIC_STAT_COLUMNS]
+    
+    def date_timeline(self, date_col, num_cols):
+        acc = self.accumulator
+        d = self._positions[date_col]
+        if d not in acc.date_ranges:
+            raise ValueError(f"{date_col} has no orderable values")
+        growth = {}
+        for num_col in num_cols:
+            timeline = acc.timelines.get((d, self._positions[num_col]))
+            if self.non_null_counts[num_col] > 1 and timeline is not None:
+                (_, first), (_, last) = timeline
+                growth[num_col] = ((last - first) / first) * 100
+        return acc.date_ranges[d], growth
+    
+    def period_trends(self, date_col):
+        return None  # Per-period aggregates are not tracked by the streaming pass
+    
+    def correlation_matrix(self, dtype=None, sample_rows=None):
+        positions = [self._positions[col] for col in self.numeric_columns]
+        corr = self.accumulator.correlation(positions)
+        if corr is None:
+            raise ValueError("sheet is too wide for streaming correlation statistics")
+        return pd.DataFrame(corr, index=self.numeric_columns, columns=self.numeric_columns)
+    
+    def category_counts(self, col):
+        counts = self.accumulator.category_counts[self._positions[col]]
+        if counts is None:
+            return None  # More distinct values than the streaming pass tracks
+        return pd.Series(counts, dtype='int64', name='count').rename_axis(col)
+    
+    def category_performance(self, col, numeric_cols):
+        acc = self.accumulator
+        j = self._positions[col]
+        targets = {target: t for t, target in enumerate(acc.group_targets)}
+        group_moments = acc.group_moments.get(j, {})
+        group_sketches = acc.group_sketches.get(j, {})
+        try:
+            categories = sorted(group_moments)
+        except TypeError:
+            categories = list(group_moments)
+        
+        tables = {}
+        for num_col in numeric_cols:
+            t = targets.get(self._positions[num_col])
+            if t is None:
+                continue  # Only the first few numeric columns are followed per category
+            moments = [group_moments[c] for c in categories]
+            tables[num_col] = pd.DataFrame({
+                'mean': [m.mean[t] if m.n[t] > 0 else np.nan for m in moments],
+                'median': [group_sketches[c][t].quantile(0.5) for c in categories],
+                'std': [m.std()[t] for m in moments]
+            }, index=pd.Index(categories, name=col))
+        
+        if not tables:
+            return pd.DataFrame(index=pd.Index(categories, name=col))
+        return pd.concat(tables, axis=1).round(2)
+    
+    def risk_statistics(self):
+        acc = self.accumulator
+        stats = self.numeric_stats
+        positions = [self._positions[col] for col in self.numeric_columns]
+        outlier_pct = []
+        for j, q1, q3, count in zip(positions, stats['q1'], stats['q3'], stats['count']):
+            iqr = q3 - q1
+            if iqr > 0 and count > 0:
+                sketch = acc.sketches[j]
+                outside = sketch.count_below(q1 - 1.5 * iqr) + sketch.count_above(q3 + 1.5 * iqr)
+                outlier_pct.append(outside / count * 100)
+            else:
+                outlier_pct.append(0.0)
+        return pd.DataFrame({
+            'count': stats['count'].to_numpy(),
+            'cv': stats['cv'].to_numpy(),
+            'std': stats['std'].to_numpy(),
+            'outlier_pct': outlier_pct,
+            'slope': acc.slopes()[positions]
+        }, index=stats.index)
+
+@chenmark_profiling.instrumented('load')
+def load_streaming_tabs(file_path, chunk_rows=chenmark_streaming.DEFAULT_CHUNK_ROWS,
+                        sketch_size=chenmark_streaming.DEFAULT_SKETCH_SIZE, verbose=True):
+    """
+    Stream every tab through running statistics in bounded memory instead of loading DataFrames
+    """
+    if not os.path.exists(file_path):
+        print(f"❌ File not found at: {file_path}")
+        return {}, []
+    
+    try:
+        load_start = time.perf_counter()
+        workbook = chenmark_streaming.open_streaming_workbook(file_path)
+        layouts = chenmark_layout.sheet_layouts(file_path)
+        skipped = {name: layout['kind'] for name, layout in layouts.items()
+                   if layout['kind'] in chenmark_layout.SKIPPED_KINDS}
+        sheet_names = [name for name in workbook.sheetnames if name not in skipped]
+        if verbose:
+            print(f"📊 CHENMARK CASE STUDY ANALYSIS - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            print("="*80)
+            if skipped:
+                print(f"⏭️  Skipping {len(skipped)} chart/pivot sheet(s): "
+                      + ", ".join(f"{name} ({kind})" for name, kind in skipped.items()))
+            print(f"Found {len(sheet_names)} tabs in the Excel file (streaming, {chunk_rows:,} rows per chunk):")
+        
+        data_tabs = {}
+        try:
+            for i, sheet_name in enumerate(sheet_names):
+                if verbose:
+                    print(f"  {i+1}. {sheet_name}")
+                sheet_start = time.perf_counter()
+                try:
+                    with chenmark_profiling.span('load.sheet', tab=sheet_name):
+                        layout = layouts.get(sheet_name) or {}
+                        accumulator = chenmark_streaming.stream_sheet(workbook[sheet_name], chunk_rows, sketch_size,
+                                                                      first_row=layout.get('header_row'),
+                                                                      last_row=layout.get('last_row'))
+                        profile = StreamingTabProfile(sheet_name, accumulator)
+                        chenmark_profiling.annotate(rows=profile.shape[0], cols=profile.shape[1])
+                    data_tabs[sheet_name] = profile
+                    if verbose:
+                        print(f"     └─ Shape: {profile.shape} (streamed in {time.perf_counter() - sheet_start:.2f}s)")
+                    if accumulator.ignored_cells:
+                        print(f"     └─ ⚠️  {accumulator.ignored_cells} cells beyond the header width were ignored")
+                except Exception as e:
+                    print(f"     └─ Error loading: {e}")
+        finally:
+            workbook.close()
+        
+        chenmark_profiling.annotate(rows=sum(p.shape[0] for p in data_tabs.values()),
+                                    cols=sum(p.shape[1] for p in data_tabs.values()))
+        if verbose:
+            print(f"⏱️  Workbook streamed in {time.perf_counter() - load_start:.2f}s")
+        return data_tabs, sheet_names
+    
+    except Exception as e:
+        print(f"❌ Error reading Excel file: {e}")
+        return {}, []
+
+def _print_stage_header(title):
     print("\n" + "="*80)
-    print("🏢 COMPREHENSIVE FINANCIAL ANALYSIS")
+    print(title)
     print("="*80)
+
+def _print_financial_tab(tab_name, metrics):
+    """
+    Console rendering of one tab's financial metrics
+    """
+    print(f"\n📈 Analyzing {tab_name}:")
+    print("-" * 50)
+    
+    # Basic info
+    print(f"Dimensions: {metrics['shape'][0]} rows × {metrics['shape'][1]} columns")
+    sampling = metrics.get('sampling')
+    intervals = sampling['intervals'] if sampling else None
+    if sampling:
+        print(f"Sampled {sampling['rows_sampled']:,} of {sampling['rows_total']:,} rows ({sampling['method']}); "
+              f"± gives 95% confidence intervals")
+    
+    def margin(col, name):
+        if intervals is None:
+            return ""
+        return _margin(intervals.loc[col, f"{name}_low"], intervals.loc[col, f"{name}_high"], ',.2f')
+    
+    if metrics['financial_columns']:
+        print(f"Financial columns found: {metrics['financial_columns']}")
+        
+        numeric_cols = metrics['numeric_columns']
+        if len(numeric_cols) > 0:
+            print("\nKey Statistics:")
+            for col in numeric_cols[:5]:  # Show first 5 numeric columns
+                stats = metrics['statistics'].loc[col]
+                if stats['count'] > 0:
+                    print(f"  {col}:")
+                    print(f"    Mean: {stats['mean']:,.2f}{margin(col, 'mean')}")
+                    print(f"    Median: {stats['median']:,.2f}{margin(col, 'median')}")
+                    print(f"    Std Dev: {stats['std']:,.2f}{margin(col, 'std')}")
+                    if stats['min'] != stats['max']:
+                        print(f"    Range: {stats['min']:,.2f} to {stats['max']:,.2f}")
+
+@chenmark_profiling.instrumented('financial')
+def comprehensive_financial_analysis(data_tabs, profiles=None, verbose=True):
+    """
+    Perform comprehensive financial analysis across all tabs
+    """
+    if verbose:
+        _print_stage_header("🏢 COMPREHENSIVE FINANCIAL ANALYSIS")
+    
+    profiles = profiles or build_tab_profiles(data_tabs)
     
     # Find financial data across tabs
     financial_metrics = {}
     
-    for tab_name, df in data_tabs.items():
-        print(f"\n📈 Analyzing {tab_name}:")
-        print("-" * 50)
-        
-        # Basic info
-        print(f"Dimensions: {df.shape[0]} rows × {df.shape[1]} columns")
-        
-        # Look for key financial indicators
-        financial_columns = []
-        for col in df.columns:
-            col_lower = str(col).lower()
-            if any(term in col_lower for term in ['revenue', 'sales', 'profit', 'ebitda', 
-                                                  'margin', 'cost', 'expense', 'cash', 
-                                                  'debt', 'equity', 'roi', 'growth',
-                                                  'income', 'earnings', 'assets', 'liabilities']):
-                financial_columns.append(col)
-        
-        if financial_columns:
-            print(f"Financial columns found: {financial_columns}")
-            
-            # Calculate key metrics for numeric columns
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            if len(numeric_cols) > 0:
-                print("\nKey Statistics:")
-                for col in numeric_cols[:5]:  # Show first 5 numeric columns
-                    if df[col].notna().sum() > 0:
-                        print(f"  {col}:")
-                        print(f"    Mean: {df[col].mean():,.2f}")
-                        print(f"    Median: {df[col].median():,.2f}")
-                        print(f"    Std Dev: {df[col].std():,.2f}")
-                        if df[col].min() != df[col].max():
-                            print(f"    Range: {df[col].min():,.2f} to {df[col].max():,.2f}")
-        
-        # Store for cross-tab analysis
-        financial_metrics[tab_name] = {
-            'shape': df.shape,
-            'numeric_columns': list(df.select_dtypes(include=[np.number]).columns),
-            'financial_columns': financial_columns,
-            'data': df
-        }
+    for tab_name in data_tabs:
+        profile = profiles[tab_name]
+        with chenmark_profiling.span('financial.tab', tab=tab_name, rows=profile.shape[0], cols=profile.shape[1]):
+            # Store for cross-tab analysis
+            financial_metrics[tab_name] = chenmark_results.FinancialMetrics(
+                shape=profile.shape,
+                numeric_columns=list(profile.numeric_columns),
+                financial_columns=profile.financial_columns,
+                statistics=profile.numeric_stats,
+                data=profile.df,
+                sampling=profile.sampling_info()
+            )
+            if verbose:
+                _print_financial_tab(tab_name, financial_metrics[tab_name])
     
     return financial_metrics
 
-def advanced_trend_analysis(data_tabs):
+def correlation_matrix(df, columns, dtype=None, sample_rows=None, random_state=0):
+    """
+    Pairwise correlation of numeric columns, optionally in float32 or on a row sample for very tall sheets
+    """
+    block = df[columns]
+    if sample_rows and len(block) > sample_rows:
+        block = block.sample(n=sample_rows, random_state=random_state)
+    
+    # Without missing values a single BLAS-backed corrcoef replaces pandas' pairwise loop
+    values = block.to_numpy(dtype=dtype or np.float64, na_value=np.nan)
+    if len(values) > 1 and not np.isnan(values).any():
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = np.corrcoef(values, rowvar=False, dtype=values.dtype)
+        return pd.DataFrame(corr, index=columns, columns=columns)
+    
+    # Pairwise-complete correlation with NaNs needs the pandas path
+    return block.corr()
+
+def strong_correlations(corr_matrix, threshold=0.5, top_k=None):
+    """
+    Upper-triangle column pairs with |r| above the threshold, strongest first
+    """
+    values = corr_matrix.to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        strong = np.triu(np.abs(values) > threshold, k=1)  # NaN compares False
+    rows, cols = np.nonzero(strong)
+    pair_values = values[rows, cols]
+    strength = np.abs(pair_values)
+    
+    if top_k is not None and 0 < top_k < len(strength):
+        # Partial selection avoids sorting the full pair list on wide sheets
+        keep = np.sort(np.argpartition(-strength, top_k - 1)[:top_k])
+        order = keep[np.argsort(-strength[keep], kind='stable')]
+    else:
+        order = np.argsort(-strength, kind='stable')
+    
+    labels = corr_matrix.columns
+    return [(labels[rows[k]], labels[cols[k]], float(pair_values[k])) for k in order]
+
+def _print_trend_tab(tab_name, numeric_columns, trend):
+    """
+    Console rendering of one tab's timelines and correlations
+    """
+    print(f"\n🔍 Trend Analysis for {tab_name}:")
+    print("-" * 40)
+    
+    if trend['date_columns']:
+        print(f"Date columns found: {trend['date_columns']}")
+        for date_col, timeline in trend['timelines'].items():
+            print(f"\n  Timeline for {date_col}:")
+            if 'error' in timeline:
+                print(f"    Error in trend analysis: {timeline['error']}")
+                continue
+            print(f"    Period: {timeline['start']} to {timeline['end']}")
+            metrics = timeline.get('metrics')
+            for num_col, growth_rate in timeline['growth'].items():
+                print(f"    {num_col} growth: {growth_rate:.1f}%")
+                if metrics is not None and num_col in metrics.index:
+                    row = metrics.loc[num_col]
+                    # CAGR is undefined unless the first and last periods are positive; skip undefined clauses
+                    parts = []
+                    if np.isfinite(row['cagr_pct']):
+                        parts.append(f"CAGR: {row['cagr_pct']:.1f}%")
+                    if np.isfinite(row['latest_change_pct']):
+                        parts.append(f"latest {timeline['frequency']} change: {row['latest_change_pct']:+.1f}%")
+                    if parts:
+                        print(f"      {', '.join(parts)} ({row['periods']} periods)")
+    
+    if len(numeric_columns) > 1:
+        print(f"\n  Correlation Analysis:")
+        if trend['correlation_error'] is not None:
+            print(f"    Error in correlation analysis: {trend['correlation_error']}")
+        elif trend['correlations']:
+            print("    Strong correlations found:")
+            intervals = trend.get('correlation_intervals') or [None] * len(trend['correlations'])
+            for (col1, col2, corr), bounds in list(zip(trend['correlations'], intervals))[:5]:
+                if bounds is None:
+                    print(f"      {col1} ↔ {col2}: {corr:.3f}")
+                elif bounds[0] == bounds[1]:
+                    print(f"      {col1} ↔ {col2}: {corr:.3f} (exact)")
+                else:
+                    print(f"      {col1} ↔ {col2}: {corr:.3f} (95% CI {bounds[0]:.3f} to {bounds[1]:.3f})")
+        else:
+            print(f"    No strong correlations found (>{STRONG_CORRELATION})")
+
+@chenmark_profiling.instrumented('trend')
+def advanced_trend_analysis(data_tabs, profiles=None, corr_top_k=None, corr_dtype=None, corr_sample_rows=None,
+                            verbose=True):
     """
     Perform advanced trend analysis looking for time-based patterns
     """
-    print("\n" + "="*80)
-    print("📊 ADVANCED TREND ANALYSIS")
-    print("="*80)
+    if verbose:
+        _print_stage_header("📊 ADVANCED TREND ANALYSIS")
+    
+    profiles = profiles or build_tab_profiles(data_tabs)
     
     trends = {}
     
-    for tab_name, df in data_tabs.items():
-        print(f"\n🔍 Trend Analysis for {tab_name}:")
-        print("-" * 40)
-        
-        # Look for date columns
-        date_columns = []
-        for col in df.columns:
-            if df[col].dtype == 'datetime64[ns]' or 'date' in str(col).lower() or 'year' in str(col).lower():
-                date_columns.append(col)
-        
-        if date_columns:
-            print(f"Date columns found: {date_columns}")
+    for tab_name in data_tabs:
+        profile = profiles[tab_name]
+        with chenmark_profiling.span('trend.tab', tab=tab_name, rows=profile.shape[0], cols=profile.shape[1]):
+            # Look for date columns
+            date_columns = profile.date_columns
+            numeric_cols = profile.numeric_columns
             
             # Time series analysis for each date column
+            timelines = {}
             for date_col in date_columns:
-                if df[date_col].notna().sum() > 1:
-                    print(f"\n  Timeline for {date_col}:")
+                if profile.non_null_counts[date_col] > 1:
                     try:
-                        df_sorted = df.sort_values(date_col)
-                        print(f"    Period: {df_sorted[date_col].min()} to {df_sorted[date_col].max()}")
-                        
-                        # Calculate growth rates if there are numeric columns
-                        numeric_cols = df.select_dtypes(include=[np.number]).columns
-                        for num_col in numeric_cols[:3]:  # Analyze first 3 numeric columns
-                            if df[num_col].notna().sum() > 1:
-                                values = df_sorted[num_col].dropna()
-                                if len(values) > 1:
-                                    growth_rate = ((values.iloc[-1] - values.iloc[0]) / values.iloc[0]) * 100
-                                    print(f"    {num_col} growth: {growth_rate:.1f}%")
+                        # Calculate growth rates for the first 3 numeric columns
+                        (start, end), growth = profile.date_timeline(date_col, numeric_cols[:3])
+                        timelines[date_col] = {'start': start, 'end': end, 'growth': growth,
+                                               'frequency': None, 'metrics': None}
+                        # Period-over-period change, CAGR and rolling statistics for every numeric column
+                        period_trends = profile.period_trends(date_col)
+                        if period_trends is not None:
+                            timelines[date_col]['frequency'], timelines[date_col]['metrics'] = period_trends
                     except Exception as e:
-                        print(f"    Error in trend analysis: {e}")
-        
-        # Look for sequential data patterns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        correlations = []
-        if len(numeric_cols) > 1:
-            print(f"\n  Correlation Analysis:")
-            try:
-                corr_matrix = df[numeric_cols].corr()
-                
-                # Find strongest correlations
-                for i in range(len(corr_matrix.columns)):
-                    for j in range(i+1, len(corr_matrix.columns)):
-                        corr_val = corr_matrix.iloc[i, j]
-                        if not pd.isna(corr_val) and abs(corr_val) > 0.5:
-                            correlations.append((
-                                corr_matrix.columns[i], 
-                                corr_matrix.columns[j], 
-                                corr_val
-                            ))
-                
-                if correlations:
-                    correlations.sort(key=lambda x: abs(x[2]), reverse=True)
-                    print("    Strong correlations found:")
-                    for col1, col2, corr in correlations[:5]:
-                        print(f"      {col1} ↔ {col2}: {corr:.3f}")
-                else:
-                    print("    No strong correlations found (>0.5)")
-            except Exception as e:
-                print(f"    Error in correlation analysis: {e}")
-        
-        trends[tab_name] = {
-            'date_columns': date_columns,
-            'correlations': correlations
-        }
+                        timelines[date_col] = {'error': str(e)}
+            
+            # Look for sequential data patterns
+            correlations = []
+            correlation_error = None
+            if len(numeric_cols) > 1:
+                try:
+                    corr_matrix = profile.correlation_matrix(dtype=corr_dtype, sample_rows=corr_sample_rows)
+                    
+                    # Find strongest correlations
+                    correlations = strong_correlations(corr_matrix, threshold=STRONG_CORRELATION, top_k=corr_top_k)
+                except Exception as e:
+                    correlation_error = str(e)
+            
+            # 95% bounds per reported pair when the correlations come from a sample
+            correlation_intervals = None
+            if profile.sampling_info() is not None and correlation_error is None:
+                correlation_intervals = [profile.correlation_bounds(col1, col2) for col1, col2, _ in correlations]
+            
+            trends[tab_name] = chenmark_results.TrendResult(
+                date_columns=date_columns,
+                timelines=timelines,
+                correlations=correlations,
+                correlation_error=correlation_error,
+                correlation_intervals=correlation_intervals
+            )
+            if verbose:
+                _print_trend_tab(tab_name, numeric_cols, trends[tab_name])
     
     return trends
 
-def competitive_analysis(data_tabs):
+def category_performance(df, category_col, numeric_cols):
+    """
+    Mean, median and std of each numeric column per category in a single groupby
+    """
+    keys = df[category_col]
+    if not isinstance(keys.dtype, pd.CategoricalDtype):
+        keys = keys.astype('category')  # Low-cardinality keys group on integer codes
+    grouped = df[numeric_cols].groupby(keys, observed=True, sort=True)
+    return grouped.agg(['mean', 'median', 'std']).round(2)
+
+def _print_competitive_tab(tab_name, numeric_columns, insight):
+    """
+    Console rendering of one tab's category counts and per-category performance tables
+    """
+    print(f"\n🎯 Market Analysis for {tab_name}:")
+    print("-" * 40)
+    
+    for col, counts in insight['category_counts'].items():
+        print(f"\n  Categories in {col}:")
+        for i, (value, count) in enumerate(counts['records'].iloc[:10].items()):  # Show first 10
+            print(f"    {i+1}. {value}: {count} records")
+        
+        if len(numeric_columns) > 0:
+            print(f"\n  Performance Comparison by {col}:")
+            if col in insight['errors']:
+                print(f"    Error in comparison: {insight['errors'][col]}")
+                continue
+            comparison = insight['performance'][col]
+            for num_col in comparison.columns.get_level_values(0).unique():
+                print(f"    {num_col}:")
+                print(comparison[num_col].head())
+
+@chenmark_profiling.instrumented('competitive')
+def competitive_analysis(data_tabs, profiles=None, verbose=True):
     """
     Perform competitive and market analysis
     """
-    print("\n" + "="*80)
-    print("🏆 COMPETITIVE & MARKET ANALYSIS")
-    print("="*80)
+    if verbose:
+        _print_stage_header("🏆 COMPETITIVE & MARKET ANALYSIS")
+    
+    profiles = profiles or build_tab_profiles(data_tabs)
     
     competitive_insights = {}
     
-    for tab_name, df in data_tabs.items():
-        print(f"\n🎯 Market Analysis for {tab_name}:")
-        print("-" * 40)
-        
-        # Look for company/competitor identifiers
-        text_cols = df.select_dtypes(include=['object']).columns
-        
-        if len(text_cols) > 0:
+    for tab_name in data_tabs:
+        profile = profiles[tab_name]
+        with chenmark_profiling.span('competitive.tab', tab=tab_name, rows=profile.shape[0], cols=profile.shape[1]):
+            # Look for company/competitor identifiers
+            text_cols = profile.text_columns
+            numeric_cols = profile.numeric_columns
+            
+            category_counts = {}
+            performance = {}
+            errors = {}
+            
             for col in text_cols[:3]:  # Check first 3 text columns
-                unique_values = df[col].dropna().unique()
-                if 2 <= len(unique_values) <= 20:  # Reasonable number for companies/segments
-                    print(f"\n  Categories in {col}:")
-                    for i, value in enumerate(unique_values[:10]):  # Show first 10
-                        count = df[df[col] == value].shape[0]
-                        print(f"    {i+1}. {value}: {count} records")
+                counts = profile.category_counts(col)
+                if counts is not None and 2 <= len(counts) <= 20:  # Reasonable number for companies/segments
+                    category_counts[col] = counts.rename('records').to_frame()
                     
                     # Performance comparison if numeric data exists
-                    numeric_cols = df.select_dtypes(include=[np.number]).columns
                     if len(numeric_cols) > 0:
-                        print(f"\n  Performance Comparison by {col}:")
-                        for num_col in numeric_cols[:3]:
-                            if df[num_col].notna().sum() > 0:
-                                try:
-                                    comparison = df.groupby(col)[num_col].agg(['mean', 'median', 'std']).round(2)
-                                    print(f"    {num_col}:")
-                                    print(comparison.head())
-                                except Exception as e:
-                                    print(f"    Error in comparison: {e}")
-        
-        competitive_insights[tab_name] = {
-            'text_columns': list(text_cols),
-            'analysis_performed': True
-        }
+                        compare_cols = [num_col for num_col in numeric_cols[:3] if profile.non_null_counts[num_col] > 0]
+                        try:
+                            performance[col] = profile.category_performance(col, compare_cols)
+                        except Exception as e:
+                            errors[col] = str(e)
+            
+            competitive_insights[tab_name] = chenmark_results.CompetitiveInsight(
+                text_columns=list(text_cols),
+                analysis_performed=True,
+                category_counts=category_counts,
+                performance=performance,
+                errors=errors
+            )
+            if verbose:
+                _print_competitive_tab(tab_name, numeric_cols, competitive_insights[tab_name])
     
     return competitive_insights
 
-def risk_and_opportunity_analysis(data_tabs):
+def risk_statistics(df, numeric_stats, max_block_cells=4 * 1024 * 1024):
+    """
+    IQR outlier share and OLS trend slope for every numeric column, batched over column blocks
+    
+    Slopes regress each column's non-null values on their position 0..n-1, matching
+    np.polyfit(range(len(values)), values, 1) on the dropna'd column.
+    """
+    columns = list(numeric_stats.index)
+    outlier_pct = np.zeros(len(columns))
+    slopes = np.full(len(columns), np.nan)
+    
+    q1_all = numeric_stats['q1'].to_numpy(dtype=np.float64)
+    q3_all = numeric_stats['q3'].to_numpy(dtype=np.float64)
+    block_size = max(1, max_block_cells // max(len(df), 1))
+    
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        for start in range(0, len(columns), block_size):
+            block = slice(start, start + block_size)
+            values = df[columns[block]].to_numpy(dtype=np.float64, na_value=np.nan)
+            present = ~np.isnan(values)
+            n = present.sum(axis=0)
+            
+            # Outliers: broadcast the per-column IQR fences over the whole block
+            q1, q3 = q1_all[block], q3_all[block]
+            iqr = q3 - q1
+            outside = (values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)
+            counts = outside.sum(axis=0)
+            outlier_pct[block] = np.where((iqr > 0) & (n > 0), counts / np.maximum(n, 1) * 100, 0.0)
+            
+            # Closed-form OLS slope: sum((x - x_mean) * y) / sum((x - x_mean)^2) with x = 0..n-1
+            x_centered = np.cumsum(present, axis=0) - 1 - (n - 1) / 2
+            sxy = np.where(present, x_centered * values, 0.0).sum(axis=0)
+            sxx = n * (n * n - 1) / 12
+            slopes[block] = np.where(n > 1, sxy / np.maximum(sxx, 1), np.nan)
+    
+    return pd.DataFrame({
+        'count': numeric_stats['count'].to_numpy(),
+        'cv': numeric_stats['cv'].to_numpy(),
+        'std': numeric_stats['std'].to_numpy(),
+        'outlier_pct': outlier_pct,
+        'slope': slopes
+    }, index=numeric_stats.index)
+
+def sampled_risk_statistics(df, positions, numeric_stats):
+    """
+    risk_statistics over the sampled rows (positions into df) with 95% bounds for outlier share and slope
+    
+    Outlier fences come from the sampled quartiles. Slopes regress on each value's position among
+    the column's non-null values in the full tab, so they estimate the same slope as the exact pass.
+    """
+    columns = list(numeric_stats.index)
+    sample = df.iloc[positions]
+    stats = risk_statistics(sample, numeric_stats)
+    
+    values = sample[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    x = np.empty_like(values)
+    for j, col in enumerate(columns):
+        x[:, j] = (np.cumsum(df[col].notna().to_numpy()) - 1)[positions]
+    slope, margin = chenmark_sampling.slope_intervals(x, values)
+    n = (~np.isnan(values)).sum(axis=0)
+    low, high = chenmark_sampling.share_interval(stats['outlier_pct'].to_numpy() / 100, n,
+                                                 numeric_stats['count'].to_numpy(dtype=np.float64))
+    
+    stats['outlier_pct_low'] = low * 100
+    stats['outlier_pct_high'] = high * 100
+    stats['slope'] = slope
+    stats['slope_low'] = slope - margin
+    stats['slope_high'] = slope + margin
+    return stats
+
+def _margin(low, high, fmt):
+    """
+    ' ± half-width' of a sampled estimate's 95% interval, ', exact' once recomputed over every row, '' otherwise
+    """
+    if low is None or high is None or pd.isna(low) or pd.isna(high):
+        return ""
+    if low == high:
+        return ", exact"
+    return f" ± {format((high - low) / 2, fmt)}"
+
+def _print_risk_tab(tab_name, outcome):
+    """
+    Console rendering of one tab's top risks and opportunities
+    """
+    print(f"\n🔍 Risk Analysis for {tab_name}:")
+    print("-" * 40)
+    
+    if outcome['risks']:
+        print("  🚨 Identified Risks:")
+        for i, risk in enumerate(outcome['risks'][:5], 1):
+            print(f"    {i}. {risk}")
+    
+    if outcome['opportunities']:
+        print("  🌟 Identified Opportunities:")
+        for i, opp in enumerate(outcome['opportunities'][:5], 1):
+            print(f"    {i}. {opp}")
+    
+    if not outcome['risks'] and not outcome['opportunities']:
+        print("  ✅ No significant risks or opportunities detected in numeric data")
+
+RISK_INTERVAL_COLUMNS = ['outlier_pct', 'outlier_pct_low', 'outlier_pct_high', 'slope', 'slope_low', 'slope_high']
+
+@chenmark_profiling.instrumented('risk')
+def risk_and_opportunity_analysis(data_tabs, profiles=None, verbose=True):
     """
     Identify risks and opportunities from the data
     """
-    print("\n" + "="*80)
-    print("⚠️  RISK & OPPORTUNITY ANALYSIS")
-    print("="*80)
+    if verbose:
+        _print_stage_header("⚠️  RISK & OPPORTUNITY ANALYSIS")
+    
+    profiles = profiles or build_tab_profiles(data_tabs)
     
     risks_opportunities = {}
     
-    for tab_name, df in data_tabs.items():
-        print(f"\n🔍 Risk Analysis for {tab_name}:")
-        print("-" * 40)
-        
-        tab_risks = []
-        tab_opportunities = []
-        
-        # Analyze numeric columns for volatility and outliers
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        
-        for col in numeric_cols:
-            if df[col].notna().sum() > 5:  # Need at least 5 data points
-                values = df[col].dropna()
-                
-                # Calculate volatility (coefficient of variation)
-                if values.mean() != 0:
-                    cv = values.std() / abs(values.mean())
+    for tab_name in data_tabs:
+        profile = profiles[tab_name]
+        with chenmark_profiling.span('risk.tab', tab=tab_name, rows=profile.shape[0], cols=profile.shape[1]):
+            tab_risks = []
+            tab_opportunities = []
+            
+            # Volatility, outlier and trend statistics for every numeric column in one batched pass
+            risk_stats = profile.risk_statistics()
+            
+            for col, stats in zip(risk_stats.index, risk_stats.itertuples(index=False)):
+                if stats.count > 5:  # Need at least 5 data points
+                    # Calculate volatility (coefficient of variation)
+                    if not pd.isna(stats.cv):
+                        cv_text = f"{stats.cv:.2f}" + _margin(getattr(stats, 'cv_low', None),
+                                                               getattr(stats, 'cv_high', None), '.2f')
+                        if stats.cv > VOLATILE_CV:  # High volatility
+                            tab_risks.append(f"High volatility in {col} (CV: {cv_text})")
+                        elif stats.cv < STABLE_CV:  # Very stable
+                            tab_opportunities.append(f"Stable performance in {col} (CV: {cv_text})")
                     
-                    if cv > 0.5:  # High volatility
-                        tab_risks.append(f"High volatility in {col} (CV: {cv:.2f})")
-                    elif cv < 0.1:  # Very stable
-                        tab_opportunities.append(f"Stable performance in {col} (CV: {cv:.2f})")
-                
-                # Identify outliers
-                try:
-                    q1, q3 = values.quantile([0.25, 0.75])
-                    iqr = q3 - q1
-                    if iqr > 0:
-                        outliers = values[(values < (q1 - 1.5 * iqr)) | (values > (q3 + 1.5 * iqr))]
-                        
-                        if len(outliers) > 0:
-                            outlier_pct = (len(outliers) / len(values)) * 100
-                            if outlier_pct > 10:
-                                tab_risks.append(f"Many outliers in {col} ({outlier_pct:.1f}% of data)")
-                except Exception as e:
-                    pass  # Skip if quartile calculation fails
-                
-                # Growth trends
-                if len(values) > 1:
-                    try:
-                        recent_trend = np.polyfit(range(len(values)), values, 1)[0]
-                        if recent_trend > 0 and abs(recent_trend) > values.std() * 0.1:
-                            tab_opportunities.append(f"Positive trend in {col} (slope: {recent_trend:.2f})")
-                        elif recent_trend < 0 and abs(recent_trend) > values.std() * 0.1:
-                            tab_risks.append(f"Declining trend in {col} (slope: {recent_trend:.2f})")
-                    except Exception as e:
-                        pass  # Skip if trend calculation fails
-        
-        # Display findings
-        if tab_risks:
-            print("  🚨 Identified Risks:")
-            for i, risk in enumerate(tab_risks[:5], 1):
-                print(f"    {i}. {risk}")
-        
-        if tab_opportunities:
-            print("  🌟 Identified Opportunities:")
-            for i, opp in enumerate(tab_opportunities[:5], 1):
-                print(f"    {i}. {opp}")
-        
-        if not tab_risks and not tab_opportunities:
-            print("  ✅ No significant risks or opportunities detected in numeric data")
-        
-        risks_opportunities[tab_name] = {
-            'risks': tab_risks,
-            'opportunities': tab_opportunities
-        }
+                    # Identify outliers
+                    if stats.outlier_pct > OUTLIER_SHARE_PCT:
+                        outlier_margin = _margin(getattr(stats, 'outlier_pct_low', None),
+                                                 getattr(stats, 'outlier_pct_high', None), '.1f')
+                        tab_risks.append(f"Many outliers in {col} ({stats.outlier_pct:.1f}% of data{outlier_margin})")
+                    
+                    # Growth trends; a constant column has none, whatever rounding leaves in its slope and std
+                    slope = stats.slope
+                    slope_text = f"{slope:.2f}" + _margin(getattr(stats, 'slope_low', None),
+                                                          getattr(stats, 'slope_high', None), '.2f')
+                    constant = profile.numeric_stats.at[col, 'min'] == profile.numeric_stats.at[col, 'max']
+                    trending = not constant and abs(slope) > stats.std * TREND_SLOPE_STD
+                    if slope > 0 and trending:
+                        tab_opportunities.append(f"Positive trend in {col} (slope: {slope_text})")
+                    elif slope < 0 and trending:
+                        tab_risks.append(f"Declining trend in {col} (slope: {slope_text})")
+            
+            sampled = 'cv_low' in risk_stats.columns
+            risks_opportunities[tab_name] = chenmark_results.RiskResult(
+                risks=tab_risks,
+                opportunities=tab_opportunities,
+                intervals=risk_stats[RISK_INTERVAL_COLUMNS] if sampled else None
+            )
+            if verbose:
+                _print_risk_tab(tab_name, risks_opportunities[tab_name])
     
     return risks_opportunities
 
-def strategic_recommendations(financial_metrics, trends, competitive_insights, risks_opportunities):
+ANALYSIS_STAGES = (
+    comprehensive_financial_analysis,
+    advanced_trend_analysis,
+    competitive_analysis,
+    risk_and_opportunity_analysis
+)
+
+def render_tab_results(financial_metrics, trends, competitive_insights, risks_opportunities):
+    """
+    Print every stage's per-tab sections from results computed without console output (e.g. reused ones)
+    """
+    _print_stage_header("🏢 COMPREHENSIVE FINANCIAL ANALYSIS")
+    for tab_name, metrics in financial_metrics.items():
+        _print_financial_tab(tab_name, metrics)
+    
+    _print_stage_header("📊 ADVANCED TREND ANALYSIS")
+    for tab_name, trend in trends.items():
+        _print_trend_tab(tab_name, financial_metrics[tab_name]['numeric_columns'], trend)
+    
+    _print_stage_header("🏆 COMPETITIVE & MARKET ANALYSIS")
+    for tab_name, insight in competitive_insights.items():
+        _print_competitive_tab(tab_name, financial_metrics[tab_name]['numeric_columns'], insight)
+    
+    _print_stage_header("⚠️  RISK & OPPORTUNITY ANALYSIS")
+    for tab_name, outcome in risks_opportunities.items():
+        _print_risk_tab(tab_name, outcome)
+
+def _run_stages(data_tabs, profiles, trend_options=None, verbose=True):
+    """
+    Run every analysis stage in order over the given tabs
+    """
+    stage_kwargs = {advanced_trend_analysis: trend_options or {}}
+    return tuple(stage(data_tabs, profiles, verbose=verbose, **stage_kwargs.get(stage, {}))
+                 for stage in ANALYSIS_STAGES)
+
+def _analyze_single_tab(tab_name, df, trend_options=None, trace_memory=None, verbose=True, sample=None,
+                        backend=DEFAULT_BACKEND):
+    """
+    Run the full analysis chain for one tab in a worker, capturing its console output as one block
+    
+    When trace_memory is not None the worker records profiling spans and returns them to the parent.
+    """
+    if trace_memory is not None:
+        chenmark_profiling.enable(trace_memory)
+    
+    single_tab = {tab_name: df}
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        profiles = build_tab_profiles(single_tab, sample, backend)
+        results = [stage_results[tab_name]
+                   for stage_results in _run_stages(single_tab, profiles, trend_options, verbose)]
+    
+    # The parent already holds the frame, so don't pickle it back
+    results[0]['data'] = None
+    spans = chenmark_profiling.disable() if trace_memory is not None else []
+    return results, buffer.getvalue(), spans
+
+def _process_pool(max_workers, backend=DEFAULT_BACKEND):
+    """
+    ProcessPoolExecutor for the analysis workers
+    
+    Polars' thread pool deadlocks in a forked child once the parent has started it, so with the
+    polars backend workers are spawned fresh instead of forked.
+    """
+    from concurrent.futures import ProcessPoolExecutor  # Deferred: pulls in multiprocessing
+    
+    if backend != 'polars':
+        return ProcessPoolExecutor(max_workers=max_workers)
+    import multiprocessing
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+@chenmark_profiling.instrumented('pipeline')
+def run_tab_analyses(data_tabs, workers=1, trend_options=None, verbose=True, sample=None, backend=DEFAULT_BACKEND):
+    """
+    Run the financial, trend, competitive and risk stages, fanning tabs out to worker processes when workers > 1
+    
+    With sample set, tabs taller than the sample are analyzed approximately (see SampledTabProfile);
+    backend names the engine from ANALYSIS_BACKENDS that computes the statistics.
+    """
+    if workers <= 1 or len(data_tabs) <= 1:
+        return _run_stages(data_tabs, build_tab_profiles(data_tabs, sample, backend), trend_options, verbose)
+    
+    trace_memory = chenmark_profiling.memory_tracing() if chenmark_profiling.is_enabled() else None
+    merged = tuple({} for _ in ANALYSIS_STAGES)
+    with _process_pool(min(workers, len(data_tabs)), backend) as pool:
+        futures = [(tab_name, pool.submit(_analyze_single_tab, tab_name, df,
+                                          trend_options, trace_memory, verbose, sample, backend))
+                   for tab_name, df in data_tabs.items()]
+        
+        # Collect in sheet order so each tab's output stays in one block
+        for tab_name, future in futures:
+            results, output, spans = future.result()
+            print(output, end='')
+            chenmark_profiling.add_spans(spans)
+            for stage_results, tab_result in zip(merged, results):
+                stage_results[tab_name] = tab_result
+            tab = data_tabs[tab_name]
+            merged[0][tab_name]['data'] = tab.df if isinstance(tab, TabProfile) else tab
+    
+    return merged
+
+ANALYSIS_VERSION = 5  # Bump whenever a stage's output changes so stored per-tab results are recomputed
+
+def _results_key(trend_options=None, compact=False, sample=None, backend=DEFAULT_BACKEND):
+    """
+    Key for stored per-tab results: the analysis version plus every option that changes the results
+    
+    The backend is part of it: both report the same findings, but floating-point sums may differ in the last digits.
+    """
+    payload = json.dumps({'version': ANALYSIS_VERSION, 'trend': trend_options or {}, 'compact': compact,
+                          'sample': sample, 'backend': backend}, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+@chenmark_profiling.instrumented('incremental')
+def run_incremental_analyses(file_path, data_tabs, workers=1, trend_options=None, verbose=True, cache_dir=None,
+                             compact=False, sample=None, backend=DEFAULT_BACKEND):
+    """
+    Reuse stored per-tab results for sheets whose content is unchanged and analyze only the others
+    
+    Results are kept next to each sheet's cached data, keyed by its content digest and the
+    analysis options, so a tab edited since the last run is the only one recomputed.
+    """
+    cache_entry = chenmark_cache.open_workbook_cache(file_path, cache_dir)
+    if cache_entry is None:
+        return run_tab_analyses(data_tabs, workers, trend_options, verbose, sample, backend)
+    
+    options_key = _results_key(trend_options, compact, sample, backend)
+    stored = {}
+    for tab_name in data_tabs:
+        tab_results = chenmark_cache.load_tab_results(cache_entry, tab_name, options_key)
+        if tab_results is not None:
+            stored[tab_name] = tab_results
+    changed = {tab_name: df for tab_name, df in data_tabs.items() if tab_name not in stored}
+    
+    if verbose:
+        if stored:
+            print(f"♻️  Reusing stored analysis for {len(stored)} unchanged tab(s): {', '.join(stored)}")
+        if changed:
+            print(f"🔄 Recomputing {len(changed)} new or changed tab(s): {', '.join(changed)}")
+    
+    # Changed tabs are analyzed silently and every tab is rendered below from its results, in sheet order
+    fresh = run_tab_analyses(changed, workers, trend_options, verbose=False, sample=sample,
+                             backend=backend) if changed else ()
+    for tab_name in changed:
+        tab_results = [stage_results[tab_name] for stage_results in fresh]
+        # The frame is already cached alongside, so only the analysis output is stored
+        tab_results[0] = dict(tab_results[0], data=None)
+        chenmark_cache.store_tab_results(cache_entry, tab_name, options_key, tab_results)
+    chenmark_cache.save_manifest(cache_entry)
+    chenmark_cache.close_workbook_cache(cache_entry)
+    
+    # Merge in sheet order so the cross-tab steps see the same layout as a full run
+    merged = tuple({} for _ in ANALYSIS_STAGES)
+    for tab_name, df in data_tabs.items():
+        if tab_name in stored:
+            tab_results = list(stored[tab_name])
+            tab_results[0] = dict(tab_results[0], data=df)
+        else:
+            tab_results = [stage_results[tab_name] for stage_results in fresh]
+        for stage_results, tab_result in zip(merged, tab_results):
+            stage_results[tab_name] = tab_result
+    
+    if verbose:
+        render_tab_results(*merged)
+    return merged
+
+@chenmark_profiling.instrumented('recommendations')
+def strategic_recommendations(financial_metrics, trends, competitive_insights, risks_opportunities, verbose=True):
     """
     Generate strategic recommendations based on all analyses
     """
-    print("\n" + "="*80)
-    print("🎯 STRATEGIC RECOMMENDATIONS")
-    print("="*80)
+    if verbose:
+        print("\n" + "="*80)
+        print("🎯 STRATEGIC RECOMMENDATIONS")
+        print("="*80)
     
     recommendations = []
     
     # Financial recommendations
-    print("\n💰 FINANCIAL STRATEGY:")
-    print("-" * 30)
+    if verbose:
+        print("\n💰 FINANCIAL STRATEGY:")
+        print("-" * 30)
     
     total_numeric_cols = sum(len(fm['numeric_columns']) for fm in financial_metrics.values())
     if total_numeric_cols > 10:
         recommendations.append("Rich financial data available - implement comprehensive KPI dashboard")
-        print("1. Implement comprehensive KPI dashboard with real-time monitoring")
+        if verbose:
+            print("1. Implement comprehensive KPI dashboard with real-time monitoring")
     
     high_volatility_tabs = []
     for tab, ro in risks_opportunities.items():
@@ -325,11 +1547,13 @@ def strategic_recommendations(financial_metrics, trends, competitive_insights, r
     
     if high_volatility_tabs:
         recommendations.append(f"Address volatility in: {', '.join(high_volatility_tabs)}")
-        print(f"2. Develop risk management strategies for volatile metrics in {', '.join(high_volatility_tabs)}")
+        if verbose:
+            print(f"2. Develop risk management strategies for volatile metrics in {', '.join(high_volatility_tabs)}")
     
     # Growth recommendations
-    print("\n📈 GROWTH STRATEGY:")
-    print("-" * 25)
+    if verbose:
+        print("\n📈 GROWTH STRATEGY:")
+        print("-" * 25)
     
     growth_opportunities = []
     for tab, ro in risks_opportunities.items():
@@ -337,13 +1561,15 @@ def strategic_recommendations(financial_metrics, trends, competitive_insights, r
     
     if growth_opportunities:
         recommendations.append("Capitalize on positive trends identified in the data")
-        print("3. Double down on areas showing positive momentum")
-        for opp in growth_opportunities[:3]:
-            print(f"   • {opp}")
+        if verbose:
+            print("3. Double down on areas showing positive momentum")
+            for opp in growth_opportunities[:3]:
+                print(f"   • {opp}")
     
     # Operational recommendations
-    print("\n⚙️  OPERATIONAL EXCELLENCE:")
-    print("-" * 35)
+    if verbose:
+        print("\n⚙️  OPERATIONAL EXCELLENCE:")
+        print("-" * 35)
     
     stable_metrics = []
     for tab, ro in risks_opportunities.items():
@@ -351,151 +1577,504 @@ def strategic_recommendations(financial_metrics, trends, competitive_insights, r
     
     if stable_metrics:
         recommendations.append("Leverage stable performance areas as competitive advantages")
-        print("4. Use stable performance areas as foundation for expansion")
+        if verbose:
+            print("4. Use stable performance areas as foundation for expansion")
     
     # Data-driven recommendations
-    print("\n📊 DATA & ANALYTICS:")
-    print("-" * 25)
+    if verbose:
+        print("\n📊 DATA & ANALYTICS:")
+        print("-" * 25)
     
     strong_correlations = sum(len(trend['correlations']) for trend in trends.values())
     if strong_correlations > 5:
         recommendations.append("Exploit strong correlations for predictive analytics")
-        print("5. Develop predictive models based on strong correlations found")
+        if verbose:
+            print("5. Develop predictive models based on strong correlations found")
     
     # Market recommendations
-    print("\n🏢 MARKET STRATEGY:")
-    print("-" * 23)
+    if verbose:
+        print("\n🏢 MARKET STRATEGY:")
+        print("-" * 23)
     
     competitive_data_available = any(ci['analysis_performed'] for ci in competitive_insights.values())
     if competitive_data_available:
         recommendations.append("Enhance competitive intelligence and market positioning")
-        print("6. Enhance competitive analysis and market positioning strategies")
+        if verbose:
+            print("6. Enhance competitive analysis and market positioning strategies")
     
-    print(f"\n📝 SUMMARY: {len(recommendations)} strategic recommendations generated")
+    if verbose:
+        print(f"\n📝 SUMMARY: {len(recommendations)} strategic recommendations generated")
     
     return recommendations
 
-def create_executive_summary(data_tabs, financial_metrics, trends, competitive_insights, risks_opportunities, recommendations):
+@chenmark_profiling.instrumented('summary')
+def create_executive_summary(data_tabs, financial_metrics, trends, competitive_insights, risks_opportunities,
+                             recommendations, verbose=True):
     """
     Create comprehensive executive summary
     """
-    print("\n" + "="*80)
-    print("📋 EXECUTIVE SUMMARY")
-    print("="*80)
-    
-    # Data overview
-    total_tabs = len(data_tabs)
-    total_rows = sum(df.shape[0] for df in data_tabs.values())
-    total_cols = sum(df.shape[1] for df in data_tabs.values())
-    
-    print(f"\n🔍 DATA OVERVIEW:")
-    print(f"   • {total_tabs} data tabs analyzed")
-    print(f"   • {total_rows:,} total data points")
-    print(f"   • {total_cols} total columns across all tabs")
-    
-    # Key findings
-    print(f"\n📊 KEY FINDINGS:")
+    # Data overview; without data_tabs (e.g. a portfolio of workbooks) shapes come from the financial metrics
+    shapes = ([df.shape for df in data_tabs.values()] if data_tabs is not None
+              else [fm['shape'] for fm in financial_metrics.values()])
+    total_tabs = len(shapes)
+    total_rows = sum(shape[0] for shape in shapes)
+    total_cols = sum(shape[1] for shape in shapes)
     
     # Financial insights
     financial_tabs = len([tab for tab, fm in financial_metrics.items() if fm['financial_columns']])
-    if financial_tabs > 0:
-        print(f"   • {financial_tabs} tabs contain financial data")
     
     # Risk/opportunity count
     total_risks = sum(len(ro['risks']) for ro in risks_opportunities.values())
     total_opps = sum(len(ro['opportunities']) for ro in risks_opportunities.values())
     
-    print(f"   • {total_risks} risks identified")
-    print(f"   • {total_opps} opportunities discovered")
-    
     # Correlation insights
     total_correlations = sum(len(trend['correlations']) for trend in trends.values())
-    print(f"   • {total_correlations} strong correlations found")
     
-    # Strategic priorities
-    print(f"\n🎯 STRATEGIC PRIORITIES:")
-    for i, rec in enumerate(recommendations[:5], 1):
-        print(f"   {i}. {rec}")
+    if verbose:
+        print("\n" + "="*80)
+        print("📋 EXECUTIVE SUMMARY")
+        print("="*80)
+        
+        print(f"\n🔍 DATA OVERVIEW:")
+        print(f"   • {total_tabs} data tabs analyzed")
+        print(f"   • {total_rows:,} total data points")
+        print(f"   • {total_cols} total columns across all tabs")
+        
+        # Key findings
+        print(f"\n📊 KEY FINDINGS:")
+        if financial_tabs > 0:
+            print(f"   • {financial_tabs} tabs contain financial data")
+        print(f"   • {total_risks} risks identified")
+        print(f"   • {total_opps} opportunities discovered")
+        print(f"   • {total_correlations} strong correlations found")
+        
+        # Strategic priorities
+        print(f"\n🎯 STRATEGIC PRIORITIES:")
+        for i, rec in enumerate(recommendations[:5], 1):
+            print(f"   {i}. {rec}")
+        
+        # Next steps
+        print(f"\n🚀 RECOMMENDED NEXT STEPS:")
+        print("   1. Deep-dive analysis of highest-priority opportunities")
+        print("   2. Develop risk mitigation strategies for identified concerns")
+        print("   3. Create automated monitoring dashboard")
+        print("   4. Establish regular review cycles for key metrics")
+        print("   5. Benchmark against industry standards")
     
-    # Next steps
-    print(f"\n🚀 RECOMMENDED NEXT STEPS:")
-    print("   1. Deep-dive analysis of highest-priority opportunities")
-    print("   2. Develop risk mitigation strategies for identified concerns")
-    print("   3. Create automated monitoring dashboard")
-    print("   4. Establish regular review cycles for key metrics")
-    print("   5. Benchmark against industry standards")
+    return chenmark_results.ExecutiveSummary(
+        total_tabs=total_tabs,
+        total_rows=total_rows,
+        total_risks=total_risks,
+        total_opportunities=total_opps,
+        recommendations=recommendations
+    )
+
+def build_arg_parser():
+    """
+    Command-line options for the analysis script
+    """
+    parser = argparse.ArgumentParser(description="Chenmark case study workbook analysis")
+    parser.add_argument('paths', nargs='*',
+                        help="Workbook to analyze (defaults to the case study file); several files, glob patterns "
+                             "or directories run in batch mode with a combined portfolio summary")
+    parser.add_argument('--engine', help="Excel parser engine (default: calamine when installed)")
+    parser.add_argument('--no-cache', action='store_true', help="Parse the workbook without reading or writing the cache")
+    parser.add_argument('--rebuild-cache', action='store_true', help="Discard any cached sheets for this workbook and re-parse")
+    parser.add_argument('--cache-dir', help=f"Cache location (default: {chenmark_cache.default_cache_dir()})")
+    parser.add_argument('--cache-max-mb', type=float, default=chenmark_cache.DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help="Evict least recently used workbooks once the cache exceeds this size")
+    parser.add_argument('--compact', action='store_true',
+                        help="Shrink loaded sheets: drop empty rows/columns, downcast whole numbers, store text as "
+                             "categoricals or Arrow strings (lossless; reports the memory saved per sheet)")
+    parser.add_argument('--stream', action='store_true',
+                        help="Read sheets in row chunks into running statistics instead of loading DataFrames")
+    parser.add_argument('--chunk-rows', type=int, default=chenmark_streaming.DEFAULT_CHUNK_ROWS,
+                        help="Rows per chunk in --stream mode")
+    parser.add_argument('--sketch-size', type=int, default=chenmark_streaming.DEFAULT_SKETCH_SIZE,
+                        help="KLL sketch size for approximate quantiles in --stream mode")
+    parser.add_argument('--sample', type=float, metavar='N',
+                        help="Approximate mode: compute statistics from a sample of N rows per tab (or this fraction "
+                             "of the rows when below 1) with 95%% confidence intervals; findings near a decision "
+                             "threshold are recomputed over every row")
+    parser.add_argument('--backend', choices=sorted(ANALYSIS_BACKENDS), default=DEFAULT_BACKEND,
+                        help="Engine for the analysis statistics: pandas, or polars for multi-threaded lazy queries "
+                             "over Arrow memory (needs the polars package)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Analyze tabs (or, in batch mode, workbooks) in N worker processes (0 uses every CPU core)")
+    parser.add_argument('--corr-top-k', type=int, help="Keep only the K strongest correlations per tab")
+    parser.add_argument('--corr-float32', action='store_true', help="Compute correlations in float32")
+    parser.add_argument('--corr-sample-rows', type=int,
+                        help="Compute correlations on a random sample of this many rows for taller sheets")
+    parser.add_argument('--quiet', action='store_true',
+                        help="Skip all console rendering; only errors and the export path are printed")
+    parser.add_argument('--output', default="chenmark_analysis_results.json",
+                        help="Where to export the combined results (a .json file or a Parquet directory)")
+    parser.add_argument('--format', choices=chenmark_results.EXPORT_FORMATS,
+                        help="Export format (default: from the --output extension)")
+    parser.add_argument('--serve', action='store_true',
+                        help="Stay resident: watch the workbooks, re-analyze changes and serve results as JSON over HTTP")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to serve on in --serve mode")
+    parser.add_argument('--port', type=int, default=8765, help="Port to serve on in --serve mode")
+    parser.add_argument('--poll-seconds', type=float, default=2.0,
+                        help="How often --serve mode checks the workbooks for changes")
+    parser.add_argument('--cors-origin', default='http://localhost:3000', metavar='ORIGIN',
+                        help="Browser origin allowed to read --serve results (default: the dashboard dev server); "
+                             "pass '' to send no CORS header")
+    parser.add_argument('--profile', action='store_true',
+                        help="Time every stage and tab and print a hot-spot table at the end")
+    parser.add_argument('--profile-json', metavar='PATH',
+                        help="Write the recorded spans as a Chrome trace-event JSON file")
+    parser.add_argument('--profile-pstats', metavar='PATH',
+                        help="Run under cProfile and dump the statistics for pstats/snakeviz")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Also record tracemalloc peak allocations per span (slower)")
+    return parser
+
+def _report_profile(args, spans, profiler=None):
+    """
+    Print the hot-spot table and write the trace/pstats files requested on the command line
+    """
+    if args.profile or args.trace_memory:
+        print("\n" + "="*80)
+        print("⏱️  PROFILE - HOT SPOTS")
+        print("="*80)
+        for line in chenmark_profiling.hotspot_table(spans):
+            print(line)
+    if args.profile_json:
+        chenmark_profiling.write_json_trace(spans, args.profile_json)
+        print(f"💾 Profile trace written to: {args.profile_json}")
+    if profiler is not None:
+        profiler.dump_stats(args.profile_pstats)
+        print(f"💾 cProfile statistics written to: {args.profile_pstats}")
+
+DEFAULT_WORKBOOK = "Chenmark Case Study 2025 (4).xlsm"
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+
+def expand_workbook_paths(patterns):
+    """
+    Workbook files named by a list of files, glob patterns and directories, in order and without duplicates
+    """
+    import glob
     
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(os.path.join(root, name)
+                             for root, _, names in os.walk(pattern) for name in names)
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for path in matches:
+            name = os.path.basename(path)
+            # Skip Excel's "~$" lock files and anything that is not a workbook
+            if name.startswith('~$') or not name.lower().endswith(WORKBOOK_EXTENSIONS):
+                continue
+            found.append(os.path.normpath(path))
+    return list(dict.fromkeys(found))
+
+def workbook_options(args):
+    """
+    Loader and analysis settings from the command line, as a plain dict worker processes can receive
+    """
     return {
-        'total_tabs': total_tabs,
-        'total_rows': total_rows,
-        'total_risks': total_risks,
-        'total_opportunities': total_opps,
-        'recommendations': recommendations
+        'engine': args.engine,
+        'use_cache': not args.no_cache,
+        'cache_dir': args.cache_dir,
+        'rebuild_cache': args.rebuild_cache,
+        'cache_max_bytes': int(args.cache_max_mb * 1024 * 1024),
+        'compact': args.compact,
+        'stream': args.stream,
+        'chunk_rows': args.chunk_rows,
+        'sketch_size': args.sketch_size,
+        'sample': args.sample,
+        'backend': args.backend,
+        'trend_options': {
+            'corr_top_k': args.corr_top_k,
+            'corr_dtype': 'float32' if args.corr_float32 else None,
+            'corr_sample_rows': args.corr_sample_rows
+        }
     }
 
-def main():
+def analyze_workbook(file_path, options, workers=1, verbose=True):
     """
-    Main analysis function - Updated for Windows path handling
+    Load one workbook and run every analysis stage, the recommendations and the executive summary
+    
+    Returns the workbook's AnalysisResults, or None when no tab could be loaded.
     """
-    # Try multiple potential file locations
-    potential_paths = [
-        "Chenmark Case Study 2025 (4).xlsm",  # Same directory
-        r"C:\Users\jalen\OneDrive\Desktop\Booth\Chenmark Case Study\Chenmark Case Study 2025 (4).xlsm",  # Full path
-        os.path.join(os.getcwd(), "Chenmark Case Study 2025 (4).xlsm")  # Current working directory
-    ]
+    # Load all data
+    if verbose:
+        print("🔄 Loading Excel file...")
+        print(f"📁 Using file: {file_path}")
     
-    file_path = None
-    for path in potential_paths:
-        if os.path.exists(path):
-            file_path = path
-            break
+    if options['stream']:
+        data_tabs, sheet_names = load_streaming_tabs(file_path, options['chunk_rows'], options['sketch_size'],
+                                                     verbose=verbose)
+    else:
+        data_tabs, sheet_names = load_and_analyze_all_tabs(
+            file_path,
+            engine=options['engine'],
+            use_cache=options['use_cache'],
+            cache_dir=options['cache_dir'],
+            rebuild_cache=options['rebuild_cache'],
+            cache_max_bytes=options['cache_max_bytes'],
+            compact=options['compact'],
+            verbose=verbose
+        )
     
-    if file_path is None:
-        print("❌ Excel file not found in any of the expected locations:")
-        for path in potential_paths:
-            print(f"   - {path}")
-        print("\n💡 Please ensure the file 'Chenmark Case Study 2025 (4).xlsm' is available")
-        return
+    if not data_tabs:
+        print("❌ No data loaded. Please check the file path and format.")
+        return None
+    
+    # Perform all analyses
+    if verbose:
+        print("\n🔄 Performing comprehensive analysis...")
+        if options['sample']:
+            print(f"🎲 Approximate mode: statistics from {chenmark_sampling.describe_sample(options['sample'])} "
+                  f"per tab; findings near a decision threshold are recomputed exactly")
+        if options['backend'] == 'polars':
+            # No polars call here: starting its thread pool before the workers fork would deadlock them
+            print("⚡ Polars backend: statistics run as lazy queries on Polars' thread pool")
     
+    trend_options = options['trend_options']
+    if options['stream'] or not options['use_cache']:
+        stage_results = run_tab_analyses(data_tabs, workers, trend_options, verbose, options['sample'],
+                                         options['backend'])
+    else:
+        stage_results = run_incremental_analyses(file_path, data_tabs, workers, trend_options, verbose,
+                                                 cache_dir=options['cache_dir'], compact=options['compact'],
+                                                 sample=options['sample'], backend=options['backend'])
+    financial_metrics, trends, competitive_insights, risks_opportunities = stage_results
+    recommendations = strategic_recommendations(financial_metrics, trends, competitive_insights,
+                                                risks_opportunities, verbose)
+    
+    # Create executive summary
+    summary = create_executive_summary(data_tabs, financial_metrics, trends, competitive_insights,
+                                       risks_opportunities, recommendations, verbose)
+    
+    return chenmark_results.AnalysisResults(
+        source_file=os.path.abspath(file_path),
+        generated_at=datetime.now().isoformat(timespec='seconds'),
+        financial_metrics=financial_metrics,
+        trends=trends,
+        competitive_insights=competitive_insights,
+        risks_opportunities=risks_opportunities,
+        recommendations=recommendations,
+        summary=summary
+    )
+
+def _analyze_workbook_quietly(file_path, options):
+    """
+    Batch worker: analyze one workbook without console rendering and return results small enough to pickle back
+    """
+    buffer = io.StringIO()
+    start = time.perf_counter()
     try:
-        # Load all data
-        print("🔄 Loading Excel file...")
-        print(f"📁 Using file: {file_path}")
-        
-        data_tabs, sheet_names = load_and_analyze_all_tabs(file_path)
+        with contextlib.redirect_stdout(buffer):
+            results = analyze_workbook(file_path, options, verbose=False)
+        output = buffer.getvalue().replace('❌', '').strip()
+        error = None if results is not None else (output.splitlines() or ["no data loaded"])[0]
+    except Exception as e:
+        results, error = None, str(e)
+    
+    if results is not None:
+        # The parent only aggregates; raw sheet data stays in the worker
+        for metrics in results['financial_metrics'].values():
+            metrics['data'] = None
+    return results, error, time.perf_counter() - start
+
+def combine_workbook_results(workbook_results):
+    """
+    Merge per-workbook stage results into one set keyed '<workbook>/<tab>' for portfolio-level aggregation
+    """
+    paths = list(workbook_results)
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths]) if paths else ''
+    combined = tuple({} for _ in ANALYSIS_STAGES)
+    keys = ('financial_metrics', 'trends', 'competitive_insights', 'risks_opportunities')
+    for path, results in workbook_results.items():
+        label = os.path.relpath(os.path.abspath(path), base)
+        for stage_results, key in zip(combined, keys):
+            for tab_name, tab_result in results[key].items():
+                stage_results[f"{label}/{tab_name}"] = tab_result
+    return combined
+
+def run_batch(paths, options, workers=1, verbose=True):
+    """
+    Analyze many workbooks through one pool of reused worker processes, reporting each as it finishes
+    
+    Returns {path: AnalysisResults} in input order for the workbooks that could be analyzed.
+    """
+    def report(done, path, results, error, elapsed):
+        if results is None:
+            print(f"❌ [{done}/{len(paths)}] {path}: {error}")
+        elif verbose:
+            summary = results['summary']
+            print(f"✅ [{done}/{len(paths)}] {path} ({elapsed:.1f}s): {summary['total_tabs']} tabs, "
+                  f"{summary['total_rows']:,} rows, {summary['total_risks']} risks, "
+                  f"{summary['total_opportunities']} opportunities, "
+                  f"{len(summary['recommendations'])} recommendations")
+    
+    finished = {}
+    if workers <= 1 or len(paths) <= 1:
+        for done, path in enumerate(paths, 1):
+            results, error, elapsed = _analyze_workbook_quietly(path, options)
+            report(done, path, results, error, elapsed)
+            if results is not None:
+                finished[path] = results
+    else:
+        from concurrent.futures import as_completed
         
-        if not data_tabs:
-            print("❌ No data loaded. Please check the file path and format.")
+        with _process_pool(min(workers, len(paths)), options['backend']) as pool:
+            futures = {pool.submit(_analyze_workbook_quietly, path, options): path for path in paths}
+            # Report in completion order so slow workbooks don't hold back the others
+            for done, future in enumerate(as_completed(futures), 1):
+                path = futures[future]
+                results, error, elapsed = future.result()
+                report(done, path, results, error, elapsed)
+                if results is not None:
+                    finished[path] = results
+    
+    return {path: finished[path] for path in paths if path in finished}
+
+def portfolio_results(workbook_results, verbose=True):
+    """
+    Portfolio-level recommendations and executive summary built from per-workbook results
+    """
+    financial_metrics, trends, competitive_insights, risks_opportunities = combine_workbook_results(workbook_results)
+    recommendations = strategic_recommendations(financial_metrics, trends, competitive_insights,
+                                                risks_opportunities, verbose)
+    summary = create_executive_summary(None, financial_metrics, trends, competitive_insights,
+                                       risks_opportunities, recommendations, verbose)
+    return chenmark_results.AnalysisResults(
+        source_file=os.pathsep.join(os.path.abspath(path) for path in workbook_results),
+        generated_at=datetime.now().isoformat(timespec='seconds'),
+        financial_metrics=financial_metrics,
+        trends=trends,
+        competitive_insights=competitive_insights,
+        risks_opportunities=risks_opportunities,
+        recommendations=recommendations,
+        summary=summary
+    )
+
+def _export(results, args, verbose):
+    if verbose:
+        print()
+    print(f"💾 Saving detailed results to: {args.output}")
+    with chenmark_profiling.span('export'):
+        chenmark_results.export_results(results, args.output, args.format)
+
+def serve_results(args, options, workers, verbose=True):
+    """
+    Resident mode: keep results for the given workbooks current and serve them to the dashboard
+    """
+    import chenmark_server  # Deferred: only the resident mode needs the HTTP server
+    
+    patterns = args.paths or [DEFAULT_WORKBOOK]
+    chenmark_server.serve(
+        discover=lambda: expand_workbook_paths(patterns),
+        analyze=lambda path: analyze_workbook(path, options, workers, verbose=False),
+        combine=lambda workbook_results: portfolio_results(workbook_results, verbose=False),
+        host=args.host,
+        port=args.port,
+        poll_seconds=args.poll_seconds,
+        cors_origin=args.cors_origin,
+        verbose=verbose
+    )
+
+def _is_batch(patterns):
+    import glob
+    return len(patterns) > 1 or any(os.path.isdir(p) or glob.has_magic(p) for p in patterns)
+
+def main(argv=None):
+    """
+    Main analysis function: one workbook in detail, or a batch of files, globs and directories
+    """
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.sample is not None and args.sample <= 0:
+        parser.error("--sample must be a positive row count or a fraction between 0 and 1")
+    if args.sample and args.stream:
+        parser.error("--sample cannot be combined with --stream")
+    if args.backend == 'polars':
+        if args.stream or args.sample:
+            parser.error("--backend polars cannot be combined with --stream or --sample")
+        if not chenmark_polars.is_available():
+            parser.error("--backend polars needs the polars package (pip install polars)")
+    verbose = not args.quiet
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    options = workbook_options(args)
+    
+    if args.serve:
+        serve_results(args, options, workers, verbose)
+        return
+    
+    batch = _is_batch(args.paths)
+    if batch:
+        paths = expand_workbook_paths(args.paths)
+        if not paths:
+            print("❌ No workbooks (.xlsx, .xlsm, .xls) found in:")
+            for pattern in args.paths:
+                print(f"   - {pattern}")
+            return
+    else:
+        file_path = args.paths[0] if args.paths else DEFAULT_WORKBOOK
+        if not os.path.exists(file_path):
+            print(f"❌ Excel file not found: {os.path.abspath(file_path)}")
+            print(f"\n💡 Pass the workbook path, e.g. python {os.path.basename(__file__)} \"{DEFAULT_WORKBOOK}\"")
+            return
+    
+    profiling = args.profile or args.profile_json or args.trace_memory
+    if profiling:
+        chenmark_profiling.enable(trace_memory=args.trace_memory)
+    profiler = None
+    if args.profile_pstats:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    
+    try:
+        if batch:
+            if verbose:
+                print(f"📦 Analyzing {len(paths)} workbooks with {min(workers, len(paths))} worker(s)")
+                print("="*80)
+            workbook_results = run_batch(paths, options, workers, verbose)
+            if not workbook_results:
+                print("❌ None of the workbooks could be analyzed.")
+                return
+            
+            if verbose:
+                print("\n" + "="*80)
+                print(f"📦 PORTFOLIO: {len(workbook_results)} of {len(paths)} workbooks analyzed")
+                print("="*80)
+            results = portfolio_results(workbook_results, verbose)
+            _export(results, args, verbose)
             return
         
-        # Perform all analyses
-        print("\n🔄 Performing comprehensive analysis...")
-        
-        financial_metrics = comprehensive_financial_analysis(data_tabs)
-        trends = advanced_trend_analysis(data_tabs)
-        competitive_insights = competitive_analysis(data_tabs)
-        risks_opportunities = risk_and_opportunity_analysis(data_tabs)
-        recommendations = strategic_recommendations(financial_metrics, trends, competitive_insights, risks_opportunities)
-        
-        # Create executive summary
-        summary = create_executive_summary(data_tabs, financial_metrics, trends, competitive_insights, risks_opportunities, recommendations)
+        results = analyze_workbook(file_path, options, workers, verbose)
+        if results is None:
+            return
         
-        print("\n" + "="*80)
-        print("✅ ANALYSIS COMPLETE")
-        print("="*80)
-        print(f"📊 Comprehensive analysis of {len(data_tabs)} tabs completed successfully!")
-        print(f"📈 {len(recommendations)} strategic recommendations generated")
-        print(f"⏰ Analysis completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if verbose:
+            print("\n" + "="*80)
+            print("✅ ANALYSIS COMPLETE")
+            print("="*80)
+            print(f"📊 Comprehensive analysis of {results['summary']['total_tabs']} tabs completed successfully!")
+            print(f"📈 {len(results['recommendations'])} strategic recommendations generated")
+            print(f"⏰ Analysis completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        # Save results to text file
-        output_file = "chenmark_analysis_results.txt"
-        print(f"\n💾 Saving detailed results to: {output_file}")
+        # Export the combined results for the dashboard and other consumers
+        _export(results, args, verbose)
         
     except Exception as e:
         print(f"❌ An error occurred: {str(e)}")
         print("💡 Please check your data format and try again.")
         import traceback
         traceback.print_exc()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if profiling or profiler is not None:
+            _report_profile(args, chenmark_profiling.disable(), profiler)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,542 @@
+"""
+Columnar on-disk cache of parsed Chenmark workbooks.
+
+Each workbook is keyed by the SHA-256 of its contents. Parsed sheets are stored
+as uncompressed Arrow IPC (Feather v2) files so later runs can memory-map them
+instead of re-parsing the Excel XML. Text columns come back as Arrow-backed
+strings that stay views of the mapped file; numeric and date columns are copied
+into the numpy arrays the analysis runs on, so the map saves the parse and the
+read, not their resident memory. The content hash is only recomputed when a
+file's size or mtime changes.
+
+For .xlsx/.xlsm packages every worksheet also gets its own content digest. When
+a workbook is edited, sheets whose digest matches the previous version of the
+same file are carried over (parsed data and stored per-tab analysis results)
+instead of being parsed and analyzed again.
+
+Several processes (e.g. batch workers) may share one cache directory. Updates to
+the index are serialized with a file lock, and every open entry holds a shared
+lock that eviction respects, so no process deletes an entry another one is using.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import zipfile
+from datetime import datetime
+
+import pandas as pd
+
+import chenmark_compaction
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, eviction relies on the grace window alone
+    fcntl = None
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+CACHE_FORMAT = 2  # Bump whenever sheets are parsed differently (e.g. header detection) so stale entries are re-parsed
+EVICT_GRACE_SECONDS = 300  # Entries modified more recently than this are never evicted
+_HASH_CHUNK_BYTES = 1024 * 1024
+_INDEX_FILE = 'index.json'
+_INDEX_LOCK_FILE = 'index.lock'
+_ENTRY_LOCK_FILE = '.lock'
+_MANIFEST_FILE = 'manifest.json'
+_WORKBOOKS_DIR = 'workbooks'
+
+_SHEET_REL_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+_SHARED_STRING_ITEM = re.compile(rb'<(?:\w+:)?si>(.*?)</(?:\w+:)?si>|<(?:\w+:)?si/>', re.S)
+_SHARED_STRING_CELL = re.compile(rb'(<(?:\w+:)?c\b[^>]*\bt="s"[^>]*>\s*<(?:\w+:)?v>)(\d+)(</(?:\w+:)?v>)')
+
+
+def default_cache_dir():
+    """
+    Location of the cache when --cache-dir is not given
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'chenmark')
+
+
+def _load_feather():
+    """
+    Import pyarrow's feather module, or return None when pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        return pa, feather
+    except ImportError:
+        return None
+
+
+def _read_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path, payload):
+    # Write then rename so a concurrent reader never sees a half-written file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    """
+    Hold an exclusive advisory lock on path (created if missing) for the duration of the block
+    """
+    with open(path, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def _lock_entry(entry_dir):
+    """
+    Open entry_dir's lock file with a shared lock, recreating the directory if eviction removed it meanwhile
+
+    The returned file keeps the lock until it is closed, which happens when the cache entry is dropped.
+    """
+    lock_path = os.path.join(entry_dir, _ENTRY_LOCK_FILE)
+    while True:
+        os.makedirs(entry_dir, exist_ok=True)
+        lock = open(lock_path, 'a')
+        if fcntl is None:
+            return lock
+        fcntl.flock(lock, fcntl.LOCK_SH)
+        # An evicting process may have unlinked the file while we waited for the lock
+        try:
+            if os.stat(lock_path).st_ino == os.fstat(lock.fileno()).st_ino:
+                return lock
+        except OSError:
+            pass
+        lock.close()
+
+
+def _package_part(target):
+    # Relationship targets are relative to xl/ unless they start at the package root
+    return target.lstrip('/') if target.startswith('/') else f"xl/{target}"
+
+
+def sheet_digests(file_path):
+    """
+    SHA-256 per sheet of an .xlsx/.xlsm package, or None for other formats
+
+    Shared-string references are replaced by the strings themselves before hashing,
+    so edits that renumber the workbook-wide string table do not change other sheets.
+    Styles (which decide e.g. whether a number parses as a date) are part of every digest.
+    """
+    if not zipfile.is_zipfile(file_path):
+        return None
+    import xml.etree.ElementTree as ET  # Deferred: only needed when a workbook changes
+
+    try:
+        with zipfile.ZipFile(file_path) as package:
+            parts = set(package.namelist())
+            workbook = ET.fromstring(package.read('xl/workbook.xml'))
+            rels = ET.fromstring(package.read('xl/_rels/workbook.xml.rels'))
+            targets = {rel.get('Id'): _package_part(rel.get('Target')) for rel in rels}
+
+            strings = []
+            if 'xl/sharedStrings.xml' in parts:
+                shared = package.read('xl/sharedStrings.xml')
+                strings = [m.group(1) or b'' for m in _SHARED_STRING_ITEM.finditer(shared)]
+            styles_crc = package.getinfo('xl/styles.xml').CRC if 'xl/styles.xml' in parts else 0
+
+            def resolve(match):
+                index = int(match.group(2))
+                value = strings[index] if index < len(strings) else match.group(2)
+                return match.group(1) + value + match.group(3)
+
+            digests = {}
+            for sheet in workbook.iter():
+                if not sheet.tag.endswith('}sheet'):
+                    continue
+                part = targets.get(sheet.get(_SHEET_REL_ID))
+                if part is None or part not in parts:
+                    continue
+                sha = hashlib.sha256(str(styles_crc).encode('ascii'))
+                sha.update(_SHARED_STRING_CELL.sub(resolve, package.read(part)))
+                digests[sheet.get('name')] = sha.hexdigest()
+            return digests
+    except (KeyError, OSError, ValueError, zipfile.BadZipFile, ET.ParseError):
+        return None
+
+
+def _workbook_record(file_path, cache_dir):
+    """
+    Index record (size, mtime, content hash, per-sheet digests, previous hash) for a workbook path
+    """
+    stat = os.stat(file_path)
+    index_path = os.path.join(cache_dir, _INDEX_FILE)
+    key = os.path.abspath(file_path)
+    known = _read_json(index_path, {}).get(key)
+    if (known and known.get('size') == stat.st_size and known.get('mtime_ns') == stat.st_mtime_ns
+            and 'sheets' in known):
+        return known
+
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b''):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+
+    record = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest,
+              'sheets': sheet_digests(file_path)}
+    if known:
+        # Remember the last cached version so unchanged sheets can be carried over from it
+        previous = known['sha256'] if known['sha256'] != digest else known.get('previous')
+        if previous:
+            record['previous'] = previous
+    # Hashing happens unlocked; the read-modify-write is serialized so concurrent workers keep each other's records
+    with _file_lock(os.path.join(cache_dir, _INDEX_LOCK_FILE)):
+        index = _read_json(index_path, {})
+        index[key] = record
+        _write_json(index_path, index)
+    return record
+
+
+def file_digest(file_path, cache_dir):
+    """
+    Content hash of a workbook, reusing the stored hash while size and mtime are unchanged
+    """
+    return _workbook_record(file_path, cache_dir)['sha256']
+
+
+def _encode_column(col):
+    # Arrow needs string field names, so original labels are kept in the manifest
+    if isinstance(col, bool):
+        return ['bool', col]
+    if isinstance(col, int):
+        return ['int', col]
+    if isinstance(col, float):
+        return ['float', col]
+    if isinstance(col, datetime):
+        return ['datetime', pd.Timestamp(col).isoformat()]
+    return ['str', str(col)]
+
+
+def _decode_column(encoded):
+    kind, value = encoded
+    if kind == 'datetime':
+        return pd.Timestamp(value)
+    return value
+
+
+def open_workbook_cache(file_path, cache_dir=None, rebuild=False):
+    """
+    Return the cache entry for a workbook, or None when the cache cannot be used
+    """
+    if _load_feather() is None:
+        print("⚠️  pyarrow is not installed - workbook cache disabled")
+        return None
+
+    cache_dir = cache_dir or default_cache_dir()
+    try:
+        os.makedirs(os.path.join(cache_dir, _WORKBOOKS_DIR), exist_ok=True)
+        record = _workbook_record(file_path, cache_dir)
+    except OSError as e:
+        print(f"⚠️  Workbook cache unavailable: {e}")
+        return None
+
+    digest = record['sha256']
+    entry_dir = os.path.join(cache_dir, _WORKBOOKS_DIR, digest)
+    if rebuild and os.path.isdir(entry_dir):
+        shutil.rmtree(entry_dir, ignore_errors=True)
+    try:
+        lock = _lock_entry(entry_dir)
+    except OSError as e:
+        print(f"⚠️  Workbook cache unavailable: {e}")
+        return None
+
+    previous_dir = None
+    if record.get('previous') and not rebuild:
+        previous_dir = os.path.join(cache_dir, _WORKBOOKS_DIR, record['previous'])
+        if not os.path.isdir(previous_dir):
+            previous_dir = None
+
+    manifest = _read_json(os.path.join(entry_dir, _MANIFEST_FILE), {})
+    if manifest.get('format') != CACHE_FORMAT:
+        manifest = {'format': CACHE_FORMAT, 'sheet_names': None, 'sheets': {}}
+    return {
+        'cache_dir': cache_dir,
+        'dir': entry_dir,
+        'digest': digest,
+        'manifest': manifest,
+        'dirty': False,
+        'sheet_digests': record.get('sheets') or {},
+        'previous_dir': previous_dir,
+        'previous_sheets': None,
+        'lock': lock
+    }
+
+
+def cached_sheet_names(entry):
+    """
+    Sheet names recorded for this workbook, or None if it has not been fully cached yet
+    """
+    return entry['manifest'].get('sheet_names')
+
+
+def _file_stem(sheet_name):
+    return hashlib.sha1(sheet_name.encode('utf-8')).hexdigest()[:16]
+
+
+def _link_or_copy(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def _adopt_previous_sheet(entry, sheet_name):
+    """
+    Carry a sheet (and its stored results) over from the previous version of the workbook if its digest is unchanged
+    """
+    digest = entry['sheet_digests'].get(sheet_name)
+    if digest is None or entry['previous_dir'] is None:
+        return None
+
+    if entry['previous_sheets'] is None:
+        previous = _read_json(os.path.join(entry['previous_dir'], _MANIFEST_FILE), {'sheets': {}})
+        if previous.get('format') != CACHE_FORMAT:
+            previous = {'sheets': {}}
+        entry['previous_sheets'] = {info['digest']: info for info in previous.get('sheets', {}).values()
+                                    if info.get('digest')}
+    previous_info = entry['previous_sheets'].get(digest)
+    if previous_info is None:
+        return None
+
+    # Files are renamed after the sheet's name in this version, which may differ if it was renamed
+    stem = _file_stem(sheet_name)
+    info = dict(previous_info, results={})
+    try:
+        info['file'] = f"{stem}{os.path.splitext(previous_info['file'])[1]}"
+        _link_or_copy(os.path.join(entry['previous_dir'], previous_info['file']),
+                      os.path.join(entry['dir'], info['file']))
+        for options_key, file_name in previous_info.get('results', {}).items():
+            info['results'][options_key] = f"{stem}.{options_key}.results.pkl"
+            _link_or_copy(os.path.join(entry['previous_dir'], file_name),
+                          os.path.join(entry['dir'], info['results'][options_key]))
+    except OSError:
+        return None
+
+    entry['manifest']['sheets'][sheet_name] = info
+    entry['dirty'] = True
+    return info
+
+
+def _arrow_to_pandas(table):
+    """
+    DataFrame from a memory-mapped table: text zero-copy as Arrow-backed strings, numbers and dates as numpy
+
+    Arrow-backed numbers would keep the map instead of copying, but their aggregates return pd.NA
+    where the stages expect NaN (e.g. the std of a one-row category), so they are left to numpy.
+    """
+    pa, _ = _load_feather()
+    string_dtype = chenmark_compaction.arrow_string_dtype()
+
+    def types_mapper(arrow_type):
+        if string_dtype is not None and (pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)):
+            return string_dtype
+        return None
+
+    return table.to_pandas(types_mapper=types_mapper)
+
+
+def load_cached_sheet(entry, sheet_name):
+    """
+    Read a cached sheet back into a DataFrame from its memory-mapped file, or return None on a cache miss
+    """
+    info = entry['manifest']['sheets'].get(sheet_name) or _adopt_previous_sheet(entry, sheet_name)
+    if info is None:
+        return None
+
+    path = os.path.join(entry['dir'], info['file'])
+    try:
+        if info['format'] == 'feather':
+            _, feather = _load_feather()
+            df = _arrow_to_pandas(feather.read_table(path, memory_map=True))
+        else:
+            df = pd.read_pickle(path)
+    except Exception:
+        return None
+
+    df.columns = [_decode_column(c) for c in info['columns']]
+    return df
+
+
+def store_cached_sheet(entry, sheet_name, df):
+    """
+    Save a parsed sheet, preferring Arrow IPC and falling back to pickle for mixed-type columns
+    """
+    file_stem = _file_stem(sheet_name)
+    columns = [_encode_column(c) for c in df.columns]
+    positional = df.set_axis([f"c{i}" for i in range(df.shape[1])], axis=1)
+
+    try:
+        pa, feather = _load_feather()
+        file_name = f"{file_stem}.arrow"
+        table = pa.Table.from_pandas(positional, preserve_index=False)
+        feather.write_feather(table, os.path.join(entry['dir'], file_name), compression='uncompressed')
+        file_format = 'feather'
+    except Exception:
+        # Columns mixing text and numbers cannot be expressed as a single Arrow type
+        try:
+            file_name = f"{file_stem}.pkl"
+            positional.to_pickle(os.path.join(entry['dir'], file_name))
+            file_format = 'pickle'
+        except Exception:
+            return False
+
+    entry['manifest']['sheets'][sheet_name] = {
+        'file': file_name,
+        'format': file_format,
+        'columns': columns,
+        'digest': entry['sheet_digests'].get(sheet_name),
+        'results': {}
+    }
+    entry['dirty'] = True
+    return True
+
+
+def load_tab_results(entry, sheet_name, options_key):
+    """
+    Analysis results stored for this sheet's content under the given options, or None
+    """
+    info = entry['manifest']['sheets'].get(sheet_name) or _adopt_previous_sheet(entry, sheet_name)
+    file_name = (info or {}).get('results', {}).get(options_key)
+    if file_name is None:
+        return None
+    try:
+        return pd.read_pickle(os.path.join(entry['dir'], file_name))
+    except Exception:
+        return None
+
+
+def store_tab_results(entry, sheet_name, options_key, results):
+    """
+    Persist a sheet's analysis results next to its cached data; sheets not in the cache are skipped
+    """
+    info = entry['manifest']['sheets'].get(sheet_name)
+    if info is None:
+        return False
+
+    file_name = f"{_file_stem(sheet_name)}.{options_key}.results.pkl"
+    try:
+        pd.to_pickle(results, os.path.join(entry['dir'], file_name))
+    except Exception:
+        return False
+    info.setdefault('results', {})[options_key] = file_name
+    entry['dirty'] = True
+    return True
+
+
+def save_manifest(entry):
+    """
+    Write the manifest if anything was added since it was last saved
+    """
+    if entry['dirty']:
+        _write_json(os.path.join(entry['dir'], _MANIFEST_FILE), entry['manifest'])
+        entry['dirty'] = False
+
+
+def finalize_workbook_cache(entry, sheet_names, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Persist the manifest, mark the entry as recently used and evict old entries over the size budget
+    """
+    manifest_path = os.path.join(entry['dir'], _MANIFEST_FILE)
+    if entry['dirty'] or entry['manifest'].get('sheet_names') != list(sheet_names):
+        entry['manifest']['sheet_names'] = list(sheet_names)
+        _write_json(manifest_path, entry['manifest'])
+        entry['dirty'] = False
+    elif os.path.exists(manifest_path):
+        os.utime(manifest_path, None)
+
+    evict_cache(entry['cache_dir'], max_bytes, keep=entry['digest'])
+
+
+def close_workbook_cache(entry):
+    """
+    Release the entry's lock so other processes may evict it once it is old enough
+    """
+    entry['lock'].close()
+
+
+def _entry_usage(entry_dir):
+    """
+    (size in bytes, newest modification time) over an entry directory and its files
+    """
+    total, newest = 0, os.path.getmtime(entry_dir)
+    for name in os.listdir(entry_dir):
+        try:
+            stat = os.stat(os.path.join(entry_dir, name))
+        except OSError:
+            continue
+        total += stat.st_size
+        newest = max(newest, stat.st_mtime)
+    return total, newest
+
+
+def _try_remove_entry(entry_dir):
+    """
+    Delete an entry unless some process (this one included) holds it open
+    """
+    if fcntl is None:
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return True
+    try:
+        lock = open(os.path.join(entry_dir, _ENTRY_LOCK_FILE), 'a')
+    except OSError:
+        return False
+    with lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        shutil.rmtree(entry_dir, ignore_errors=True)
+    return True
+
+
+def evict_cache(cache_dir, max_bytes=DEFAULT_MAX_BYTES, keep=None):
+    """
+    Delete least recently used workbook entries until the cache fits in max_bytes
+
+    Entries still being written (no manifest yet), modified within EVICT_GRACE_SECONDS or held
+    open by any process are never deleted, though they count towards the budget.
+    """
+    workbooks_dir = os.path.join(cache_dir, _WORKBOOKS_DIR)
+    if not os.path.isdir(workbooks_dir):
+        return 0
+
+    now = time.time()
+    total = 0
+    candidates = []
+    for digest in os.listdir(workbooks_dir):
+        entry_dir = os.path.join(workbooks_dir, digest)
+        try:
+            size, last_used = _entry_usage(entry_dir)
+        except OSError:
+            continue
+        total += size
+        finished = os.path.exists(os.path.join(entry_dir, _MANIFEST_FILE))
+        if digest != keep and finished and now - last_used >= EVICT_GRACE_SECONDS:
+            candidates.append((last_used, entry_dir, size))
+
+    evicted = 0
+    for last_used, entry_dir, size in sorted(candidates):
+        if total <= max_bytes:
+            break
+        if _try_remove_entry(entry_dir):
+            total -= size
+            evicted += 1
+
+    return evicted
@@ -0,0 +1,89 @@
+"""
+Lossless memory compaction for sheets loaded into DataFrames.
+
+Excel readers hand back float64/int64 for every number and object (or plain
+string) columns for text. compact_frame drops rows and columns that are
+entirely empty, stores whole numbers in the smallest integer type that holds
+them, turns repetitive text into categoricals and keeps the remaining text in
+Arrow-backed strings. Values are never changed: floats with a fractional part
+stay float64, because float32 would also make pandas accumulate means and
+variances in single precision.
+"""
+import numpy as np
+import pandas as pd
+
+# Text columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+_INT64_LIMIT = 2.0 ** 63
+
+
+def arrow_string_dtype():
+    """
+    Arrow-backed string dtype with NaN as the missing value (pandas' default string dtype from 3.0 on)
+    """
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        return pd.StringDtype('pyarrow')  # pandas < 2.3: missing values become pd.NA
+    except ImportError:
+        return None
+
+
+def _compact_numeric(values):
+    if pd.api.types.is_bool_dtype(values):
+        return values
+    if pd.api.types.is_integer_dtype(values):
+        return pd.to_numeric(values, downcast='integer')
+    if values.dtype.kind == 'f' and not values.isna().any():
+        numbers = values.to_numpy()
+        if (np.isfinite(numbers).all() and (numbers == np.round(numbers)).all()
+                and np.abs(numbers).max() < _INT64_LIMIT):
+            return pd.to_numeric(values.astype(np.int64), downcast='integer')
+    return values
+
+
+def _compact_text(values, string_dtype):
+    present = values.dropna()
+    if pd.api.types.is_object_dtype(values) and not present.map(type).eq(str).all():
+        return values  # Mixed cells (numbers, dates, text) are left for the analysis to interpret
+    if len(present) and present.nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(present):
+        return values.astype('category')
+    if string_dtype is not None and values.dtype != string_dtype:
+        return values.astype(string_dtype)
+    return values
+
+
+def compact_frame(df):
+    """
+    Compacted copy of df plus its deep memory footprint before and after, in bytes
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    compacted = df.dropna(how='all').dropna(axis=1, how='all').reset_index(drop=True)
+
+    string_dtype = arrow_string_dtype()
+    columns = {}
+    for position in range(compacted.shape[1]):
+        values = compacted.iloc[:, position]
+        if pd.api.types.is_numeric_dtype(values):
+            values = _compact_numeric(values)
+        elif pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+            values = _compact_text(values, string_dtype)
+        columns[position] = values
+    # Assemble by position so duplicate column labels survive
+    labels = compacted.columns
+    compacted = pd.DataFrame(columns, index=compacted.index)
+    compacted.columns = labels
+    after = int(compacted.memory_usage(deep=True).sum())
+    return compacted, before, after
+
+
+def format_bytes(size):
+    """
+    Human-readable byte count (B, KB, MB, GB)
+    """
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
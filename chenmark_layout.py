@@ -0,0 +1,236 @@
+"""
+Data-region detection for .xlsx/.xlsm worksheets.
+
+Financial-model tabs often carry formatting far below their last value and a
+title block above the real header row. Parsed naively, the first makes some
+readers walk every formatted row and the second turns the title into the header
+("Unnamed: N" columns) and the real header into data. sheet_layouts scans each
+worksheet's XML once, without building a cell tree, for the last row holding a
+value and the header row, and flags worksheets that only host a chart or a
+pivot table so the loader can skip them. The XML is streamed in fixed-size
+chunks, so the scan's memory does not grow with the sheet (it also runs ahead
+of --stream mode's bounded-memory reader).
+"""
+import posixpath
+import re
+import zipfile
+
+HEADER_SCAN_ROWS = 30  # Rows inspected from the top of a sheet when looking for the header
+SCAN_CHUNK_BYTES = 1 << 20  # Worksheet XML is read in chunks of this size, never whole
+TITLE_MAX_CELLS = 2  # Title-block rows above a header hold at most this many cells, all text
+SKIPPED_KINDS = ('chart', 'pivot')
+
+_SHEET_REL_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+_ROW = re.compile(rb'<row\b([^>]*?)(?:/>|>(.*?)</row>)', re.S)
+_CELL = re.compile(rb'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+_ROW_OPEN = re.compile(rb'<row\b([^>]*)>')
+_ROW_NUMBER = re.compile(rb'\br="(\d+)"')
+_CELL_COLUMN = re.compile(rb'\br="([A-Z]+)')
+_CELL_TYPE = re.compile(rb'\bt="(\w+)"')
+_RELATIONSHIP = re.compile(rb'<Relationship\b[^>]*?\bType="[^"]*/(\w+)"[^>]*?\bTarget="([^"]+)"'
+                           rb'|<Relationship\b[^>]*?\bTarget="([^"]+)"[^>]*?\bType="[^"]*/(\w+)"')
+_PIVOT_LOCATION = re.compile(rb'<location\b[^>]*?\bref="[A-Z]+(\d+)(?::[A-Z]+(\d+))?"')
+_PAGE_FIELDS = re.compile(rb'<pageFields\b[^>]*?\bcount="(\d+)"')
+_TEXT_TYPES = (b's', b'inlineStr', b'str')
+
+
+def _package_part(target, base='xl'):
+    # Relationship targets are relative to the referring part's folder unless they start at the package root
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(base, target))
+
+
+def _relationships(package, part, parts):
+    """
+    (relationship type, package part) pairs of a part, e.g. ('drawing', 'xl/drawings/drawing1.xml')
+    """
+    folder, name = posixpath.split(part)
+    rels_part = f"{folder}/_rels/{name}.rels"
+    if rels_part not in parts:
+        return []
+    found = []
+    for match in _RELATIONSHIP.finditer(package.read(rels_part)):
+        rel_type = match.group(1) or match.group(4)
+        target = match.group(2) or match.group(3)
+        found.append((rel_type.decode('ascii'), _package_part(target.decode('utf-8'), folder)))
+    return found
+
+
+def _has_value(content):
+    return content is not None and (b'</v>' in content or b'</is>' in content)
+
+
+def _row_before(block, end, row_number):
+    """
+    Number of the last row opened in block before position end (row_number if none is)
+    """
+    start = block.rfind(b'<row', 0, end)
+    while start >= 0 and not _ROW_OPEN.match(block, start):
+        start = block.rfind(b'<row', 0, start)  # e.g. <rowBreaks>
+    if start < 0:
+        return row_number
+    match = _ROW_NUMBER.search(_ROW_OPEN.match(block, start).group(1))
+    if match:
+        return int(match.group(1))
+    return (row_number or 0) + len(_ROW_OPEN.findall(block, 0, end))  # Rows numbered implicitly
+
+
+def _last_value_row(block, row_number=None):
+    """
+    (row of the last cell holding a value or None, row open at the end) of a run of complete tags
+
+    Formatting-only cells have neither <v> nor <is>. row_number is the row open where the run
+    starts, so a worksheet can be scanned a chunk at a time.
+    """
+    end = max(block.rfind(b'</v>'), block.rfind(b'</is>'))
+    value_row = _row_before(block, end, row_number) if end >= 0 else None
+    return value_row, _row_before(block, len(block), row_number)
+
+
+def _top_rows(xml, limit=HEADER_SCAN_ROWS):
+    """
+    (row number, cells with a value, text cells among them) for the first rows that hold any value
+    """
+    rows = []
+    number = 0
+    for row in _ROW.finditer(xml):
+        match = _ROW_NUMBER.search(row.group(1))
+        number = int(match.group(1)) if match else number + 1
+        values = texts = 0
+        for cell in _CELL.finditer(row.group(2) or b''):
+            if _has_value(cell.group(2)):
+                values += 1
+                cell_type = _CELL_TYPE.search(cell.group(1))
+                texts += cell_type is not None and cell_type.group(1) in _TEXT_TYPES
+        if values:
+            rows.append((number, values, texts))
+            if len(rows) >= limit:
+                break
+    return rows
+
+
+def _scan_worksheet(package, part, chunk_bytes=SCAN_CHUNK_BYTES):
+    """
+    (holds sheetData, top rows, last value row) of a worksheet read chunk_bytes at a time
+
+    Memory stays bounded whatever the sheet size: the top rows come from a head buffer that
+    stops growing once HEADER_SCAN_ROWS value rows are complete, and the last value row from
+    a rolling pass that only carries the unfinished tag over to the next chunk.
+    """
+    head, top_rows, has_sheet_data = b'', None, False
+    carry, row_number, last_row = b'', None, None
+    with package.open(part) as stream:
+        while True:
+            chunk = stream.read(chunk_bytes)
+            if top_rows is None:
+                head += chunk
+                closed = head.rfind(b'</row>')
+                rows = _top_rows(head[:closed + len(b'</row>')]) if closed >= 0 else []
+                if not chunk or len(rows) >= HEADER_SCAN_ROWS:
+                    top_rows, has_sheet_data, head = rows, b'<sheetData' in head, b''
+
+            # Attribute values cannot hold '<', so everything before the last '<' is complete tags
+            buffer = carry + chunk
+            cut = buffer.rfind(b'<') if chunk else len(buffer)
+            block, carry = (buffer[:cut], buffer[cut:]) if cut >= 0 else (b'', buffer)
+            value_row, row_number = _last_value_row(block, row_number)
+            if value_row is not None:
+                last_row = value_row
+            if not chunk:
+                return has_sheet_data, top_rows, last_row
+
+
+def _is_title_row(row):
+    _, values, texts = row
+    return values <= TITLE_MAX_CELLS and texts == values
+
+
+def detect_header_row(rows):
+    """
+    Sheet row number of the header among _top_rows output
+
+    The first row with values is the header unless it starts a title block: then the header is
+    the first row filled across more than half the widest row's cells and at least half text,
+    provided every row above it looks like a title (a cell or two, all text). A wide row further
+    down (e.g. notes beside the data) or a sparse header row never moves the header below data.
+    """
+    width = max(values for _, values, _ in rows)
+    for position, row in enumerate(rows):
+        if row[1] >= min(2, width) and row[1] > width / 2 and 2 * row[2] >= row[1]:
+            if all(_is_title_row(above) for above in rows[:position]):
+                return row[0]
+            break
+    return rows[0][0]
+
+
+def _pivot_rows(package, pivot_parts):
+    """
+    First and last sheet row covered by a sheet's pivot tables, including their report filter rows
+    """
+    top = bottom = None
+    for part in pivot_parts:
+        xml = package.read(part)
+        location = _PIVOT_LOCATION.search(xml)
+        if location is None:
+            continue
+        first = int(location.group(1))
+        last = int(location.group(2) or first)
+        page_fields = _PAGE_FIELDS.search(xml)
+        if page_fields:
+            first -= int(page_fields.group(1)) + 1  # Filters sit above the table, separated by a blank row
+        top = first if top is None else min(top, first)
+        bottom = last if bottom is None else max(bottom, last)
+    return top, bottom
+
+
+def _worksheet_layout(package, part, parts):
+    relationships = _relationships(package, part, parts)
+    has_sheet_data, top_rows, last_row = _scan_worksheet(package, part)
+    if not has_sheet_data:
+        return None  # Namespace-prefixed markup: leave the sheet to the reader
+    if last_row is None or not top_rows:
+        has_drawing = any(rel_type == 'drawing' for rel_type, _ in relationships)
+        return {'kind': 'chart' if has_drawing else 'empty', 'header_row': None, 'last_row': None}
+
+    layout = {'kind': 'data', 'header_row': detect_header_row(top_rows), 'last_row': last_row}
+    pivot_parts = [target for rel_type, target in relationships if rel_type == 'pivotTable' and target in parts]
+    if pivot_parts:
+        top, bottom = _pivot_rows(package, pivot_parts)
+        if top is not None and top <= top_rows[0][0] and last_row <= bottom:
+            layout['kind'] = 'pivot'
+    return layout
+
+
+def sheet_layouts(file_path):
+    """
+    Layout per sheet name of an .xlsx/.xlsm package, or {} for other formats or unreadable packages
+
+    Each layout is {'kind', 'header_row', 'last_row'} with 1-based sheet rows; kind is
+    'data', 'empty', 'chart' (a chart sheet or a worksheet holding only drawings) or
+    'pivot' (every value lies inside the sheet's pivot tables).
+    """
+    if not zipfile.is_zipfile(file_path):
+        return {}
+    import xml.etree.ElementTree as ET  # Deferred: only needed when a sheet is actually parsed
+
+    try:
+        with zipfile.ZipFile(file_path) as package:
+            parts = set(package.namelist())
+            workbook = ET.fromstring(package.read('xl/workbook.xml'))
+            rels = ET.fromstring(package.read('xl/_rels/workbook.xml.rels'))
+            targets = {rel.get('Id'): rel.get('Target') for rel in rels}
+            layouts = {}
+            for sheet in workbook.iter():
+                if not sheet.tag.endswith('}sheet') or sheet.get(_SHEET_REL_ID) not in targets:
+                    continue
+                part = _package_part(targets[sheet.get(_SHEET_REL_ID)])
+                if part.startswith('xl/chartsheets/'):
+                    layouts[sheet.get('name')] = {'kind': 'chart', 'header_row': None, 'last_row': None}
+                elif part in parts:
+                    layout = _worksheet_layout(package, part, parts)
+                    if layout is not None:
+                        layouts[sheet.get('name')] = layout
+            return layouts
+    except (KeyError, OSError, ValueError, zipfile.BadZipFile, ET.ParseError):
+        return {}
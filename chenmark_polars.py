@@ -0,0 +1,222 @@
+"""
+Polars query engine behind the analysis's polars backend (--backend polars).
+
+A tab is handed to Polars once, with positional column names. Each statistic
+the stages need is then one lazy query whose per-column expressions Polars
+evaluates on its thread pool. Arrow-backed pandas columns (e.g. text after
+--compact, or pandas' default string dtype) are adopted without copying. The
+results come back as the small pandas objects the pandas backend returns, so
+both backends feed the same reporting and export code. Polars is imported on
+first use only.
+"""
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+# Polars truncation interval per TREND_FREQUENCIES alias (weeks start on Monday, like pandas' W-SUN periods)
+TRUNCATE_EVERY = {'Y': '1y', 'Q': '1q', 'M': '1mo', 'W': '1w', 'D': '1d'}
+_PERIOD = '__period'
+_KEY = '__key'
+
+
+def is_available():
+    return importlib.util.find_spec('polars') is not None
+
+
+def to_polars(df):
+    """
+    (frame, names): df as a Polars DataFrame with columns named by position, and each column's name in it
+
+    names lines up with df.columns; columns Arrow cannot represent (e.g. object columns mixing
+    numbers and text) are left out of the frame and get None.
+    """
+    import polars as pl
+
+    columns, names = [], []
+    for position in range(df.shape[1]):
+        name = f"c{position}"
+        try:
+            columns.append(pl.from_pandas(df.iloc[:, position]).rename(name))
+        except (TypeError, ValueError, pl.exceptions.PolarsError):
+            name = None
+        names.append(name)
+    return pl.DataFrame(columns), names
+
+
+def non_null_counts(frame):
+    """
+    Non-null values per frame column, as {name: count}
+    """
+    import polars as pl
+
+    if not frame.width:
+        return {}
+    return frame.select(pl.all().count()).row(0, named=True)
+
+
+def describe_numeric(frame, names, labels):
+    """
+    count, mean, median, std, min, max, q1 and q3 of the named columns in one query, indexed by labels
+    """
+    import polars as pl
+
+    exprs = []
+    for name in names:
+        column = pl.col(name)
+        # One selection pass per column yields all three quartiles
+        exprs += [column.count(), column.mean(), column.std(), column.min(), column.max(),
+                  column.quantile([0.25, 0.5, 0.75], 'linear')]
+    row = frame.lazy().select([expr.alias(str(i)) for i, expr in enumerate(exprs)]).collect().row(0)
+
+    count, mean, std, minimum, maximum, quartiles = (row[k::6] for k in range(6))
+    quartiles = np.array([q if q is not None else [np.nan] * 3 for q in quartiles], dtype=np.float64).reshape(-1, 3)
+    return pd.DataFrame({
+        'count': pd.Series(count, index=labels),
+        'mean': pd.Series(mean, index=labels, dtype=np.float64),
+        'median': quartiles[:, 1],
+        'std': pd.Series(std, index=labels, dtype=np.float64),
+        # min/max keep integer values when every column is integral, as in pandas
+        'min': pd.Series(minimum, index=labels),
+        'max': pd.Series(maximum, index=labels),
+        'q1': quartiles[:, 0],
+        'q3': quartiles[:, 2]
+    })
+
+
+def correlation_matrix(frame, names, labels, dtype=None, positions=None):
+    """
+    Pearson correlation matrix of the named columns over pairwise-complete rows, optionally on the rows at positions
+    """
+    import polars as pl
+
+    float_type = pl.Float32 if dtype is not None and np.dtype(dtype) == np.float32 else pl.Float64
+    columns = [pl.col(name).cast(float_type) for name in names]
+    if positions is not None:
+        columns = [column.gather(positions) for column in columns]
+    block = frame.lazy().select([column.alias(name) for column, name in zip(columns, names)]).collect()
+
+    if block.height > 1 and block.null_count().sum_horizontal().item() == 0:
+        # Without missing values a single BLAS-backed corrcoef over the block beats one query per pair
+        values = block.to_numpy()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = np.corrcoef(values, rowvar=False, dtype=values.dtype)
+        return pd.DataFrame(corr, index=labels, columns=labels)
+
+    # pl.corr skips rows where either column is null, matching pandas' pairwise-complete DataFrame.corr
+    pairs = [(i, j) for i in range(len(names)) for j in range(i, len(names))]
+    row = block.lazy().select([pl.corr(names[i], names[j]).alias(f"{i},{j}") for i, j in pairs]).collect().row(0)
+    corr = np.full((len(names), len(names)), np.nan)
+    for (i, j), value in zip(pairs, row):
+        if value is not None:
+            corr[i, j] = corr[j, i] = value
+    return pd.DataFrame(corr, index=labels, columns=labels)
+
+
+def category_counts(frame, name, label):
+    """
+    Rows per non-null value of a column in order of first appearance, like pandas' value_counts(sort=False)
+    """
+    import polars as pl
+
+    counts = (frame.lazy()
+              .select(pl.col(name).cast(pl.String))
+              .group_by(name, maintain_order=True).len()
+              .drop_nulls(name)
+              .collect())
+    return pd.Series(counts['len'].to_numpy().astype(np.int64),
+                     index=pd.Index(counts[name].to_list(), name=label), name='count')
+
+
+def category_performance(frame, key_name, key_label, names, labels):
+    """
+    Mean, median and std of each named column per category, with the columns and index of the pandas groupby
+    """
+    import polars as pl
+
+    aggregations = []
+    for name in names:
+        aggregations += [pl.col(name).mean().alias(f"{name} mean"), pl.col(name).median().alias(f"{name} median"),
+                         pl.col(name).std().alias(f"{name} std")]
+    grouped = (frame.lazy()
+               .select(pl.col(key_name).cast(pl.String).alias(_KEY), *names)
+               .drop_nulls(_KEY)
+               .group_by(_KEY).agg(aggregations)
+               .sort(_KEY)
+               .collect())
+
+    columns = pd.MultiIndex.from_tuples([(label, stat) for label in labels for stat in ('mean', 'median', 'std')])
+    values = grouped.select(pl.exclude(_KEY).cast(pl.Float64)).to_numpy() if aggregations else None
+    index = pd.CategoricalIndex(grouped[_KEY].to_list(), name=key_label)
+    return pd.DataFrame(values, index=index, columns=columns).round(2)
+
+
+def risk_statistics(frame, names, numeric_stats):
+    """
+    IQR outlier share (%) and OLS slope over non-null position of the named columns, as numpy arrays
+
+    Fences come from the q1/q3 already in numeric_stats; slopes regress each column's non-null
+    values on 0..n-1 like the pandas backend's closed form.
+    """
+    import polars as pl
+
+    if not names:
+        return np.zeros(0), np.zeros(0)
+    q1 = numeric_stats['q1'].to_numpy(dtype=np.float64)
+    q3 = numeric_stats['q3'].to_numpy(dtype=np.float64)
+    iqr = q3 - q1
+    exprs = []
+    for j, name in enumerate(names):
+        column = pl.col(name)
+        values = column.drop_nulls()
+        position = pl.int_range(0, values.len())
+        if np.isnan(iqr[j]):
+            exprs.append(pl.lit(0, dtype=pl.UInt32).alias(f"outliers {j}"))
+        else:
+            outside = (column < q1[j] - 1.5 * iqr[j]) | (column > q3[j] + 1.5 * iqr[j])
+            exprs.append(outside.sum().alias(f"outliers {j}"))
+        exprs += [column.count().alias(f"n {j}"), (pl.cov(position, values) / position.var()).alias(f"slope {j}")]
+    row = frame.lazy().select(exprs).collect().row(0)
+
+    outliers = np.array(row[0::3], dtype=np.float64)
+    n = np.array(row[1::3], dtype=np.float64)
+    slopes = np.array([np.nan if value is None else value for value in row[2::3]], dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        outlier_pct = np.where((iqr > 0) & (n > 0), outliers / np.maximum(n, 1) * 100, 0.0)
+    return outlier_pct, np.where(n > 1, slopes, np.nan)
+
+
+def first_last_present(frame, names, order):
+    """
+    First value, last value and count of each named column's non-null values, with rows taken in order
+    """
+    import polars as pl
+
+    positions = pl.Series(order, dtype=pl.Int64)
+    exprs = []
+    for name in names:
+        values = pl.col(name).gather(positions).drop_nulls().cast(pl.Float64)
+        exprs += [values.first().alias(f"{name} first"), values.last().alias(f"{name} last"),
+                  values.count().alias(f"{name} count")]
+    row = frame.lazy().select(exprs).collect().row(0)
+    return row[0::3], row[1::3], row[2::3]
+
+
+def period_means(frame, names, labels, dates, order, alias):
+    """
+    Mean of each named column per calendar period (alias as in TREND_FREQUENCIES) of the rows at order
+
+    dates holds the parsed datetime64 values of every row. Returns a frame indexed by period start.
+    """
+    import polars as pl
+
+    positions = pl.Series(order, dtype=pl.Int64)
+    periods = pl.Series(_PERIOD, dates[order]).dt.truncate(TRUNCATE_EVERY[alias])
+    means = (frame.lazy()
+             .select(pl.col(names).gather(positions).cast(pl.Float64))
+             .with_columns(pl.lit(periods))
+             .group_by(_PERIOD).agg(pl.col(names).mean())
+             .sort(_PERIOD)
+             .collect())
+    return pd.DataFrame(means.select(names).to_numpy(), index=pd.DatetimeIndex(means[_PERIOD].to_numpy()),
+                        columns=labels)
@@ -0,0 +1,213 @@
+"""
+Lightweight timing instrumentation for the Chenmark analysis pipeline.
+
+Spans record wall time, CPU time, the rows/columns processed and, when enabled,
+memory allocated according to tracemalloc. Recording is off by default and a
+disabled span costs one global lookup, so the instrumentation can stay in the
+hot loops permanently.
+"""
+import contextlib
+import functools
+import json
+import os
+import time
+
+_recorder = None
+
+
+class Recorder:
+    """
+    Collects finished spans for one run (or one worker process)
+    """
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.spans = []
+        self._stack = []
+        if trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    @contextlib.contextmanager
+    def span(self, name, tab=None, rows=None, cols=None):
+        frame = {'alloc_start': 0, 'alloc_peak': 0, 'fields': {'rows': rows, 'cols': cols}}
+        if self.trace_memory:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent['alloc_peak'] = max(parent['alloc_peak'], peak)
+            tracemalloc.reset_peak()
+            frame['alloc_start'] = frame['alloc_peak'] = current
+        self._stack.append(frame)
+
+        epoch_start = time.time()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            self._stack.pop()
+            record = {
+                'name': name,
+                'tab': tab,
+                'rows': frame['fields']['rows'],
+                'cols': frame['fields']['cols'],
+                'start_s': epoch_start,
+                'wall_s': wall,
+                'cpu_s': cpu,
+                'depth': len(self._stack),
+                'pid': os.getpid()
+            }
+            if self.trace_memory:
+                import tracemalloc
+                current, peak = tracemalloc.get_traced_memory()
+                frame['alloc_peak'] = max(frame['alloc_peak'], peak)
+                record['alloc_peak_bytes'] = frame['alloc_peak'] - frame['alloc_start']
+                record['alloc_net_bytes'] = current - frame['alloc_start']
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent['alloc_peak'] = max(parent['alloc_peak'], frame['alloc_peak'])
+                tracemalloc.reset_peak()
+            self.spans.append(record)
+
+
+def enable(trace_memory=False):
+    """
+    Start recording spans in this process and return the recorder
+    """
+    global _recorder
+    _recorder = Recorder(trace_memory)
+    return _recorder
+
+
+def disable():
+    """
+    Stop recording and return the spans collected so far
+    """
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder.spans if recorder else []
+
+
+def is_enabled():
+    return _recorder is not None
+
+
+def memory_tracing():
+    return _recorder is not None and _recorder.trace_memory
+
+
+def add_spans(spans):
+    """
+    Merge spans recorded elsewhere (e.g. in a worker process) into the active recorder
+    """
+    if _recorder is not None:
+        _recorder.spans.extend(spans)
+
+
+def annotate(rows=None, cols=None):
+    """
+    Set the rows/columns of the innermost open span once they are known (e.g. after parsing a sheet)
+    """
+    if _recorder is not None and _recorder._stack:
+        fields = _recorder._stack[-1]['fields']
+        if rows is not None:
+            fields['rows'] = rows
+        if cols is not None:
+            fields['cols'] = cols
+
+
+def span(name, tab=None, rows=None, cols=None):
+    """
+    Context manager timing a block; a no-op while recording is disabled
+    """
+    if _recorder is None:
+        return contextlib.nullcontext()
+    return _recorder.span(name, tab=tab, rows=rows, cols=cols)
+
+
+def _tabs_shape(tabs):
+    rows = cols = 0
+    for tab in tabs.values():
+        shape = getattr(tab, 'shape', None)
+        if shape:
+            rows += shape[0]
+            cols += shape[1]
+    return rows, cols
+
+
+def instrumented(name):
+    """
+    Decorator recording a span around every call; a dict of tabs as first argument supplies rows/columns
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return func(*args, **kwargs)
+            rows = cols = None
+            if args and isinstance(args[0], dict):
+                rows, cols = _tabs_shape(args[0])
+            with _recorder.span(name, rows=rows, cols=cols):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def hotspot_table(spans, limit=15):
+    """
+    Text table of spans aggregated by name, slowest first, followed by the slowest individual tabs
+    """
+    totals = {}
+    for record in spans:
+        entry = totals.setdefault(record['name'], {
+            'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'rows': 0, 'cols': 0, 'alloc_peak_bytes': None
+        })
+        entry['calls'] += 1
+        entry['wall_s'] += record['wall_s']
+        entry['cpu_s'] += record['cpu_s']
+        entry['rows'] += record['rows'] or 0
+        entry['cols'] += record['cols'] or 0
+        if record.get('alloc_peak_bytes') is not None:
+            entry['alloc_peak_bytes'] = max(entry['alloc_peak_bytes'] or 0, record['alloc_peak_bytes'])
+
+    lines = [f"{'span':<28} {'calls':>6} {'wall':>10} {'cpu':>10} {'rows':>12} {'cols':>7} {'peak alloc':>11}"]
+    for name, entry in sorted(totals.items(), key=lambda item: -item[1]['wall_s'])[:limit]:
+        alloc = entry['alloc_peak_bytes']
+        alloc_text = f"{alloc / (1024 * 1024):.1f}MB" if alloc is not None else '-'
+        lines.append(f"{name:<28} {entry['calls']:>6} {entry['wall_s']:>9.3f}s {entry['cpu_s']:>9.3f}s "
+                     f"{entry['rows']:>12,} {entry['cols']:>7,} {alloc_text:>11}")
+
+    per_tab = sorted((r for r in spans if r['tab'] is not None), key=lambda r: -r['wall_s'])[:limit]
+    if per_tab:
+        lines.append("")
+        lines.append("Slowest tabs:")
+        for record in per_tab:
+            lines.append(f"  {record['wall_s']:>8.3f}s  {record['name']:<22} {record['tab']} "
+                         f"({record['rows'] or 0:,} × {record['cols'] or 0:,})")
+    return lines
+
+
+def write_json_trace(spans, path):
+    """
+    Write spans in Chrome trace-event format (open in chrome://tracing or Perfetto)
+    """
+    origin = min((record['start_s'] for record in spans), default=0)
+    events = []
+    for record in spans:
+        args = {key: record[key] for key in ('tab', 'rows', 'cols', 'cpu_s', 'alloc_peak_bytes', 'alloc_net_bytes')
+                if record.get(key) is not None}
+        events.append({
+            'name': record['name'] if record['tab'] is None else f"{record['name']} [{record['tab']}]",
+            'ph': 'X',
+            'ts': (record['start_s'] - origin) * 1e6,
+            'dur': record['wall_s'] * 1e6,
+            'pid': record['pid'],
+            'tid': record['pid'],
+            'args': args
+        })
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'spans': spans}, f, indent=1, default=str)
@@ -0,0 +1,259 @@
+"""
+Result types returned by the Chenmark analysis stages and a bulk exporter for them.
+
+The stages return plain dicts so results stay cheap to build, pickle between
+worker processes and index by key; the TypedDicts below document their shape.
+export_results flattens a full run into long-format tables and writes them in
+one go, either as a single JSON document or as one Parquet file per table, so
+the dashboard and other consumers can load results without re-running the
+analysis.
+"""
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
+
+import pandas as pd
+
+
+class FinancialMetrics(TypedDict):
+    shape: Tuple[int, int]
+    numeric_columns: List[Any]
+    financial_columns: List[Any]
+    statistics: pd.DataFrame  # One row per numeric column, NUMERIC_STAT_COLUMNS as columns
+    data: Any  # The tab's DataFrame (None in streaming mode); never exported
+    # --sample mode: {'rows_sampled', 'rows_total', 'method', 'intervals'}, where intervals holds
+    # <statistic>_low/<statistic>_high 95% bounds per numeric column; None when every row was used
+    sampling: Optional[dict]
+
+
+class TrendResult(TypedDict):
+    date_columns: List[Any]
+    # date column -> {'start', 'end', 'growth': {column: %}, 'frequency', 'metrics'} or {'error'};
+    # 'metrics' is one row per numeric column with TREND_METRIC_COLUMNS (None in streaming mode)
+    timelines: Dict[Any, dict]
+    correlations: List[Tuple[Any, Any, float]]
+    correlation_error: Optional[str]
+    correlation_intervals: Optional[List[Tuple[float, float]]]  # 95% bounds per correlation (--sample mode)
+
+
+class CompetitiveInsight(TypedDict):
+    text_columns: List[Any]
+    analysis_performed: bool
+    category_counts: Dict[Any, pd.DataFrame]  # category column -> 'records' per category
+    # category column -> (numeric column, statistic) per category; --sample mode adds 'mean_err', the 95% margin
+    performance: Dict[Any, pd.DataFrame]
+    errors: Dict[Any, str]
+
+
+class RiskResult(TypedDict):
+    risks: List[str]
+    opportunities: List[str]
+    intervals: Optional[pd.DataFrame]  # --sample mode: outlier_pct and slope with _low/_high bounds per column
+
+
+class ExecutiveSummary(TypedDict):
+    total_tabs: int
+    total_rows: int
+    total_risks: int
+    total_opportunities: int
+    recommendations: List[str]
+
+
+class AnalysisResults(TypedDict):
+    source_file: str
+    generated_at: str
+    financial_metrics: Dict[str, FinancialMetrics]
+    trends: Dict[str, TrendResult]
+    competitive_insights: Dict[str, CompetitiveInsight]
+    risks_opportunities: Dict[str, RiskResult]
+    recommendations: List[str]
+    summary: ExecutiveSummary
+
+
+EXPORT_FORMATS = ('json', 'parquet')
+
+
+def _frame(rows, columns):
+    return pd.DataFrame(rows, columns=columns)
+
+
+def _concat(frames, columns):
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)[columns]
+
+
+def result_tables(results):
+    """
+    Flatten a full analysis run into long-format DataFrames keyed by table name
+    """
+    financial = results['financial_metrics']
+    trends = results['trends']
+    competitive = results['competitive_insights']
+    risks = results['risks_opportunities']
+
+    tabs, columns, timelines, correlations, categories, findings = [], [], [], [], [], []
+    statistics, performance, trend_metrics = [], [], []
+    sampling, intervals = [], []
+    stat_columns = None
+    for tab_name, metrics in financial.items():
+        trend = trends.get(tab_name, {})
+        insight = competitive.get(tab_name, {})
+        tabs.append((tab_name, metrics['shape'][0], metrics['shape'][1],
+                     len(metrics['numeric_columns']), len(metrics['financial_columns'])))
+
+        roles = {
+            'numeric': metrics['numeric_columns'],
+            'text': insight.get('text_columns', []),
+            'financial': metrics['financial_columns'],
+            'date': trend.get('date_columns', [])
+        }
+        named = list(dict.fromkeys(col for cols in roles.values() for col in cols))
+        members = [set(cols) for cols in roles.values()]
+        columns.extend((tab_name, col) + tuple(col in cols for cols in members) for col in named)
+
+        stats = metrics.get('statistics')
+        if stats is not None and len(stats):
+            stat_columns = list(stats.columns)
+            stats = stats.rename_axis('column').reset_index()
+            stats.insert(0, 'tab', tab_name)
+            statistics.append(stats)
+
+        sampled = metrics.get('sampling')
+        if sampled:
+            sampling.append((tab_name, sampled['rows_sampled'], sampled['rows_total'], sampled['method']))
+            bounds = sampled['intervals']
+            for col in bounds.index:
+                for name in stat_columns or []:
+                    if f"{name}_low" in bounds.columns:
+                        intervals.append((tab_name, name, col, None, float(metrics['statistics'].loc[col, name]),
+                                          float(bounds.loc[col, f"{name}_low"]), float(bounds.loc[col, f"{name}_high"])))
+
+        for date_col, timeline in trend.get('timelines', {}).items():
+            if 'error' in timeline:
+                continue
+            for num_col, growth in timeline['growth'].items():
+                timelines.append((tab_name, date_col, timeline['start'], timeline['end'], num_col, float(growth)))
+            if timeline.get('metrics') is not None:
+                block = timeline['metrics'].rename_axis('column').reset_index()
+                block.insert(0, 'frequency', timeline['frequency'])
+                block.insert(0, 'date_column', date_col)
+                block.insert(0, 'tab', tab_name)
+                trend_metrics.append(block)
+        correlations.extend((tab_name, col1, col2, corr) for col1, col2, corr in trend.get('correlations', []))
+        for (col1, col2, corr), bounds in zip(trend.get('correlations', []), trend.get('correlation_intervals') or []):
+            intervals.append((tab_name, 'correlation', col1, col2, corr) + tuple(bounds))
+
+        for col, counts in insight.get('category_counts', {}).items():
+            categories.extend((tab_name, col, value, int(count)) for value, count in counts['records'].items())
+        for col, comparison in insight.get('performance', {}).items():
+            for num_col in comparison.columns.get_level_values(0).unique():
+                block = comparison[num_col].rename_axis('category').reset_index()
+                block.insert(0, 'numeric_column', num_col)
+                block.insert(0, 'category_column', col)
+                block.insert(0, 'tab', tab_name)
+                performance.append(block)
+                if 'mean_err' in block.columns:
+                    intervals.extend((tab_name, 'mean', num_col, f"{col}={category}", mean, mean - err, mean + err)
+                                     for category, mean, err in zip(block['category'], block['mean'], block['mean_err']))
+
+        outcome = risks.get(tab_name, {})
+        findings.extend((tab_name, 'risk', text) for text in outcome.get('risks', []))
+        findings.extend((tab_name, 'opportunity', text) for text in outcome.get('opportunities', []))
+        risk_bounds = outcome.get('intervals')
+        if risk_bounds is not None:
+            for name in ('outlier_pct', 'slope'):
+                intervals.extend((tab_name, name, col, None, value, low, high) for col, value, low, high in
+                                 zip(risk_bounds.index, risk_bounds[name], risk_bounds[f"{name}_low"],
+                                     risk_bounds[f"{name}_high"]))
+
+    summary = {key: value for key, value in results['summary'].items() if key != 'recommendations'}
+    return {
+        'tabs': _frame(tabs, ['tab', 'rows', 'columns', 'numeric_columns', 'financial_columns']),
+        'columns': _frame(columns, ['tab', 'column', 'numeric', 'text', 'financial', 'date']),
+        'statistics': _concat(statistics, ['tab', 'column'] + (stat_columns or [])),
+        'timelines': _frame(timelines, ['tab', 'date_column', 'start', 'end', 'column', 'growth_pct']),
+        'trend_metrics': _concat(trend_metrics, ['tab', 'date_column', 'frequency', 'column', 'periods',
+                                                 'first_period', 'last_period', 'latest_change_pct',
+                                                 'mean_change_pct', 'cagr_pct', 'rolling_mean', 'rolling_std']),
+        'correlations': _frame(correlations, ['tab', 'column_1', 'column_2', 'correlation']),
+        'categories': _frame(categories, ['tab', 'column', 'category', 'records']),
+        'performance': _concat(performance, ['tab', 'category_column', 'category', 'numeric_column',
+                                             'mean', 'median', 'std']),
+        'findings': _frame(findings, ['tab', 'kind', 'text']),
+        'sampling': _frame(sampling, ['tab', 'rows_sampled', 'rows_total', 'method']),
+        # 95% bounds of sampled statistics; low == high marks a value recomputed over every row.
+        # 'by' is the paired column of a correlation or "<category column>=<category>" of a category mean
+        'intervals': _frame(intervals, ['tab', 'statistic', 'column', 'by', 'estimate', 'low', 'high']),
+        'recommendations': _frame(list(enumerate(results['recommendations'], 1)), ['rank', 'text']),
+        'summary': pd.DataFrame([summary])
+    }
+
+
+def _parquet_safe(frame):
+    """
+    Stringify object columns holding mixed types (column labels, category values, periods) for Arrow
+    """
+    frame = frame.copy()
+    for col in frame.columns[frame.dtypes == object]:
+        values = frame[col]
+        if not values.map(type).eq(str).all():
+            frame[col] = values.map(lambda v: None if v is None else str(v))
+    return frame
+
+
+def export_format(path, fmt=None):
+    """
+    Export format from an explicit choice or the output path's extension (JSON unless .parquet or a directory)
+    """
+    if fmt:
+        return fmt
+    if path.endswith(('.parquet', '.pq', os.sep)) or os.path.isdir(path):
+        return 'parquet'
+    return 'json'
+
+
+def _meta(results):
+    return {'source_file': results['source_file'], 'generated_at': results['generated_at']}
+
+
+def results_json(results):
+    """
+    The JSON export document as a string: {"meta", "summary", <table>: [records]}
+    """
+    # pandas' C JSON encoder serializes each table; the document is only assembled as strings
+    parts = [f'"meta": {json.dumps(_meta(results), default=str)}',
+             f'"summary": {json.dumps(results["summary"], default=str)}']
+    for name, frame in result_tables(results).items():
+        if name == 'summary':
+            continue
+        parts.append(f'"{name}": ' + frame.to_json(orient='records', date_format='iso', default_handler=str))
+    return '{' + ', '.join(parts) + '}'
+
+
+def export_results(results, path, fmt=None):
+    """
+    Write every result table in one bulk write per table and return the paths written
+
+    JSON produces a single document (see results_json); Parquet treats path as a
+    directory and writes <table>.parquet for each table.
+    """
+    fmt = export_format(path, fmt)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}' (expected one of {', '.join(EXPORT_FORMATS)})")
+
+    if fmt == 'parquet':
+        os.makedirs(path, exist_ok=True)
+        tables = result_tables(results)
+        tables['meta'] = pd.DataFrame([_meta(results)])
+        written = []
+        for name, frame in tables.items():
+            target = os.path.join(path, f"{name}.parquet")
+            _parquet_safe(frame).to_parquet(target, index=False)
+            written.append(target)
+        return written
+
+    document = results_json(results)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(document)
+    return [path]
@@ -0,0 +1,190 @@
+"""
+Row samples and confidence intervals for the approximate (--sample) analysis mode.
+
+Samples are drawn without replacement, kept in sheet order and, when the tab has
+a category column, stratified by it with proportional allocation so every
+category is represented (the sample stays self-weighting, so plain sample
+statistics remain unbiased). Intervals are two-sided 95% intervals with a
+finite-population correction: normal intervals for means, kurtosis-adjusted
+delta-method intervals on the log scale for standard deviations and coefficients
+of variation (financial columns are heavy-tailed, so normal-theory margins would
+be far too narrow), binomial order-statistic ranks for quantiles, Fisher's z for correlations, Wilson intervals for shares
+(e.g. outliers) and OLS standard errors for slopes. The simple-random-sampling
+formulas are conservative for a proportionally stratified sample.
+"""
+import numpy as np
+import pandas as pd
+
+Z_95 = 1.959963984540054
+DEFAULT_SEED = 0
+STRATA_MAX_CATEGORIES = 20  # Same range competitive_analysis profiles as categories
+
+
+def sample_size(n_rows, sample):
+    """
+    Rows to draw from n_rows: sample is a fraction of the rows when below 1, a row count otherwise
+    """
+    size = int(round(n_rows * sample)) if sample < 1 else int(sample)
+    return min(max(size, 1), n_rows)
+
+
+def describe_sample(sample):
+    return f"{sample:.0%} of rows" if sample < 1 else f"{int(sample):,} rows"
+
+
+def strata_column(df, text_columns):
+    """
+    First text column with 2-20 distinct values, or None
+    """
+    for col in text_columns:
+        if 2 <= df[col].nunique() <= STRATA_MAX_CATEGORIES:
+            return col
+    return None
+
+
+def draw_sample(df, size, strata=None, seed=DEFAULT_SEED):
+    """
+    Sorted row positions of a sample of about size rows, stratified proportionally by the strata column
+
+    Every non-empty stratum gets at least two rows (when it has them) so per-category spreads
+    can be estimated, which may add a few rows beyond size.
+    """
+    rng = np.random.default_rng(seed)
+    n_rows = len(df)
+    if strata is None:
+        return np.sort(rng.choice(n_rows, size, replace=False))
+
+    codes = pd.factorize(df[strata])[0] + 1  # Missing values form stratum 0
+    counts = np.bincount(codes)
+    quota = counts * size / n_rows
+    allocation = np.floor(quota).astype(np.int64)
+    # Largest remainders take the rows left over by rounding down
+    leftover = size - allocation.sum()
+    allocation[np.argsort(-(quota - allocation), kind='stable')[:leftover]] += 1
+    allocation = np.maximum(allocation, np.minimum(counts, 2))
+
+    # A random permutation grouped by stratum: the first rows of each group are a random draw from it
+    shuffled = rng.permutation(n_rows)
+    grouped = shuffled[np.argsort(codes[shuffled], kind='stable')]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    return np.sort(np.concatenate([grouped[start:start + take] for start, take in zip(starts, allocation)]))
+
+
+def finite_population_correction(n, population):
+    """
+    sqrt((N - n) / (N - 1)): shrinks standard errors as the sample approaches the whole population
+    """
+    n = np.asarray(n, dtype=np.float64)
+    population = np.asarray(population, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.sqrt(np.clip((population - n) / np.maximum(population - 1, 1), 0, 1))
+
+
+def quantile_intervals(values, q):
+    """
+    Lower and upper bounds per column for the q-quantile from binomial order-statistic ranks
+
+    values is a 2-D sample (rows x columns) that may contain NaN.
+    """
+    ordered = np.sort(values, axis=0)  # NaN sorts last
+    n = (~np.isnan(values)).sum(axis=0)
+    spread = Z_95 * np.sqrt(n * q * (1 - q))
+    last = np.maximum(n - 1, 0)
+    lower = np.clip(np.floor(n * q - spread).astype(np.int64) - 1, 0, last)
+    upper = np.clip(np.ceil(n * q + spread).astype(np.int64), 0, last)
+    columns = np.arange(values.shape[1])
+    low, high = ordered[lower, columns], ordered[upper, columns]
+    empty = n == 0
+    return np.where(empty, np.nan, low), np.where(empty, np.nan, high)
+
+
+def describe_intervals(values, mean, std, population):
+    """
+    95% bounds for the mean, median, quartiles, standard deviation and CV of each sampled column
+
+    The spread intervals use the sample's own skewness and kurtosis: Var(s²) ≈ σ⁴(κ - (n-3)/(n-1))/n,
+    which reduces to the normal-theory 2σ⁴/(n-1) only when κ = 3. Returns {statistic: (low, high)}
+    with arrays aligned to the columns of values.
+    """
+    n = (~np.isnan(values)).sum(axis=0).astype(np.float64)
+    fpc = finite_population_correction(n, population)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_margin = Z_95 * std / np.sqrt(n) * fpc
+        deviations = np.where(np.isnan(values), 0, values - mean)
+        m2 = (deviations ** 2).sum(axis=0) / n
+        # Constant columns have no shape to estimate; their interval collapses to the point
+        skewness = np.where(m2 > 0, (deviations ** 3).sum(axis=0) / n / m2 ** 1.5, 0)
+        kurtosis = np.where(m2 > 0, (deviations ** 4).sum(axis=0) / n / m2 ** 2, 0)
+        # Relative standard errors of s and s/|mean| by the delta method
+        excess = np.maximum(kurtosis - (n - 3) / (n - 1), 0)
+        std_rel = np.sqrt(excess / n) / 2
+        cv = std / np.abs(np.where(mean != 0, mean, np.nan))
+        cv_rel = np.sqrt(np.maximum(excess / 4 + cv ** 2 - np.sign(mean) * skewness * cv, 0) / n)
+        # Log-scale bounds stay positive and lean upwards, like the sampling distribution of s
+        std_factor = np.exp(Z_95 * std_rel * fpc)
+        cv_factor = np.exp(Z_95 * cv_rel * fpc)
+
+    intervals = {
+        'mean': (mean - mean_margin, mean + mean_margin),
+        'std': (std / std_factor, std * std_factor),
+        'cv': (cv / cv_factor, cv * cv_factor)
+    }
+    for name, q in (('q1', 0.25), ('median', 0.5), ('q3', 0.75)):
+        intervals[name] = quantile_intervals(values, q)
+    return intervals
+
+
+def share_interval(share, n, population):
+    """
+    Wilson 95% interval for a proportion observed in n sampled rows
+    """
+    share = np.asarray(share, dtype=np.float64)
+    n = np.maximum(np.asarray(n, dtype=np.float64), 1)
+    z2 = Z_95 ** 2
+    center = (share + z2 / (2 * n)) / (1 + z2 / n)
+    margin = Z_95 * np.sqrt(share * (1 - share) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+    margin = margin * finite_population_correction(n, population)
+    return np.clip(center - margin, 0, 1), np.clip(center + margin, 0, 1)
+
+
+def correlation_interval(r, n, population):
+    """
+    Fisher-z 95% interval for correlations estimated from n paired observations (arrays broadcast)
+    """
+    r = np.asarray(r, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = np.arctanh(np.clip(r, -0.999999, 0.999999))
+        margin = Z_95 / np.sqrt(np.maximum(n - 3, 1)) * finite_population_correction(n, population)
+        low, high = np.tanh(z - margin), np.tanh(z + margin)
+    valid = n > 3
+    return np.where(valid, low, np.nan), np.where(valid, high, np.nan)
+
+
+def slope_intervals(x, y):
+    """
+    OLS slope of y on x per column and its 95% margin, ignoring rows where y is NaN
+
+    x and y are 2-D (rows x columns); x holds each sampled value's position in the full column.
+    """
+    present = ~np.isnan(y)
+    n = present.sum(axis=0).astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = np.where(present, x, 0).sum(axis=0) / n
+        y_mean = np.where(present, y, 0).sum(axis=0) / n
+        dx = np.where(present, x - x_mean, 0)
+        dy = np.where(present, y - y_mean, 0)
+        sxx = (dx * dx).sum(axis=0)
+        slope = (dx * dy).sum(axis=0) / sxx
+        residuals = np.where(present, dy - slope * dx, 0)
+        se = np.sqrt((residuals * residuals).sum(axis=0) / np.maximum(n - 2, 1) / sxx)
+    valid = (n > 2) & (sxx > 0)
+    return np.where(n > 1, slope, np.nan), np.where(valid, Z_95 * se, np.nan)
+
+
+def straddles(low, high, threshold):
+    """
+    True where the interval [low, high] contains the threshold (decisions there could flip)
+    """
+    with np.errstate(invalid='ignore'):
+        return (np.asarray(low) <= threshold) & (np.asarray(high) >= threshold)
@@ -0,0 +1,252 @@
+"""
+Resident mode for the Chenmark analysis: keep the interpreter warm, watch
+workbooks for changes and serve the latest results over local HTTP/JSON.
+
+A background thread polls the watched files (size and mtime) and re-analyzes
+only the workbooks that changed; thanks to the workbook cache that usually
+means re-parsing and re-analyzing only the edited sheets. Each result document
+is serialized once per analysis, so a request is a dictionary lookup, and
+responses carry an ETag so an unchanged dashboard refresh gets a 304.
+
+    GET /results            combined results (portfolio view when several workbooks are watched)
+    GET /results/<workbook> results of one workbook, named as listed by /status
+    GET /status             watched workbooks, when they were analyzed and any errors
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+import chenmark_results
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_POLL_SECONDS = 2.0
+DEFAULT_CORS_ORIGIN = 'http://localhost:3000'  # The dashboard's dev server; other pages cannot read results
+_SETTLE_SECONDS = 1.0  # Files modified more recently than this may still be being written
+
+
+class CachedResponse:
+    """
+    A serialized JSON body with its ETag and a gzip copy built on first request
+    """
+    def __init__(self, document):
+        self.body = document.encode('utf-8')
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+        self._gzipped = None
+
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=5)
+        return self._gzipped
+
+
+def workbook_label(path):
+    """
+    Name a workbook is published under: its path relative to the working directory, with forward slashes
+    """
+    return os.path.relpath(path).replace(os.sep, '/')
+
+
+class ResultsState:
+    """
+    Latest results per watched workbook plus the combined view, replaced as a whole after each refresh
+    """
+    def __init__(self, discover, analyze, combine, verbose=True):
+        self.discover = discover
+        self.analyze = analyze
+        self.combine = combine
+        self.verbose = verbose
+        self.workbooks = {}
+        self.combined = None
+        self.status = CachedResponse(json.dumps({'workbooks': []}))
+        self._lock = threading.Lock()
+
+    def _analyze(self, path, signature, known):
+        start = time.perf_counter()
+        try:
+            results = self.analyze(path)
+            error = None if results is not None else "no data loaded"
+        except Exception as e:
+            results, error = None, str(e)
+        elapsed = time.perf_counter() - start
+
+        entry = {
+            'signature': signature,
+            'analyzed_at': datetime.now().isoformat(timespec='seconds'),
+            'elapsed_s': round(elapsed, 3),
+            'error': error,
+            'results': results,
+            'response': CachedResponse(chenmark_results.results_json(results)) if results is not None else None
+        }
+        if results is None and known:
+            # Keep serving the last good results until the workbook can be read again
+            entry['results'], entry['response'] = known['results'], known['response']
+        if error:
+            print(f"❌ {workbook_label(path)}: {error}")
+        elif self.verbose:
+            print(f"🔄 Analyzed {workbook_label(path)} in {elapsed:.2f}s")
+        return entry
+
+    def refresh(self, settle=True):
+        """
+        Re-analyze new or changed workbooks and rebuild the combined view; returns True if anything changed
+        """
+        paths = self.discover()
+        current = {path: entry for path, entry in self.workbooks.items() if path in paths}
+        changed = len(current) != len(self.workbooks)
+
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            known = current.get(path)
+            if known and known['signature'] == signature:
+                continue
+            if settle and time.time() - stat.st_mtime < _SETTLE_SECONDS:
+                continue  # Picked up on the next poll once the save has finished
+            current[path] = self._analyze(path, signature, known)
+            changed = True
+
+        if not changed:
+            return False
+
+        analyzed = {path: entry['results'] for path, entry in current.items() if entry['results'] is not None}
+        if len(analyzed) == 1:
+            combined = next(entry['response'] for entry in current.values() if entry['response'] is not None)
+        elif analyzed:
+            combined = CachedResponse(chenmark_results.results_json(self.combine(analyzed)))
+        else:
+            combined = None
+
+        status = CachedResponse(json.dumps({'workbooks': [
+            {
+                'workbook': workbook_label(path),
+                'path': os.path.abspath(path),
+                'analyzed_at': entry['analyzed_at'],
+                'elapsed_s': entry['elapsed_s'],
+                'etag': entry['response'].etag if entry['response'] else None,
+                'error': entry['error']
+            }
+            for path, entry in current.items()
+        ]}))
+
+        with self._lock:
+            self.workbooks, self.combined, self.status = current, combined, status
+        return True
+
+    def workbook_response(self, label):
+        with self._lock:
+            workbooks = self.workbooks
+        for path, entry in workbooks.items():
+            if workbook_label(path) == label:
+                return entry['response']
+        return None
+
+
+class _ResultsHandler(BaseHTTPRequestHandler):
+    server_version = 'chenmark'
+
+    def do_GET(self):
+        state = self.server.state
+        route = unquote(urlsplit(self.path).path).rstrip('/') or '/'
+        if route in ('/', '/results'):
+            response = state.combined
+            if response is None:
+                return self._send_error(503, "results are not ready yet")
+        elif route == '/status':
+            response = state.status
+        elif route.startswith('/results/'):
+            response = state.workbook_response(route[len('/results/'):])
+            if response is None:
+                return self._send_error(404, "unknown workbook")
+        else:
+            return self._send_error(404, "not found")
+
+        requested = [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]
+        if response.etag in requested or '*' in requested:
+            self.send_response(304)
+            self.send_header('ETag', response.etag)
+            self._send_common_headers()
+            self.end_headers()
+            return
+
+        body = response.body
+        compress = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if compress:
+            body = response.gzipped()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', response.etag)
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+        self._send_common_headers()
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_common_headers(self):
+        # Clients may keep the body but must revalidate; the ETag makes that a cheap 304
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if self.server.cors_origin:
+            self.send_header('Access-Control-Allow-Origin', self.server.cors_origin)
+
+    def _send_error(self, code, message):
+        body = json.dumps({'error': message}).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self._send_common_headers()
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.state.verbose:
+            super().log_message(format, *args)
+
+
+def serve(discover, analyze, combine, host=DEFAULT_HOST, port=DEFAULT_PORT, poll_seconds=DEFAULT_POLL_SECONDS,
+          cors_origin=DEFAULT_CORS_ORIGIN, verbose=True):
+    """
+    Analyze the discovered workbooks, then serve results while a background thread re-analyzes changes
+
+    discover() returns the workbook paths to watch (re-evaluated on every poll, so new files in a
+    watched directory are picked up), analyze(path) returns one workbook's AnalysisResults and
+    combine({path: results}) builds the combined view when several workbooks are watched.
+    cors_origin is the one browser origin allowed to read responses cross-origin; None or ''
+    sends no CORS header, so only same-origin pages and non-browser clients can read them.
+    """
+    state = ResultsState(discover, analyze, combine, verbose)
+    state.refresh(settle=False)
+
+    httpd = ThreadingHTTPServer((host, port), _ResultsHandler)
+    httpd.state = state
+    httpd.cors_origin = cors_origin
+    stop = threading.Event()
+
+    def watch():
+        while not stop.wait(poll_seconds):
+            try:
+                state.refresh()
+            except Exception as e:
+                print(f"⚠️  Refresh failed: {e}")
+
+    watcher = threading.Thread(target=watch, name='chenmark-watch', daemon=True)
+    watcher.start()
+    print(f"🌐 Serving results on http://{host}:{httpd.server_address[1]}/results "
+          f"({len(state.workbooks)} workbook(s), checking for changes every {poll_seconds:g}s)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping server")
+    finally:
+        stop.set()
+        httpd.server_close()
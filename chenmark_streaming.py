@@ -0,0 +1,465 @@
+"""
+Bounded-memory streaming statistics for Chenmark workbooks.
+
+Sheets are read in row chunks through openpyxl's read-only mode and folded into
+mergeable running statistics: Welford/Chan moments, KLL quantile sketches,
+pairwise sufficient statistics for correlations and per-column sums for trend
+slopes. No sheet is ever held in memory as a whole DataFrame.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_SKETCH_SIZE = 1000
+MAX_TRACKED_CATEGORIES = 20  # competitive_analysis only profiles columns with 2-20 categories
+TRACKED_NUMERIC_COLUMNS = 6  # Numeric columns followed per category and date (first 3 are reported)
+MAX_CORRELATION_COLUMNS = 1000  # k x k pair statistics are skipped above this width
+FLAT_VARIANCE_EPS = 64 * np.finfo(np.float64).eps  # Relative variance below which a column is constant
+DATE_KEYWORDS = ('date', 'year')
+
+# Strings pandas' Excel reader treats as missing by default
+NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+])
+
+
+class KLLSketch:
+    """
+    Mergeable approximate quantile sketch (Karnin, Lang & Liberty, 2016)
+
+    Exact while fewer than k values have been seen; afterwards rank error is roughly 1.7 / k.
+    """
+    def __init__(self, k=DEFAULT_SKETCH_SIZE, seed=0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(8, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(self.levels[level])
+                leftover, items = (items[-1:], items[:-1]) if len(items) % 2 else (items[:0], items)
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level] = leftover
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    @property
+    def exact(self):
+        return len(self.levels) == 1
+
+    def _weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lv), 2.0 ** i) for i, lv in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], weights[order]
+
+    def quantile(self, q):
+        if self.n == 0:
+            return np.nan
+        if self.exact:
+            return float(np.quantile(self.levels[0], q))  # Same linear interpolation as pandas
+        items, weights = self._weighted_items()
+        cumulative = np.cumsum(weights)
+        target = q * cumulative[-1]
+        return float(items[min(np.searchsorted(cumulative, target), len(items) - 1)])
+
+    def count_below(self, value):
+        """
+        Estimated number of values strictly below value
+        """
+        if self.exact:
+            return float(np.count_nonzero(self.levels[0] < value))
+        items, weights = self._weighted_items()
+        return float(weights[items < value].sum())
+
+    def count_above(self, value):
+        """
+        Estimated number of values strictly above value
+        """
+        if self.exact:
+            return float(np.count_nonzero(self.levels[0] > value))
+        items, weights = self._weighted_items()
+        return float(weights[items > value].sum())
+
+
+class RunningMoments:
+    """
+    Count, mean and sum of squared deviations for a vector of columns, merged with Chan's formula
+    """
+    def __init__(self, width):
+        self.n = np.zeros(width)
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+
+    def update(self, values):
+        """
+        Fold in a (rows x width) float block; NaNs are ignored per column
+        """
+        present = ~np.isnan(values)
+        n_b = present.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_b = np.where(n_b > 0, np.nansum(values, axis=0) / np.maximum(n_b, 1), 0.0)
+            m2_b = np.where(present, (values - mean_b) ** 2, 0.0).sum(axis=0)
+        self.merge_arrays(n_b, mean_b, m2_b)
+
+    def merge_arrays(self, n_b, mean_b, m2_b):
+        n = self.n + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mean_b - self.mean
+            safe_n = np.maximum(n, 1)
+            self.mean = np.where(n > 0, self.mean + delta * n_b / safe_n, 0.0)
+            self.m2 = self.m2 + m2_b + np.where(n > 0, delta ** 2 * self.n * n_b / safe_n, 0.0)
+        self.n = n
+
+    def std(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.n > 1, np.sqrt(self.m2 / np.maximum(self.n - 1, 1)), np.nan)
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, str) and value in NA_STRINGS)
+
+
+def _cell_kind(value):
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, (int, float, np.number)):
+        return 'number'
+    if isinstance(value, datetime):
+        return 'datetime'
+    if isinstance(value, str):
+        return 'text'
+    return 'other'
+
+
+def _header_names(header):
+    """
+    Column labels the way pandas names them: blanks become 'Unnamed: i', duplicates get '.1', '.2' suffixes
+    """
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None or value == '' else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+class SheetAccumulator:
+    """
+    Running statistics for one sheet, updated one row chunk at a time
+    """
+    def __init__(self, columns, sketch_size=DEFAULT_SKETCH_SIZE):
+        self.columns = columns
+        width = len(columns)
+        self.n_rows = 0
+        self.ignored_cells = 0
+        self.non_null = np.zeros(width, dtype=np.int64)
+        self.kinds = [set() for _ in range(width)]
+
+        # Numeric moments, extremes and quantile sketches
+        self.moments = RunningMoments(width)
+        self.minimum = np.full(width, np.inf)
+        self.maximum = np.full(width, -np.inf)
+        self.sketches = [KLLSketch(sketch_size, seed=i) for i in range(width)]
+        self.sketch_size = sketch_size
+
+        # Values are shifted by a per-column reference before summing products for numerical stability
+        self.shift = np.full(width, np.nan)
+
+        # Whether every number seen is whole (calendar-year columns must be)
+        self.integral = np.ones(width, dtype=bool)
+
+        # Trend slope sums: sum((y - shift)) and sum(x * (y - shift)), x = position among non-null values
+        self.slope_sy = np.zeros(width)
+        self.slope_sxy = np.zeros(width)
+
+        # Pairwise-complete correlation sufficient statistics
+        self.track_pairs = width <= MAX_CORRELATION_COLUMNS
+        if self.track_pairs:
+            self.pair_n = np.zeros((width, width))
+            self.pair_sx = np.zeros((width, width))
+            self.pair_sxx = np.zeros((width, width))
+            self.pair_sxy = np.zeros((width, width))
+
+        # Category counts (dropped once a column exceeds MAX_TRACKED_CATEGORIES) and per-category moments
+        self.category_counts = [{} for _ in range(width)]
+        self.group_targets = None
+        self.group_moments = {}
+        self.group_sketches = {}
+
+        # Date candidates: (min, max) per column, the values seen at the earliest and latest date
+        # and how many of their values pandas' date parser accepts (see date_parse_share)
+        self.date_candidates = None
+        self.date_ranges = {}
+        self.date_parsed = {}
+        self.timelines = {}
+
+    def _numeric_mask(self):
+        # A column with no values yet is not numeric, so an empty margin column never takes a group_targets slot
+        return np.array([bool(kinds) and kinds <= {'number'} for kinds in self.kinds], dtype=bool)
+
+    def update(self, rows):
+        """
+        Fold a list of row tuples into the running statistics
+        """
+        width = len(self.columns)
+        padded = []
+        for row in rows:
+            if len(row) > width:
+                self.ignored_cells += sum(v is not None for v in row[width:])
+                row = row[:width]
+            padded.append(tuple(row) + (None,) * (width - len(row)))
+        if not padded:
+            return
+
+        cells = np.empty((len(padded), width), dtype=object)
+        cells[:] = padded
+        self.n_rows += len(padded)
+
+        values = np.full(cells.shape, np.nan)
+        for j in range(width):
+            column = cells[:, j]
+            present = np.fromiter((not _is_missing(v) for v in column), dtype=bool, count=len(column))
+            column[~present] = None
+            self.non_null[j] += int(present.sum())
+            if present.any():
+                self.kinds[j].update(_cell_kind(v) for v in column[present])
+            if self.kinds[j] <= {'number'} and present.any():
+                values[present, j] = column[present].astype(np.float64)
+
+        numeric = self._numeric_mask()
+        values[:, ~numeric] = np.nan
+        present = ~np.isnan(values)
+
+        if self.group_targets is None:
+            self.group_targets = [j for j in range(width) if numeric[j]][:TRACKED_NUMERIC_COLUMNS]
+            self.date_candidates = [
+                j for j in range(width)
+                if any(word in str(self.columns[j]).lower() for word in DATE_KEYWORDS)
+                or self.kinds[j] == {'datetime'}
+            ]
+
+        self._update_numeric(values, present)
+        self._update_categories(cells, values)
+        self._update_dates(cells, values)
+
+    def _update_numeric(self, values, present):
+        new_columns = np.isnan(self.shift) & present.any(axis=0)
+        if new_columns.any():
+            with np.errstate(invalid='ignore'):
+                self.shift[new_columns] = np.nanmean(values[:, new_columns], axis=0)
+        shift = np.nan_to_num(self.shift)
+
+        offset = self.moments.n.copy()
+        self.moments.update(values)
+        self.minimum = np.minimum(self.minimum, np.where(present, values, np.inf).min(axis=0))
+        self.maximum = np.maximum(self.maximum, np.where(present, values, -np.inf).max(axis=0))
+        self.integral &= np.where(present, values == np.round(values), True).all(axis=0)
+        for j in np.nonzero(present.any(axis=0))[0]:
+            self.sketches[j].update(values[present[:, j], j])
+
+        shifted = np.where(present, values - shift, 0.0)
+        x = offset + np.cumsum(present, axis=0) - 1
+        self.slope_sy += shifted.sum(axis=0)
+        self.slope_sxy += np.where(present, x * shifted, 0.0).sum(axis=0)
+
+        if self.track_pairs:
+            mask = present.astype(np.float64)
+            self.pair_n += mask.T @ mask
+            self.pair_sx += shifted.T @ mask
+            self.pair_sxx += (shifted * shifted).T @ mask
+            self.pair_sxy += shifted.T @ shifted
+
+    def _update_categories(self, cells, values):
+        targets = self.group_targets
+        for j in range(len(self.columns)):
+            counts = self.category_counts[j]
+            if counts is None:
+                continue
+            keys = pd.Series(cells[:, j], dtype=object)
+            chunk_counts = keys.value_counts(sort=False)
+            for value, count in chunk_counts.items():
+                counts[value] = counts.get(value, 0) + int(count)
+            if len(counts) > MAX_TRACKED_CATEGORIES:
+                self.category_counts[j] = None
+                self.group_moments.pop(j, None)
+                self.group_sketches.pop(j, None)
+                continue
+            if not targets:
+                continue
+
+            block = values[:, targets]
+            group_moments = self.group_moments.setdefault(j, {})
+            group_sketches = self.group_sketches.setdefault(j, {})
+            for value, row_index in keys.groupby(keys, sort=False).indices.items():
+                rows = block[row_index]
+                moments = group_moments.setdefault(value, RunningMoments(len(targets)))
+                moments.update(rows)
+                sketches = group_sketches.setdefault(
+                    value, [KLLSketch(self.sketch_size, seed=t) for t in range(len(targets))])
+                for t, sketch in enumerate(sketches):
+                    column = rows[:, t]
+                    sketch.update(column[~np.isnan(column)])
+
+    def _update_dates(self, cells, values):
+        for d in list(self.date_candidates):
+            dates = cells[:, d]
+            has_date = dates != None  # noqa: E711 - elementwise comparison on an object array
+            if not has_date.any():
+                continue
+            valid = dates[has_date]
+            # Same element-wise parse parse_date_column applies to a text column
+            parsed = pd.to_datetime(pd.Series(valid, dtype=object), errors='coerce', format='mixed')
+            self.date_parsed[d] = self.date_parsed.get(d, 0) + int(parsed.notna().sum())
+            try:
+                low, high = valid.min(), valid.max()
+                known = self.date_ranges.get(d)
+                if known is not None:
+                    low, high = min(known[0], low), max(known[1], high)
+                self.date_ranges[d] = (low, high)
+
+                for t in self.group_targets:
+                    rows = np.nonzero(has_date & ~np.isnan(values[:, t]))[0]
+                    if len(rows) == 0:
+                        continue
+                    candidates = dates[rows]
+                    first = rows[np.argmin(candidates)]
+                    last = rows[len(rows) - 1 - np.argmax(candidates[::-1])]
+                    first = (dates[first], values[first, t])
+                    last = (dates[last], values[last, t])
+                    known = self.timelines.get((d, t))
+                    if known is not None:
+                        first = known[0] if known[0][0] <= first[0] else first
+                        last = known[1] if known[1][0] > last[0] else last
+                    self.timelines[(d, t)] = (first, last)
+            except TypeError:
+                # Mixed value types cannot be ordered, so this column is not a usable timeline
+                self.date_candidates.remove(d)
+                self.date_ranges.pop(d, None)
+
+    def column_kind(self, j):
+        """
+        The dtype family pandas would have inferred for column j
+        """
+        kinds = self.kinds[j]
+        if kinds <= {'number'}:
+            return 'numeric'
+        if kinds == {'datetime'}:
+            return 'datetime'
+        if kinds == {'bool'} and self.non_null[j] == self.n_rows:
+            return 'bool'
+        return 'text'
+
+    def date_parse_share(self, j):
+        """
+        Share of column j's values that parse as dates, or NaN when it was not followed as a date candidate
+        """
+        if j not in self.date_parsed or not self.non_null[j]:
+            return np.nan
+        return self.date_parsed[j] / self.non_null[j]
+
+    def correlation(self, columns):
+        """
+        Pairwise-complete Pearson correlation between the given column positions
+
+        Like pandas, a pair where either column is constant over the shared rows has no correlation
+        (NaN); rounding residue in such a variance would otherwise come out as ±1.
+        """
+        if not self.track_pairs:
+            return None
+        idx = np.ix_(columns, columns)
+        n, sx, sxx, sxy = self.pair_n[idx], self.pair_sx[idx], self.pair_sxx[idx], self.pair_sxy[idx]
+        shift = np.nan_to_num(self.shift[columns])[:, None]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = sxy - sx * sx.T / n
+            var_x = sxx - sx * sx / n
+            # Sum of squares of the unshifted values sets the scale of the rounding error
+            flat = var_x <= FLAT_VARIANCE_EPS * (sxx + n * shift * shift)
+            corr = cov / np.sqrt(var_x * var_x.T)
+        corr[(n < 2) | flat | flat.T] = np.nan
+        return np.clip(corr, -1.0, 1.0)
+
+    def slopes(self):
+        """
+        OLS slope of each column against its non-null position, as np.polyfit would fit it
+        """
+        n = self.moments.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sxx = n * (n * n - 1) / 12
+            slopes = (self.slope_sxy - (n - 1) / 2 * self.slope_sy) / np.maximum(sxx, 1)
+        return np.where(n > 1, slopes, np.nan)
+
+
+def _trim_row(row):
+    end = len(row)
+    while end and (row[end - 1] is None or row[end - 1] == ''):
+        end -= 1
+    return row[:end]
+
+
+def stream_sheet(worksheet, chunk_rows=DEFAULT_CHUNK_ROWS, sketch_size=DEFAULT_SKETCH_SIZE, first_row=None, last_row=None):
+    """
+    Fold one worksheet into a SheetAccumulator, chunk_rows rows at a time
+
+    first_row/last_row (1-based) restrict the pass to the sheet's data region, the
+    first row being the header; by default every row is read.
+    """
+    accumulator = None
+    chunk = []
+    for row in worksheet.iter_rows(min_row=first_row, max_row=last_row, values_only=True):
+        row = _trim_row(row)
+        if not row:
+            continue  # pandas skips blank lines as well
+        if accumulator is None:
+            accumulator = SheetAccumulator(_header_names(row), sketch_size)
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            accumulator.update(chunk)
+            chunk = []
+
+    if accumulator is None:
+        return SheetAccumulator([], sketch_size)
+    accumulator.update(chunk)
+    return accumulator
+
+
+def open_streaming_workbook(file_path):
+    """
+    Open a workbook in openpyxl's constant-memory read-only mode
+    """
+    from openpyxl import load_workbook
+    return load_workbook(file_path, read_only=True, data_only=True, keep_links=False)